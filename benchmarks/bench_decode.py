@@ -0,0 +1,57 @@
+"""Compare the two-pass and single-pass response decoding paths.
+
+Two-pass is what ``RTTBase.get`` used to do: ``json.loads`` into dicts, then
+``model_validate``.  Single-pass hands the raw bytes to ``RTTBase.decode``,
+which validates them directly with ``model_validate_json``.
+
+Run with::
+
+    uv run python benchmarks/bench_decode.py
+"""
+
+import timeit
+
+from payloads import RUN_DATE, encode, location_payload, service_payload
+
+from traintimes.sdk import Location, Service
+
+
+CASES = [
+    ('board, 20 services', Location('HIB'), location_payload(20)),
+    ('board, 400 services', Location('HIB'), location_payload(400)),
+    ('service, 120 calls', Service('X00001', RUN_DATE), service_payload(120)),
+]
+
+
+def two_pass(subject, content):
+    return subject.response_model.model_validate(
+        subject.parse(True, 200, 'OK', content.decode())
+    )
+
+
+def single_pass(subject, content):
+    return subject.decode(True, 200, 'OK', content)
+
+
+def best_of(func, number, repeat=5):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def main():
+    print(
+        f'{"payload":<22} {"bytes":>9} {"two-pass":>10} {"one-pass":>10} {"speedup":>8}'
+    )
+    for name, subject, payload in CASES:
+        content = encode(payload)
+        assert two_pass(subject, content) == single_pass(subject, content)
+        number = max(1, 2_000_000 // len(content))
+        old = best_of(lambda: two_pass(subject, content), number)
+        new = best_of(lambda: single_pass(subject, content), number)
+        print(
+            f'{name:<22} {len(content):>9} {old * 1e3:>8.3f}ms '
+            f'{new * 1e3:>8.3f}ms {old / new:>7.2f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Compare the memory held by response models and their compact copies.
+
+Each payload is validated into its pydantic model, or validated and
+converted with :func:`traintimes.compact.compact` keeping only the compact
+copy; the bytes still allocated afterwards are measured with ``tracemalloc``.
+
+Run with::
+
+    uv run python benchmarks/bench_memory.py
+"""
+
+import gc
+import tracemalloc
+
+from payloads import location_payload, service_payload
+
+from traintimes.compact import Interner, compact
+from traintimes.models import LocationResponse, ServiceResponse
+
+
+CASES = [
+    ('board, 20 services', LocationResponse, [location_payload(20)]),
+    ('board, 1200 services', LocationResponse, [location_payload(1200)]),
+    ('100 services, 40 calls', ServiceResponse, [service_payload(40)] * 100),
+    ('service, 140 calls', ServiceResponse, [service_payload(140)]),
+]
+
+
+def retained(build):
+    """Bytes still allocated by the result of ``build()``."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def convert(model, payloads):
+    """Compact copies of ``payloads``, keeping none of the models."""
+    interner = Interner()
+    return [compact(model.model_validate(p), interner) for p in payloads]
+
+
+def main():
+    print(f'{"payload":<24} {"models":>12} {"compact":>12} {"saving":>8}')
+    for name, model, payloads in CASES:
+        models = [model.model_validate(payload) for payload in payloads]
+        assert [compact(m).to_model() for m in models] == models
+        del models
+        full = retained(lambda: [model.model_validate(p) for p in payloads])
+        small = retained(lambda: convert(model, payloads))
+        print(
+            f'{name:<24} {full / 1024:>10,.0f}KB {small / 1024:>10,.0f}KB '
+            f'{full / small:>7.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
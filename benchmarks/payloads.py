@@ -0,0 +1,49 @@
+"""Deterministic synthetic RTT payloads for benchmarking.
+
+These are not recorded responses: they are the stand-in server's synthetic
+payloads (see :mod:`traintimes.standin`), built to the API's documented
+response shapes with made-up stations, TIPLOCs and service UIDs, and sized
+for each benchmark.  A fixed seed keeps every run identical.  To benchmark
+real responses, pass ``suite.py --corpus DIR``.
+"""
+
+import datetime
+import json
+import random
+
+from traintimes.standin import Route, synthetic_board, synthetic_service
+
+
+RUN_DATE = datetime.date(2024, 1, 1)
+STATION = 'S01'
+SERVICE_UID = 'X00001'
+
+
+def location_payload(services, seed=0):
+    """A line-up with ``services`` departures from one station."""
+    route = Route('search', RUN_DATE, station=STATION, time='0500')
+    return synthetic_board(route, random.Random(seed), services)
+
+
+def service_payload(calling_points, seed=0):
+    """A single service with ``calling_points`` locations."""
+    route = Route('service', RUN_DATE, service_uid=SERVICE_UID)
+    return synthetic_service(route, random.Random(seed), calling_points)
+
+
+def encode(payload):
+    return json.dumps(payload).encode()
+
+
+def corpus():
+    """The named payloads benchmarked by ``suite.py``.
+
+    Sized after recorded responses: a quiet station's board, the all-day board
+    of a major terminus, and a long-distance service.
+    """
+    return {
+        'board-small': location_payload(12),
+        'board-terminus-day': location_payload(1200),
+        'service-short': service_payload(8),
+        'service-long-distance': service_payload(140),
+    }
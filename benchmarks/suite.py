@@ -0,0 +1,207 @@
+"""Offline benchmark suite over a corpus of RTT responses.
+
+Measures, for each payload in the corpus:
+
+- ``uri``: building the request URI (``RTTBase.uri``, a purl ``Template``)
+- ``json_decode``: ``json.loads`` of the raw body
+- ``model_validate``: validating the decoded dicts into the response model
+- ``get``: end-to-end ``Location.get`` / ``Service.get`` against a local stub
+  transport, so no network or credentials are involved
+- ``to_columns``: flattening the validated model with ``batch_columns``
+
+and reports operations per second (best of ``--repeat`` runs) and the peak
+memory allocated by one operation.  The default corpus is synthetic,
+generated by ``payloads.corpus()``; pass ``--corpus DIR`` to benchmark
+recorded response bodies saved as ``DIR/<name>.json`` instead.
+
+Run with::
+
+    uv run python benchmarks/suite.py --output results.json
+    uv run python benchmarks/suite.py --compare results.json
+
+Results are written as JSON, with the versions they were measured on, so
+runs from different releases can be compared.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import pathlib
+import platform
+import sys
+import timeit
+import tracemalloc
+from importlib import metadata
+
+import requests
+from payloads import RUN_DATE, SERVICE_UID, STATION, corpus, encode
+
+from traintimes.columns import batch_columns
+from traintimes.config import Config
+from traintimes.sdk import Location, Service
+
+
+TARGET_SECONDS = 0.2
+
+
+class StubAdapter(requests.adapters.BaseAdapter):
+    """Answer every request with the same body, without touching the network."""
+
+    def __init__(self, content):
+        super().__init__()
+        self.content = content
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers['Content-Type'] = 'application/json'
+        response._content = self.content
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def load_corpus(directory=None):
+    """Payloads by name, from ``directory`` if given, else generated."""
+    if directory is None:
+        return corpus()
+    return {
+        path.stem: json.loads(path.read_bytes())
+        for path in sorted(pathlib.Path(directory).glob('*.json'))
+    }
+
+
+def subject_for(payload, session=None):
+    """The request a payload answers: a board or a single service."""
+    kwargs = {'config': Config(auth=('bench', 'bench'))}
+    if session is not None:
+        kwargs['session'] = session
+    if 'services' in payload:
+        return Location(STATION, when=RUN_DATE, **kwargs)
+    return Service(SERVICE_UID, RUN_DATE, **kwargs)
+
+
+def operations(payload):
+    """The benchmarked operations for one payload, by name."""
+    content = encode(payload)
+    text = content.decode()
+    decoded = json.loads(text)
+    session = requests.Session()
+    subject = subject_for(payload, session)
+    session.mount('https://', StubAdapter(content))
+    model = subject.response_model
+    validated = model.model_validate(decoded)
+    return {
+        'uri': lambda: subject.uri,
+        'json_decode': lambda: json.loads(text),
+        'model_validate': lambda: model.model_validate(decoded),
+        'get': subject.get,
+        'to_columns': lambda: batch_columns([validated]),
+    }
+
+
+def ops_per_second(func, repeat):
+    """Best-of-``repeat`` throughput, each run lasting about ``TARGET_SECONDS``."""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * TARGET_SECONDS / elapsed))
+    best = min(timer.repeat(number=number, repeat=repeat))
+    return number / best
+
+
+def peak_memory(func):
+    """Peak bytes allocated while running ``func`` once."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _version(distribution):
+    try:
+        return metadata.version(distribution)
+    except metadata.PackageNotFoundError:
+        # Running from a source checkout that was never installed.
+        return None
+
+
+def environment():
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'traintimes': _version('traintimes'),
+        'pydantic': _version('pydantic'),
+        'requests': _version('requests'),
+    }
+
+
+def run(payloads, repeat=5):
+    """Benchmark every operation on every payload."""
+    results = []
+    for name, payload in payloads.items():
+        size = len(encode(payload))
+        for operation, func in operations(payload).items():
+            results.append(
+                {
+                    'payload': name,
+                    'bytes': size,
+                    'operation': operation,
+                    'ops_per_sec': ops_per_second(func, repeat),
+                    'peak_bytes': peak_memory(func),
+                }
+            )
+    return {'environment': environment(), 'results': results}
+
+
+def report(results, baseline=None, file=sys.stdout):
+    """Print results as a table, with speedups over ``baseline`` if given."""
+    previous = {}
+    if baseline is not None:
+        previous = {
+            (result['payload'], result['operation']): result['ops_per_sec']
+            for result in baseline['results']
+        }
+    print(
+        f'{"payload":<24} {"operation":<15} {"ops/sec":>12} {"peak KiB":>10}'
+        + (f' {"vs base":>8}' if previous else ''),
+        file=file,
+    )
+    for result in results['results']:
+        line = (
+            f'{result["payload"]:<24} {result["operation"]:<15} '
+            f'{result["ops_per_sec"]:>12,.1f} {result["peak_bytes"] / 1024:>10,.1f}'
+        )
+        before = previous.get((result['payload'], result['operation']))
+        if before:
+            line += f' {result["ops_per_sec"] / before:>7.2f}x'
+        print(line, file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', help='directory of recorded <name>.json bodies')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results of an earlier run')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(load_corpus(args.corpus), args.repeat)
+    baseline = None
+    if args.compare:
+        baseline = json.loads(pathlib.Path(args.compare).read_text())
+    report(results, baseline)
+    if args.output:
+        pathlib.Path(args.output).write_text(json.dumps(results, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
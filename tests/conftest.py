@@ -2,10 +2,26 @@
 
 import logging
 
+import pytest
 from dotenv import load_dotenv
 
+from traintimes import config as config_module
+from traintimes.session import set_session
+
 
 load_dotenv()
 
 
 logging.basicConfig(level=logging.DEBUG)
+
+
+@pytest.fixture
+def restore_defaults():
+    """Put back the default config's auth, cache policy and shared session."""
+    auth = config_module.default.auth
+    cache_policy = config_module.default.cache_policy
+    previous = set_session(None)
+    yield
+    set_session(previous)
+    config_module.default.auth = auth
+    config_module.default.cache_policy = cache_policy
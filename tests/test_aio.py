@@ -0,0 +1,160 @@
+import asyncio
+import datetime
+
+import httpx
+import pytest
+from utils import make_client, service_payload
+
+from traintimes import aio
+from traintimes.aio import AsyncClient, AsyncLocation, AsyncService
+from traintimes.cache import CachePolicy
+from traintimes.config import Config
+from traintimes.models import LocationResponse, ServiceResponse
+from traintimes.sdk import ResponseError
+
+
+LOCATION_SAMPLE = {
+    'location': {'name': 'Highbury & Islington', 'crs': 'HIB'},
+    'services': None,
+}
+
+SERVICE_SAMPLE = service_payload('A12345', '2024-01-01')
+
+
+def test_async_location_get():
+    async def handler(request):
+        assert str(request.url) == 'https://api.rtt.io/api/v1/json/search/HIB'
+        return httpx.Response(200, json=LOCATION_SAMPLE)
+
+    async def main():
+        async with make_client(handler) as client:
+            return await AsyncLocation('HIB', client=client).get()
+
+    response = asyncio.run(main())
+
+    assert isinstance(response, LocationResponse)
+    assert response.location.crs == 'HIB'
+
+
+def test_async_service_get():
+    async def handler(request):
+        return httpx.Response(200, json=SERVICE_SAMPLE)
+
+    async def main():
+        async with make_client(handler) as client:
+            subject = AsyncService('A12345', datetime.date(2024, 1, 1), client=client)
+            return await subject.get()
+
+    response = asyncio.run(main())
+
+    assert isinstance(response, ServiceResponse)
+    assert response.service_uid == 'A12345'
+
+
+def test_async_requests_are_not_cached():
+    requests = []
+    policy = CachePolicy()
+
+    async def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=SERVICE_SAMPLE)
+
+    async def main():
+        async with make_client(handler) as client:
+            config = Config(cache_policy=policy)
+            for _ in range(2):
+                subject = AsyncService(
+                    'A12345', datetime.date(2024, 1, 1), client=client, config=config
+                )
+                await subject.get()
+
+    asyncio.run(main())
+
+    assert len(requests) == 2
+    assert all(stats.hits + stats.misses == 0 for stats in policy.stats.values())
+
+
+def test_async_error_envelope():
+    async def handler(request):
+        return httpx.Response(404, json={'error': 'No schedule found'})
+
+    async def main():
+        async with make_client(handler) as client:
+            subject = AsyncService('Q98765', datetime.date(2024, 1, 1), client=client)
+            await subject.get()
+
+    with pytest.raises(ResponseError) as exc:
+        asyncio.run(main())
+    assert exc.value.message == '<no errcode>: No schedule found'
+
+
+def test_concurrency_is_bounded():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json=LOCATION_SAMPLE)
+
+    async def main():
+        async with make_client(handler, max_concurrency=3) as client:
+            await asyncio.gather(
+                *(AsyncLocation('HIB', client=client).get() for _ in range(12))
+            )
+
+    asyncio.run(main())
+
+    assert peak == 3
+
+
+def test_default_client_is_per_loop(monkeypatch):
+    async def handler(request):
+        return httpx.Response(200, json=LOCATION_SAMPLE)
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(
+        aio,
+        'AsyncClient',
+        lambda: AsyncClient(http=httpx.AsyncClient(transport=transport)),
+    )
+
+    async def main():
+        first = aio.default_client()
+        assert aio.default_client() is first
+        await AsyncLocation('HIB').get()
+        await aio.aclose_default_client()
+        await aio.aclose_default_client()
+        assert aio.default_client() is not first
+        await aio.aclose_default_client()
+        return first
+
+    first = asyncio.run(main())
+    assert first is not asyncio.run(main())
+    assert first.http.is_closed
+
+
+def test_client_builds_pooled_http_client():
+    async def main():
+        async with AsyncClient(max_concurrency=5) as client:
+            return client
+
+    client = asyncio.run(main())
+
+    assert client.max_concurrency == 5
+    assert isinstance(client.http, httpx.AsyncClient)
+    assert client.http.is_closed
+
+
+def test_async_get_json():
+    async def handler(request):
+        return httpx.Response(200, json=LOCATION_SAMPLE)
+
+    async def main():
+        async with make_client(handler) as client:
+            return await AsyncLocation('HIB', client=client).get_json()
+
+    assert asyncio.run(main()) == LOCATION_SAMPLE
@@ -0,0 +1,177 @@
+import datetime
+from array import array
+from collections import Counter
+
+import numpy as np
+import pytest
+from utils import service_payload
+
+from traintimes.analytics import DelayAnalysis, JourneyDelay
+from traintimes.columns import batch_columns
+from traintimes.models import DisplayAs, ServiceResponse
+
+
+DATE = datetime.date(2024, 1, 1)
+
+
+def call(crs, booked, realtime, display_as='CALL', arrival=False):
+    kind = 'Arrival' if arrival else 'Departure'
+    event = {'tiploc': f'T{crs}', 'crs': crs, 'displayAs': display_as}
+    if booked:
+        event[f'gbttBooked{kind}'] = booked
+    if realtime:
+        event[f'realtime{kind}'] = realtime
+    return event
+
+
+def service(uid, atoc_code, *locations):
+    return ServiceResponse.model_validate(
+        service_payload(uid, DATE, locations, atocCode=atoc_code, atocName=atoc_code)
+    )
+
+
+SERVICES = [
+    service(
+        'A00001',
+        'SE',
+        call('CHX', '0800', '0802', 'ORIGIN'),
+        call('LBG', '0805', '0810'),
+        call('HIB', '0830', '0845', 'DESTINATION', arrival=True),
+    ),
+    service(
+        'A00002',
+        'SE',
+        call('CHX', '0900', '0900', 'ORIGIN'),
+        call('LBG', '0905', None, 'CANCELLED_CALL'),
+        call('HIB', '0930', '1010', 'DESTINATION', arrival=True),
+    ),
+    service(
+        'A00003',
+        'TL',
+        call('HIB', '2350', '2355', 'ORIGIN'),
+        call('CHX', '0010', '0020', 'TERMINATES', arrival=True),
+    ),
+    service('A00004', 'TL', {'tiploc': 'NOCRS', 'gbttBookedDeparture': '1000'}),
+]
+
+
+@pytest.fixture
+def analysis():
+    return DelayAnalysis.from_responses(SERVICES)
+
+
+def test_lateness_prefers_departure(analysis):
+    assert len(analysis) == 9
+    assert analysis.lateness.tolist() == [2, 5, 15, 0, None, 40, 5, 10, None]
+
+
+def test_summary_by_station(analysis):
+    summary = analysis.summary('crs', percentiles=(50, 90))
+
+    assert set(summary) == {'CHX', 'LBG', 'HIB'}
+    hib = summary['HIB']
+    assert (hib.count, hib.max) == (3, 40)
+    assert hib.mean == pytest.approx(20)
+    assert hib.percentiles == {
+        50: np.percentile([15, 40, 5], 50),
+        90: pytest.approx(np.percentile([15, 40, 5], 90)),
+    }
+    assert summary['LBG'].percentiles == {50: 5.0, 90: 5.0}
+
+
+def test_summary_by_operator_and_hour(analysis):
+    by_operator = analysis.summary('operator')
+    by_hour = analysis.summary('hour')
+
+    assert by_operator['SE'].count == 5
+    assert by_operator['TL'].max == 10
+    assert sorted(by_hour) == [0, 8, 9, 23]
+    assert by_hour[0].count == 1
+    assert 'TNOCRS' not in analysis.summary('tiploc')
+
+
+def test_unknown_grouping(analysis):
+    with pytest.raises(ValueError):
+        analysis.summary('platform')
+
+
+def test_cancellation_rates(analysis):
+    assert analysis.cancellation_rates('crs') == {
+        'CHX': pytest.approx(1 / 3),
+        'HIB': 0.0,
+        'LBG': 0.5,
+    }
+    assert analysis.cancellation_rates('operator') == {'SE': 0.5, 'TL': 0.5}
+
+
+def test_display_counts(analysis):
+    assert analysis.display_counts() == Counter(
+        {
+            DisplayAs.ORIGIN: 3,
+            DisplayAs.CALL: 1,
+            DisplayAs.CANCELLED_CALL: 1,
+            DisplayAs.DESTINATION: 2,
+            DisplayAs.TERMINATES: 1,
+        }
+    )
+
+
+def test_late_services(analysis):
+    assert analysis.late_services() == [('A00002', DATE)]
+    assert analysis.late_services(threshold=4) == [
+        ('A00001', DATE),
+        ('A00002', DATE),
+        ('A00003', DATE),
+    ]
+
+
+def test_journey_delays(analysis):
+    delays = analysis.journey_delays('CHX', 'HIB')
+
+    assert delays == [
+        JourneyDelay('A00001', DATE, 2, 15),
+        JourneyDelay('A00002', DATE, 0, 40),
+    ]
+    assert [delay.change for delay in delays] == [13, 40]
+    assert analysis.journey_delays('THIB', 'TCHX', by='tiploc') == [
+        JourneyDelay('A00003', DATE, 5, 10)
+    ]
+    assert analysis.journey_delays('HIB', 'CHX') == [
+        JourneyDelay('A00003', DATE, 5, 10)
+    ]
+    assert analysis.journey_delays('CHX', 'LBG')[1].arrival_lateness is None
+    assert analysis.journey_delays('CHX', 'LBG')[1].change is None
+
+
+def take(values, rows):
+    taken = [values[row] for row in rows]
+    return array(values.typecode, taken) if isinstance(values, array) else taken
+
+
+def test_rows_need_not_be_whole_services():
+    columns = batch_columns(SERVICES)
+    # Drop every origin, as a station filter would.
+    rows = [row for row, position in enumerate(columns['position']) if position]
+    subset = {name: take(values, rows) for name, values in columns.items()}
+
+    analysis = DelayAnalysis(subset)
+
+    assert analysis.late_services(threshold=4) == [
+        ('A00001', DATE),
+        ('A00002', DATE),
+        ('A00003', DATE),
+    ]
+    assert analysis.cancellation_rates('operator') == {'SE': 0.5, 'TL': 1.0}
+    assert analysis.journey_delays('LBG', 'HIB') == [
+        JourneyDelay('A00001', DATE, 5, 15),
+        JourneyDelay('A00002', DATE, None, 40),
+    ]
+
+
+def test_empty_analysis():
+    analysis = DelayAnalysis.from_responses([])
+
+    assert analysis.summary() == {}
+    assert analysis.cancellation_rates('operator') == {}
+    assert analysis.late_services() == []
+    assert analysis.display_counts() == Counter()
@@ -0,0 +1,189 @@
+import asyncio
+import datetime
+import gzip
+import json
+
+import httpx
+import pytest
+import requests
+import requests_cache
+from utils import make_client, service_payload
+
+from traintimes import config as config_module
+from traintimes.aio import AsyncService
+from traintimes.archive import Archive, ArchiveMiss, IndexEntry, archive_key
+from traintimes.config import Config, configure
+from traintimes.revalidate import Revalidator
+from traintimes.sdk import Location, ResponseError, Service
+
+
+DATE = datetime.date(2025, 10, 16)
+FETCHED_AT = datetime.datetime(2025, 10, 16, 8, 0, tzinfo=datetime.timezone.utc)
+
+
+def board(name):
+    return {'location': {'name': name, 'crs': 'CHX'}, 'services': None}
+
+
+SERVICE = service_payload('W12345', DATE)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return Archive(str(tmp_path), clock=lambda: FETCHED_AT)
+
+
+def fetch(subject_class, *args, archive, **kwargs):
+    config = Config(auth=('user', 'password'), archive=archive)
+    return subject_class(*args, session=requests.Session(), config=config, **kwargs)
+
+
+def test_responses_are_recorded(archive, requests_mock):
+    requests_mock.get(Location('CHX').uri, json=board('Charing Cross'), reason='OK')
+
+    fetch(Location, 'CHX', archive=archive).get()
+
+    [entry] = archive.lookup('search', 'CHX', None)
+    record = archive.read(entry)
+    assert entry.fetched_at == FETCHED_AT
+    assert record.uri == Location('CHX').uri
+    assert record.request == {
+        'station': 'CHX',
+        'to_station': None,
+        'date': None,
+        'time': None,
+        'arrivals': False,
+    }
+    assert (record.status_code, record.reason, record.ok) == (200, 'OK', True)
+    assert (
+        record.content
+        == b'{"location": {"name": "Charing Cross", "crs": "CHX"}, "services": null}'
+    )
+
+
+def test_replay_from_a_reopened_archive(archive, requests_mock, tmp_path):
+    requests_mock.get(Service('W12345', DATE).uri, json=SERVICE)
+    recorded = fetch(Service, 'W12345', DATE, archive=archive).get()
+    requests_mock.reset()
+
+    replay = Archive(str(tmp_path), replay=True)
+    replayed = fetch(Service, 'W12345', DATE, archive=replay).get()
+
+    assert replayed == recorded
+    assert requests_mock.call_count == 0
+    assert len(replay) == 1
+
+
+def test_replay_serves_the_latest_record_of_the_uri(archive, requests_mock):
+    to_london = Location('CHX', 'LBG', DATE)
+    requests_mock.get(Location('CHX', when=DATE).uri, json=board('First'))
+    requests_mock.get(to_london.uri, json=board('Filtered'))
+    fetch(Location, 'CHX', when=DATE, archive=archive).get()
+    fetch(Location, 'CHX', 'LBG', DATE, archive=archive).get()
+    requests_mock.get(Location('CHX', when=DATE).uri, json=board('Second'))
+    fetch(Location, 'CHX', when=DATE, archive=archive).get()
+    archive.replay = True
+
+    replayed = fetch(Location, 'CHX', when=DATE, archive=archive).get()
+    filtered = fetch(Location, 'CHX', 'LBG', DATE, archive=archive).get()
+
+    assert replayed.location.name == 'Second'
+    assert filtered.location.name == 'Filtered'
+    assert len(archive.lookup(*archive_key(to_london))) == 3
+    with pytest.raises(ArchiveMiss):
+        fetch(Location, 'LBG', when=DATE, archive=archive).get()
+
+
+def test_errors_are_recorded_and_replayed(archive, requests_mock):
+    requests_mock.get(
+        Location('XXX').uri, status_code=404, reason='Not Found', json={'error': 'No'}
+    )
+    with pytest.raises(ResponseError):
+        fetch(Location, 'XXX', archive=archive).get()
+    archive.replay = True
+
+    with pytest.raises(ResponseError, match='No'):
+        fetch(Location, 'XXX', archive=archive).get()
+    assert [record.ok for record in archive] == [False]
+
+
+def test_not_modified_responses_are_not_recorded(archive, requests_mock):
+    uri = Location('CHX').uri
+    requests_mock.get(uri, [{'json': board('CHX'), 'headers': {'ETag': '"1"'}}])
+    config = Config(auth=('u', 'p'), archive=archive, revalidator=Revalidator())
+    Location('CHX', session=requests.Session(), config=config).get()
+    requests_mock.get(uri, status_code=304)
+
+    Location('CHX', session=requests.Session(), config=config).get()
+
+    assert len(archive) == 1
+
+
+def test_cached_responses_are_not_recorded(archive, requests_mock):
+    requests_mock.get(Location('CHX').uri, json=board('CHX'))
+    session = requests_cache.CachedSession(backend='memory')
+    config = Config(auth=('u', 'p'), archive=archive)
+
+    for _ in range(2):
+        Location('CHX', session=session, config=config).get()
+
+    assert requests_mock.call_count == 1
+    assert len(archive) == 1
+
+
+def test_chunks_roll_over(tmp_path, requests_mock):
+    archive = Archive(str(tmp_path), chunk_bytes=300)
+    for name in ('A', 'B', 'C'):
+        requests_mock.get(Location('CHX').uri, json=board(name * 100))
+        fetch(Location, 'CHX', archive=archive).get()
+
+    reopened = Archive(str(tmp_path))
+    requests_mock.get(Location('CHX').uri, json=board('D'))
+    fetch(Location, 'CHX', archive=reopened).get()
+
+    chunks = sorted(path.name for path in tmp_path.glob('chunk-*.gz'))
+    assert chunks == ['chunk-000001.gz', 'chunk-000002.gz', 'chunk-000003.gz']
+    assert [entry.chunk for entry in reopened.entries][-1] == 'chunk-000003.gz'
+    names = [json.loads(record.content)['location']['name'][0] for record in reopened]
+    assert names == ['A', 'B', 'C', 'D']
+    # Each chunk is a valid (multi-member) gzip file.
+    assert gzip.open(tmp_path / 'chunk-000003.gz').read().count(b'\n') == 2
+
+
+def test_index_entries_round_trip():
+    entry = IndexEntry(
+        'service', 'W12345', DATE, 'uri', FETCHED_AT, 'chunk-000001.gz', 10, 20
+    )
+
+    assert IndexEntry.from_json(entry.to_json()) == entry
+
+
+def test_async_record_and_replay(archive):
+    async def handler(request):
+        return httpx.Response(200, json=SERVICE)
+
+    async def main():
+        async with make_client(handler) as client:
+            config = Config(auth=('u', 'p'), archive=archive)
+            recorded = await AsyncService(
+                'W12345', DATE, client=client, config=config
+            ).get()
+            archive.replay = True
+            replayed = await AsyncService(
+                'W12345', DATE, client=client, config=config
+            ).get()
+            return recorded, replayed
+
+    recorded, replayed = asyncio.run(main())
+
+    assert replayed == recorded
+    assert len(archive) == 1
+
+
+def test_configure_archive(archive):
+    previous = config_module.default.archive
+    try:
+        configure(archive=archive)
+        assert config_module.default.archive is archive
+    finally:
+        config_module.default.archive = previous
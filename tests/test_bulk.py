@@ -0,0 +1,240 @@
+import asyncio
+import datetime
+
+import httpx
+import pytest
+from utils import service_payload
+
+from traintimes import aio
+from traintimes.bulk import (
+    fetch_services,
+    merge_locations,
+    plan_windows,
+    service_keys,
+    sweep_location,
+)
+from traintimes.models import LocationResponse
+from traintimes.sdk import Location, ResponseError, Service
+
+
+DATE = datetime.date(2024, 1, 1)
+
+
+def board(*service_uids):
+    return LocationResponse.model_validate(
+        {
+            'location': {'name': 'Highbury & Islington'},
+            'services': [
+                {
+                    'locationDetail': {'tiploc': 'HIBURY'},
+                    'serviceUid': service_uid,
+                    'runDate': '2024-01-01',
+                    'atocCode': 'ZZ',
+                    'atocName': 'Zed Rail',
+                    'serviceType': 'train',
+                    'isPassenger': True,
+                }
+                for service_uid in service_uids
+            ],
+        }
+    )
+
+
+def test_service_keys_from_board_are_deduplicated_in_order():
+    keys = service_keys(board('B00002', 'A00001', 'B00002'))
+
+    assert keys == [('B00002', DATE), ('A00001', DATE)]
+
+
+def test_service_keys_from_pairs():
+    assert service_keys([('A00001', DATE)]) == [('A00001', DATE)]
+
+
+def test_fetch_services_preserves_order_and_isolates_errors(requests_mock):
+    for uid in ('A00001', 'C00003'):
+        requests_mock.get(Service(uid, DATE).uri, json=service_payload(uid, DATE))
+    requests_mock.get(Service('B00002', DATE).uri, json={'error': 'No schedule found'})
+
+    results = fetch_services(
+        [('A00001', DATE), ('B00002', DATE), ('C00003', DATE), ('bad', DATE)],
+        max_workers=4,
+    )
+
+    assert [r.service_uid for r in results] == ['A00001', 'B00002', 'C00003', 'bad']
+    assert [r.ok for r in results] == [True, False, True, False]
+    assert results[0].response.service_uid == 'A00001'
+    assert isinstance(results[1].error, ResponseError)
+    assert results[2].response.service_uid == 'C00003'
+
+
+def test_fetch_services_from_board(requests_mock):
+    for uid in ('A00001', 'B00002'):
+        requests_mock.get(Service(uid, DATE).uri, json=service_payload(uid, DATE))
+
+    results = fetch_services(board('A00001', 'B00002', 'A00001'))
+
+    assert [r.response.service_uid for r in results] == ['A00001', 'B00002']
+    assert requests_mock.call_count == 2
+
+
+def test_fetch_services_empty():
+    assert fetch_services([]) == []
+
+
+def test_async_fetch_services():
+    async def handler(request):
+        uid = request.url.path.split('/')[5]
+        if uid == 'B00002':
+            return httpx.Response(404, json={'error': 'No schedule found'})
+        return httpx.Response(200, json=service_payload(uid, DATE))
+
+    async def main():
+        transport = httpx.MockTransport(handler)
+        async with aio.AsyncClient(
+            max_concurrency=2, http=httpx.AsyncClient(transport=transport)
+        ) as client:
+            return await aio.fetch_services(
+                board('A00001', 'B00002', 'C00003'), client=client
+            )
+
+    results = asyncio.run(main())
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[2].response.service_uid == 'C00003'
+
+
+class TestSweep:
+    def test_plan_partial_day_uses_hourly_windows(self):
+        windows = plan_windows(
+            datetime.datetime(2024, 1, 1, 18, 30, 15),
+            datetime.datetime(2024, 1, 1, 21, 0),
+        )
+
+        assert windows == [
+            datetime.datetime(2024, 1, 1, 18, 30),
+            datetime.datetime(2024, 1, 1, 19, 30),
+            datetime.datetime(2024, 1, 1, 20, 30),
+        ]
+
+    def test_plan_whole_days_use_date_queries(self):
+        windows = plan_windows(
+            datetime.datetime(2024, 1, 1, 22, 0),
+            datetime.datetime(2024, 1, 3, 1, 0),
+        )
+
+        assert windows == [
+            datetime.datetime(2024, 1, 1, 22, 0),
+            datetime.datetime(2024, 1, 1, 23, 0),
+            datetime.date(2024, 1, 2),
+            datetime.datetime(2024, 1, 3, 0, 0),
+        ]
+
+    def test_plan_partial_day_stops_at_midnight(self):
+        windows = plan_windows(
+            datetime.datetime(2024, 1, 1, 22, 30),
+            datetime.datetime(2024, 1, 3, 0, 0),
+        )
+
+        assert windows == [
+            datetime.datetime(2024, 1, 1, 22, 30),
+            datetime.datetime(2024, 1, 1, 23, 30),
+            datetime.date(2024, 1, 2),
+        ]
+
+    def test_plan_converts_aware_times_to_london(self):
+        utc = datetime.timezone.utc
+        windows = plan_windows(
+            datetime.datetime(2024, 6, 1, 21, 30, tzinfo=utc),
+            datetime.datetime(2024, 6, 2, 23, 0, tzinfo=utc),
+        )
+
+        assert windows == [
+            datetime.datetime(2024, 6, 1, 22, 30),
+            datetime.datetime(2024, 6, 1, 23, 30),
+            datetime.date(2024, 6, 2),
+        ]
+
+    def test_plan_empty_span(self):
+        when = datetime.datetime(2024, 1, 1, 12, 0)
+
+        assert plan_windows(when, when) == []
+
+    def test_merge_deduplicates_on_uid_and_run_date(self):
+        merged = merge_locations([board('A00001', 'B00002'), board('B00002', 'C00003')])
+
+        assert [s.service_uid for s in merged.services] == [
+            'A00001',
+            'B00002',
+            'C00003',
+        ]
+        assert merged.location.name == 'Highbury & Islington'
+
+    def test_merge_sorts_by_booked_time(self):
+        late = board('C00003')
+        late.services[0].location_detail.gbtt_booked_departure = '0930'
+        early = board('A00001', 'B00002')
+        early.services[0].location_detail.gbtt_booked_departure = '0815'
+
+        merged = merge_locations([late, early])
+
+        assert [s.service_uid for s in merged.services] == [
+            'A00001',
+            'C00003',
+            'B00002',
+        ]
+
+    def test_sweep_location(self, requests_mock):
+        start = datetime.datetime(2024, 1, 1, 8, 0)
+        requests_mock.get(
+            Location('HIB', 'CHX', start).uri,
+            json=board('A00001', 'B00002').model_dump(by_alias=True, mode='json'),
+        )
+        requests_mock.get(
+            Location('HIB', 'CHX', start.replace(hour=9)).uri,
+            json=board('B00002', 'C00003').model_dump(by_alias=True, mode='json'),
+        )
+
+        merged = sweep_location('HIB', start, start.replace(hour=10), 'CHX')
+
+        assert [s.service_uid for s in merged.services] == [
+            'A00001',
+            'B00002',
+            'C00003',
+        ]
+        assert requests_mock.call_count == 2
+
+    def test_sweep_location_trims_to_the_span(self, requests_mock):
+        start = datetime.datetime(2024, 1, 1, 8, 0)
+        services = board('A00001', 'B00002', 'C00003', 'D00004')
+        services.services[0].location_detail.gbtt_booked_departure = '0759'
+        services.services[1].location_detail.gbtt_booked_arrival = '0830'
+        services.services[2].location_detail.wtt_booked_pass = '0900'
+        requests_mock.get(
+            Location('HIB', when=start).uri,
+            json=services.model_dump(by_alias=True, mode='json'),
+        )
+
+        merged = sweep_location('HIB', start, start.replace(hour=9))
+
+        assert [s.service_uid for s in merged.services] == ['B00002', 'D00004']
+
+    def test_sweep_location_with_aware_times(self, requests_mock):
+        services = board('A00001', 'B00002')
+        services.services[0].location_detail.gbtt_booked_departure = '0759'
+        services.services[1].location_detail.gbtt_booked_departure = '0800'
+        requests_mock.get(
+            Location('HIB', when=datetime.datetime(2024, 1, 1, 8, 0)).uri,
+            json=services.model_dump(by_alias=True, mode='json'),
+        )
+        azores = datetime.timezone(-datetime.timedelta(hours=1))
+        start = datetime.datetime(2024, 1, 1, 7, 0, tzinfo=azores)
+
+        merged = sweep_location('HIB', start, start.replace(minute=30))
+
+        assert [s.service_uid for s in merged.services] == ['B00002']
+
+    def test_sweep_location_rejects_empty_span(self):
+        when = datetime.datetime(2024, 1, 1, 12, 0)
+
+        with pytest.raises(ValueError):
+            sweep_location('HIB', when, when)
@@ -0,0 +1,154 @@
+import datetime
+
+import pytest
+import requests
+import requests_cache
+from freezegun import freeze_time
+
+from traintimes import config as config_module
+from traintimes.cache import (
+    HISTORY,
+    LIVE,
+    NEVER_EXPIRE,
+    TIMETABLE,
+    CachePolicy,
+    CacheStats,
+)
+from traintimes.config import Config, configure
+from traintimes.models import LocationRequest, ServiceRequest
+from traintimes.sdk import Location, Service
+from traintimes.session import get_session, make_session
+
+
+TODAY = datetime.date(2025, 10, 16)
+
+BOARD = {'location': {'name': 'Highbury & Islington'}, 'services': None}
+
+
+@pytest.fixture
+def today():
+    with freeze_time('2025-10-16 12:00:00'):
+        yield
+
+
+@pytest.fixture
+def cached_session():
+    return make_session(session=requests_cache.CachedSession(backend='memory'))
+
+
+@pytest.mark.parametrize(
+    'request_, rule',
+    [
+        (LocationRequest.from_inputs('HIB'), LIVE),
+        (LocationRequest.from_inputs('HIB', when=TODAY), LIVE),
+        (LocationRequest.from_inputs('HIB', when=datetime.date(2025, 10, 1)), HISTORY),
+        (ServiceRequest.from_inputs('A12345', datetime.date(2025, 10, 14)), HISTORY),
+        (ServiceRequest.from_inputs('A12345', datetime.date(2025, 10, 15)), LIVE),
+        (ServiceRequest.from_inputs('A12345', TODAY), LIVE),
+        (ServiceRequest.from_inputs('A12345', datetime.date(2025, 11, 1)), TIMETABLE),
+    ],
+)
+def test_rule_for(today, request_, rule):
+    assert CachePolicy().rule_for(request_) == rule
+
+
+@freeze_time('2025-10-16 23:30:00')
+def test_today_is_reckoned_in_london():
+    # 00:30 on the 17th in London, still the 16th in UTC.
+    policy = CachePolicy()
+
+    assert policy.rule_for(ServiceRequest.from_inputs('A12345', TODAY)) == LIVE
+    next_day = TODAY + datetime.timedelta(days=1)
+    assert policy.rule_for(ServiceRequest.from_inputs('A12345', next_day)) == LIVE
+
+
+def test_default_lifetimes():
+    policy = CachePolicy()
+
+    assert policy.expire_after(HISTORY) == NEVER_EXPIRE
+    assert policy.expire_after(LIVE) == datetime.timedelta(seconds=30)
+    assert policy.expire_after(TIMETABLE) == datetime.timedelta(hours=6)
+
+
+def test_hit_rate():
+    assert CacheStats().hit_rate == 0.0
+    assert CacheStats(hits=3, misses=1).hit_rate == 0.75
+
+
+def test_history_is_cached_indefinitely(today, cached_session, requests_mock):
+    policy = CachePolicy()
+    config = Config(cache_policy=policy)
+    when = datetime.date(2025, 10, 1)
+    requests_mock.get(Location('HIB', when=when).uri, json=BOARD)
+
+    for _ in range(3):
+        Location('HIB', when=when, session=cached_session, config=config).get()
+
+    assert requests_mock.call_count == 1
+    assert policy.stats[HISTORY] == CacheStats(hits=2, misses=1)
+    (response,) = cached_session.cache.responses.values()
+    assert response.expires is None
+
+
+def test_live_board_expires_in_seconds(cached_session, requests_mock):
+    policy = CachePolicy()
+    config = Config(cache_policy=policy)
+    requests_mock.get(Location('HIB').uri, json=BOARD)
+
+    with freeze_time('2025-10-16 12:00:00') as frozen:
+        Location('HIB', session=cached_session, config=config).get()
+        frozen.tick(10)
+        Location('HIB', session=cached_session, config=config).get()
+        frozen.tick(30)
+        Location('HIB', session=cached_session, config=config).get()
+
+    assert requests_mock.call_count == 2
+    assert policy.stats[LIVE] == CacheStats(hits=1, misses=2)
+
+
+def test_future_timetable_uses_hours(today, cached_session, requests_mock):
+    policy = CachePolicy(timetable=datetime.timedelta(hours=2))
+    subject = Service(
+        'A12345',
+        datetime.date(2025, 11, 1),
+        session=cached_session,
+        config=Config(cache_policy=policy),
+    )
+    requests_mock.get(subject.uri, json={'error': 'No schedule found'})
+
+    response = subject.send()
+
+    assert response.expires == datetime.datetime(
+        2025, 10, 16, 14, 0, tzinfo=datetime.timezone.utc
+    )
+    assert policy.stats[TIMETABLE] == CacheStats(misses=1)
+
+
+def test_policy_ignored_without_cached_session(requests_mock):
+    policy = CachePolicy()
+    subject = Location(
+        'HIB', session=requests.Session(), config=Config(cache_policy=policy)
+    )
+    requests_mock.get(subject.uri, json=BOARD)
+
+    subject.get()
+
+    assert policy.stats[LIVE] == CacheStats()
+
+
+def test_configure_cache_installs_default_policy(restore_defaults):
+    config_module.default.cache_policy = None
+
+    configure(cache='memory')
+
+    assert isinstance(config_module.default.cache_policy, CachePolicy)
+
+
+def test_configure_custom_policy_and_backend(restore_defaults):
+    policy = CachePolicy(live=5)
+    backend = requests_cache.SQLiteCache(use_memory=True)
+
+    configure(cache=backend, cache_policy=policy)
+
+    assert config_module.default.cache_policy is policy
+    assert get_session().cache is backend
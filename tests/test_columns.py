@@ -0,0 +1,155 @@
+import datetime
+from array import array
+
+import numpy as np
+import pyarrow as pa
+import pytest
+from utils import service_payload
+
+from traintimes.columns import (
+    DISPLAY_AS_CODES,
+    DISPLAY_AS_MISSING,
+    MISSING,
+    batch_columns,
+    to_arrays,
+)
+from traintimes.models import DisplayAs, LocationResponse, ServiceResponse
+
+
+RUN_DATE = datetime.date(2024, 1, 1)
+
+SERVICE = ServiceResponse.model_validate(
+    service_payload(
+        'A12345',
+        RUN_DATE,
+        [
+            {
+                'tiploc': 'CHRX',
+                'crs': 'CHX',
+                'gbttBookedDeparture': '0800',
+                'realtimeDeparture': '0803',
+                'realtimeGbttDepartureLateness': 3,
+                'platform': '4',
+                'displayAs': 'ORIGIN',
+            },
+            {
+                'tiploc': 'HIBURY',
+                'crs': 'HIB',
+                'gbttBookedArrival': '0815',
+                'realtimeArrival': '0814',
+                'realtimeGbttArrivalLateness': -1,
+                'displayAs': 'DESTINATION',
+            },
+        ],
+    )
+)
+
+BOARD = LocationResponse.model_validate(
+    {
+        'location': {'name': 'Highbury & Islington'},
+        'services': [
+            {
+                'locationDetail': {'tiploc': 'HIBURY', 'gbttBookedDeparture': '2359'},
+                'serviceUid': 'B00001',
+                'runDate': '2024-01-02',
+                'atocCode': 'TL',
+                'atocName': 'Thameslink',
+                'serviceType': 'train',
+                'isPassenger': True,
+            }
+        ],
+    }
+)
+
+
+def test_service_columns():
+    columns = SERVICE.to_columns()
+
+    assert columns['service_uid'] == ['A12345', 'A12345']
+    assert columns['run_date'] == array('i', [RUN_DATE.toordinal()] * 2)
+    assert columns['position'] == array('i', [0, 1])
+    assert columns['tiploc'] == ['CHRX', 'HIBURY']
+    assert columns['crs'] == ['CHX', 'HIB']
+    assert columns['platform'] == ['4', None]
+    assert columns['display_as'] == array(
+        'b',
+        [DISPLAY_AS_CODES[DisplayAs.ORIGIN], DISPLAY_AS_CODES[DisplayAs.DESTINATION]],
+    )
+    assert columns['booked_departure'] == array('i', [480, MISSING])
+    assert columns['realtime_arrival'] == array('i', [MISSING, 494])
+    assert columns['departure_lateness'] == array('i', [3, MISSING])
+    assert columns['arrival_lateness'] == array('i', [MISSING, -1])
+
+
+def test_service_columns_roll_over_midnight_like_timings():
+    overnight = ServiceResponse.model_validate(
+        {
+            **SERVICE.model_dump(by_alias=True),
+            'locations': [
+                {
+                    'tiploc': 'A',
+                    'gbttBookedDeparture': '2350',
+                    'realtimeDeparture': '0005',
+                },
+                {'tiploc': 'B', 'wttBookedPass': '235930'},
+                {
+                    'tiploc': 'C',
+                    'gbttBookedArrival': '0010H',
+                    'realtimeArrival': '2358',
+                },
+                {'tiploc': 'D', 'realtimeArrival': '0100'},
+                {'tiploc': 'E', 'gbttBookedArrival': '0130', 'gbttBookedDeparture': ''},
+            ],
+        }
+    )
+
+    columns = overnight.to_columns()
+
+    for column, field in [
+        ('booked_arrival', 'gbtt_booked_arrival'),
+        ('booked_departure', 'gbtt_booked_departure'),
+        ('realtime_arrival', 'realtime_arrival'),
+        ('realtime_departure', 'realtime_departure'),
+    ]:
+        expected = [
+            MISSING if minutes is None else minutes
+            for minutes in overnight.minutes(field)
+        ]
+        assert list(columns[column]) == expected
+    assert columns['realtime_departure'][0] == 24 * 60 + 5
+
+
+def test_batch_columns_mixes_boards_and_services():
+    columns = batch_columns([SERVICE, BOARD])
+
+    assert columns['service_uid'] == ['A12345', 'A12345', 'B00001']
+    assert columns['atoc_code'] == ['SE', 'SE', 'TL']
+    assert columns['position'][2] == 0
+    assert columns['booked_departure'][2] == 1439
+    assert columns['display_as'][2] == DISPLAY_AS_MISSING
+
+
+def test_to_numpy_masks_missing_values():
+    arrays = SERVICE.to_arrays()
+
+    lateness = arrays['departure_lateness']
+    assert lateness.dtype == np.int32
+    assert lateness.mask.tolist() == [False, True]
+    assert lateness.sum() == 3
+    assert arrays['tiploc'].tolist() == ['CHRX', 'HIBURY']
+    assert not np.ma.getmaskarray(arrays['display_as']).any()
+
+
+def test_to_arrow_uses_nulls():
+    table = BOARD.to_arrays('arrow')
+
+    assert isinstance(table, pa.Table)
+    assert table.column('booked_departure').to_pylist() == [1439]
+    assert table.column('realtime_departure').to_pylist() == [None]
+    assert table.column('display_as').to_pylist() == [None]
+    assert table.column('platform').to_pylist() == [None]
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        to_arrays(batch_columns([]), 'pandas')
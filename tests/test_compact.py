@@ -0,0 +1,152 @@
+import datetime
+import tracemalloc
+
+import pytest
+from utils import service_payload
+
+from traintimes.compact import (
+    CompactBoard,
+    CompactEvent,
+    CompactPair,
+    CompactService,
+    Interner,
+    compact,
+)
+from traintimes.models import (
+    DisplayAs,
+    LocationResponse,
+    ServiceResponse,
+    ServiceType,
+)
+
+
+ORIGIN = {'tiploc': 'CHRX', 'description': 'London Charing Cross', 'publicTime': '0800'}
+DESTINATION = {'tiploc': 'HSTNGS', 'description': 'Hastings', 'publicTime': '0945'}
+
+
+def event(tiploc, **fields):
+    return {
+        'realtimeActivated': True,
+        'tiploc': tiploc,
+        'crs': tiploc[:3],
+        'description': tiploc.title(),
+        'origin': [ORIGIN],
+        'destination': [DESTINATION],
+        'isCall': True,
+        'displayAs': 'CALL',
+        **fields,
+    }
+
+
+SERVICE = ServiceResponse.model_validate(
+    service_payload(
+        'W12345',
+        '2025-10-16',
+        [
+            event('CHRX', gbttBookedDeparture='0800', displayAs='ORIGIN'),
+            event(
+                'LNDNBDE',
+                gbttBookedArrival='0805',
+                realtimeArrivalActual=False,
+                realtimeGbttArrivalLateness=2,
+                serviceLocation='AT_PLAT',
+                platform='6',
+            ),
+            event('HSTNGS', gbttBookedArrival='0945', displayAs='DESTINATION'),
+        ],
+        origin=[ORIGIN],
+        destination=[DESTINATION],
+    )
+)
+
+BOARD = LocationResponse.model_validate(
+    {
+        'location': {'name': 'London Bridge', 'crs': 'LBG'},
+        'services': [
+            {
+                'locationDetail': event('LNDNBDE', gbttBookedDeparture='0806'),
+                'serviceUid': 'W12345',
+                'runDate': '2025-10-16',
+                'atocCode': 'SE',
+                'atocName': 'Southeastern',
+                'serviceType': 'train',
+                'isPassenger': False,
+                'origin': [ORIGIN],
+                'countdownMinutes': 4,
+            }
+        ],
+    }
+)
+
+
+@pytest.mark.parametrize('response', [SERVICE, BOARD])
+def test_round_trip(response):
+    assert compact(response).to_model() == response
+
+
+def test_attributes_read_like_the_model():
+    service = CompactService.from_model(SERVICE)
+    call = service.locations[1]
+
+    assert service.run_date == datetime.date(2025, 10, 16)
+    assert service.service_type is ServiceType.TRAIN
+    assert service.sleeper is None
+    assert call.display_as is DisplayAs.CALL
+    assert call.realtime_gbtt_arrival_lateness == 2
+    assert call.realtime_arrival_actual is False
+    assert call.realtime_departure is None
+    assert call.origin == (CompactPair('CHRX', 'London Charing Cross', None, '0800'),)
+    with pytest.raises(AttributeError, match='no attribute'):
+        call.timings
+
+
+def test_defaults():
+    empty = CompactEvent.from_model(
+        SERVICE.locations[0].model_copy(
+            update={'realtime_activated': False, 'origin': [], 'destination': []}
+        )
+    )
+
+    assert empty.realtime_activated is False
+    assert empty.origin == ()
+    assert compact(LocationResponse(location=BOARD.location)).services == ()
+
+
+def test_repeated_values_are_shared():
+    interner = Interner()
+    first = compact(SERVICE, interner)
+    second = compact(SERVICE.model_copy(deep=True), interner)
+
+    assert first.locations[0].origin is first.origin
+    assert second.locations[2].destination is first.destination
+    assert second.locations[1].tiploc is first.locations[1].tiploc
+
+
+def test_equality_and_repr():
+    board = CompactBoard.from_model(BOARD)
+    service = board.services[0]
+
+    assert board == compact(BOARD)
+    assert hash(compact(SERVICE)) == hash(compact(SERVICE))
+    assert board != compact(SERVICE)
+    assert service.countdown_minutes == 4
+    assert service.is_passenger is False
+    assert repr(service).startswith("CompactLocationService(location_detail=Compact")
+    assert 'countdown_minutes=4' in repr(service)
+
+
+def test_compact_copies_are_smaller():
+    services = [SERVICE.model_copy(deep=True) for _ in range(20)]
+
+    def size(build):
+        tracemalloc.start()
+        result = build()
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del result
+        return used
+
+    full = size(lambda: [s.model_copy(deep=True) for s in services])
+    small = size(lambda: [compact(s) for s in services])
+
+    assert small * 3 < full
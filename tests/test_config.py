@@ -0,0 +1,98 @@
+import logging
+import os
+
+import pytest
+import requests_cache
+
+from traintimes import config as config_module
+from traintimes.config import Config, configure, get_config
+from traintimes.sdk import Location
+from traintimes.session import get_session
+
+
+@pytest.fixture
+def no_env_auth(monkeypatch, tmp_path):
+    monkeypatch.setenv('RTT_AUTH', 'placeholder')
+    monkeypatch.delenv('RTT_AUTH')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_explicit_auth():
+    assert Config(auth=('user', 'pass')).get_auth() == ('user', 'pass')
+
+
+def test_auth_read_from_environment(monkeypatch):
+    monkeypatch.setenv('RTT_AUTH', 'user:pass')
+
+    assert Config().get_auth() == ('user', 'pass')
+
+
+def test_auth_read_from_dotenv_file(no_env_auth):
+    (no_env_auth / '.env').write_text('RTT_AUTH=dot:env\n')
+
+    assert Config().get_auth() == ('dot', 'env')
+
+
+def test_auth_missing(no_env_auth):
+    (no_env_auth / '.env').write_text('RTT_AUTH=dot:env\n')
+
+    assert Config(load_dotenv=False).get_auth() is None
+    assert 'RTT_AUTH' not in os.environ
+
+
+def test_get_config_is_default():
+    assert get_config() is config_module.default
+
+
+def test_request_uses_given_config():
+    custom = Config(auth=('a', 'b'))
+
+    assert Location('HIB', config=custom).auth == ('a', 'b')
+    assert Location('HIB').config is get_config()
+
+
+def test_configure_auth(restore_defaults):
+    configure(auth=['user', 'pass'])
+
+    assert Location('HIB').auth == ('user', 'pass')
+
+
+def test_configure_api_root():
+    previous = config_module.default.api_root
+    try:
+        configure(api_root='http://127.0.0.1:8080')
+        assert Location('HIB').uri == 'http://127.0.0.1:8080/api/v1/json/search/HIB'
+    finally:
+        config_module.default.api_root = previous
+
+
+def test_configure_memory_cache(restore_defaults):
+    configure(cache='memory')
+
+    session = get_session()
+    assert isinstance(session, requests_cache.CachedSession)
+    assert session.settings.allowable_codes == (200,)
+    assert session.get_adapter('https://api.rtt.io/')._pool_maxsize == 16
+
+
+def test_configure_sqlite_cache_creates_directory(restore_defaults, tmp_path):
+    configure(cache='sqlite', cache_name=str(tmp_path / 'nested' / 'cache'))
+
+    assert (tmp_path / 'nested').is_dir()
+    assert isinstance(get_session(), requests_cache.CachedSession)
+
+
+def test_configure_cache_in_current_directory(restore_defaults, no_env_auth):
+    configure(cache='sqlite', cache_name='cache')
+
+    assert isinstance(get_session(), requests_cache.CachedSession)
+
+
+def test_configure_log_level(monkeypatch):
+    calls = []
+    monkeypatch.setattr(logging, 'basicConfig', lambda **kw: calls.append(kw))
+
+    configure(log_level=logging.INFO)
+
+    assert calls == [{'level': logging.INFO}]
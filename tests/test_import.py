@@ -0,0 +1,65 @@
+"""Guard against ``import traintimes`` becoming slow or gaining side effects."""
+
+import logging
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+import traintimes
+
+
+HEAVY_MODULES = ('dotenv', 'purl', 'pydantic', 'requests', 'requests_cache')
+
+# Generous ceiling for the package's own import time; it currently takes well
+# under a millisecond as nothing beyond the standard library is loaded.
+IMPORT_BUDGET_US = 50_000
+
+
+def run_python(code, cwd):
+    package_root = os.path.dirname(os.path.dirname(traintimes.__file__))
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=cwd,
+        env={**os.environ, 'PYTHONPATH': package_root},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_loads_no_heavy_dependencies(tmp_path):
+    result = run_python(
+        'import logging, sys, traintimes\n'
+        f'print(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n'
+        'print(logging.getLogger().handlers)',
+        cwd=tmp_path,
+    )
+
+    assert result.stdout.splitlines() == ['[]', '[]']
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_import_time_within_budget(tmp_path):
+    result = run_python('import traintimes', cwd=tmp_path)
+
+    (line,) = [
+        line for line in result.stderr.splitlines() if line.endswith('| traintimes')
+    ]
+    cumulative_us = int(re.split(r'\s*\|\s*', line)[1])
+    assert cumulative_us < IMPORT_BUDGET_US
+
+
+def test_lazy_attributes():
+    from traintimes import sdk
+
+    assert traintimes.Location is sdk.Location
+    assert 'Service' in dir(traintimes)
+    assert logging.getLogger('traintimes').handlers == []
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        traintimes.Nope
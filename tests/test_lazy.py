@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+import httpx
+from utils import make_client
+
+from traintimes.aio import AsyncLocation
+from traintimes.lazy import LazyLocationResponse, LazyServices
+from traintimes.models import LocationResponse, LocationService
+from traintimes.sdk import Location
+
+
+def raw_service(service_uid, atoc_code='SE', destinations=('CHRX',)):
+    return {
+        'locationDetail': {
+            'tiploc': 'HIBURY',
+            'destination': [
+                {'tiploc': tiploc, 'description': tiploc} for tiploc in destinations
+            ],
+        },
+        'serviceUid': service_uid,
+        'runDate': '2024-01-01',
+        'atocCode': atoc_code,
+        'atocName': 'Operator',
+        'serviceType': 'train',
+        'isPassenger': True,
+    }
+
+
+PAYLOAD = {
+    'location': {'name': 'Highbury & Islington', 'crs': 'HIB'},
+    'filter': {'to': {'name': 'Charing Cross', 'crs': 'CHX'}},
+    'services': [
+        raw_service('A00001'),
+        raw_service('A00002', atoc_code='TL', destinations=('BTN',)),
+        raw_service('A00003', destinations=('DOVERP', 'CNTBW')),
+        raw_service('A00004', atoc_code='TL'),
+    ],
+}
+
+
+def test_services_are_validated_on_access():
+    board = LazyLocationResponse.from_dict(PAYLOAD)
+
+    assert len(board.services) == 4
+    assert board.services.validated == 0
+    first = board.services[0]
+    assert isinstance(first, LocationService)
+    assert board.services[0] is first
+    assert board.services.validated == 1
+    assert board.location.crs == 'HIB'
+    assert board.filter.to.crs == 'CHX'
+
+
+def test_slicing_validates_only_the_slice():
+    board = LazyLocationResponse.from_dict(PAYLOAD)
+
+    assert [s.service_uid for s in board.services[:2]] == ['A00001', 'A00002']
+    assert board.services.validated == 2
+
+
+def test_filter_on_raw_fields_validates_nothing():
+    services = LazyLocationResponse.from_dict(PAYLOAD).services
+
+    assert [s['serviceUid'] for s in services.filter(atoc_code='TL').raw] == [
+        'A00002',
+        'A00004',
+    ]
+    assert len(services.filter(service_uid={'A00001', 'A00003'})) == 2
+    assert services.filter(destination_tiploc=['DOVERP', 'BTN']).raw == [
+        PAYLOAD['services'][1],
+        PAYLOAD['services'][2],
+    ]
+    assert services.validated == 0
+
+
+def test_filter_combines_criteria_and_keeps_validated_models():
+    services = LazyLocationResponse.from_dict(PAYLOAD).services
+    fourth = services[3]
+
+    selected = services.filter(
+        atoc_code='TL',
+        destination_tiploc='CHRX',
+        predicate=lambda raw: raw['serviceUid'].endswith('4'),
+    )
+
+    assert len(selected) == 1
+    assert selected.validated == 1
+    assert selected[0] is fourth
+
+
+def test_missing_destination_never_matches():
+    services = LazyServices([{'serviceUid': 'A00001', 'locationDetail': {}}])
+
+    assert len(services.filter(destination_tiploc='CHRX')) == 0
+
+
+def test_materialize_matches_eager_validation():
+    board = LazyLocationResponse.from_json(json.dumps(PAYLOAD))
+
+    assert board.materialize() == LocationResponse.model_validate(PAYLOAD)
+
+
+def test_null_services_and_filter():
+    board = LazyLocationResponse.from_dict(
+        {'location': {'name': 'Highbury'}, 'filter': None, 'services': None}
+    )
+
+    assert board.filter is None
+    assert len(board.services) == 0
+
+
+def test_location_get_lazy(requests_mock):
+    subject = Location('HIB', 'CHX')
+    requests_mock.get(subject.uri, json=PAYLOAD)
+
+    board = subject.get_lazy()
+
+    assert isinstance(board, LazyLocationResponse)
+    assert board.services[2].service_uid == 'A00003'
+
+
+def test_async_location_get_lazy():
+    async def handler(request):
+        return httpx.Response(200, json=PAYLOAD)
+
+    async def main():
+        async with make_client(handler) as client:
+            return await AsyncLocation('HIB', 'CHX', client=client).get_lazy()
+
+    board = asyncio.run(main())
+
+    assert isinstance(board, LazyLocationResponse)
+    assert board.services[2].service_uid == 'A00003'
@@ -1,4 +1,15 @@
-from traintimes.models import LocationResponse
+import datetime
+
+from traintimes.models import (
+    LocationEvent,
+    LocationResponse,
+    LocationService,
+    Pair,
+    ServiceResponse,
+    parse_time,
+    placed_seconds,
+    time_seconds,
+)
 
 
 def test_location_response_coerces_null_services_to_empty_list():
@@ -49,3 +60,195 @@ def test_location_response_preserves_existing_service_list():
 
     assert len(response.services) == 1
     assert response.services[0].service_uid == 'A12345'
+
+
+def test_location_response_from_json_coerces_null_services():
+    raw = b'{"location": {"name": "Highbury & Islington"}, "services": null}'
+
+    assert LocationResponse.model_validate_json(raw).services == []
+
+
+def overnight_service():
+    return ServiceResponse.model_validate(
+        {
+            'serviceUid': 'A12345',
+            'runDate': '2024-03-30',
+            'serviceType': 'train',
+            'isPassenger': True,
+            'atocCode': 'SE',
+            'atocName': 'Southeastern',
+            'performanceMonitored': True,
+            'origin': [],
+            'destination': [],
+            'locations': [
+                {
+                    'tiploc': 'CHRX',
+                    'wttBookedDeparture': '234530',
+                    'gbttBookedDeparture': '2345',
+                    'realtimeDeparture': '2350',
+                },
+                {'tiploc': 'LEWISHM', 'wttBookedPass': '2355H', 'realtimePass': '0001'},
+                {
+                    'tiploc': 'ORPNGTN',
+                    'gbttBookedArrival': '0010',
+                    'realtimeArrival': '0009',
+                    'gbttBookedDeparture': '0012',
+                },
+                {'tiploc': 'NOTIMES', 'realtimePass': '0020'},
+                {'tiploc': 'SVNOAKS', 'gbttBookedArrival': '0030'},
+            ],
+        }
+    )
+
+
+def test_parse_time():
+    assert parse_time('0812') == datetime.timedelta(hours=8, minutes=12)
+    assert parse_time('081230') == datetime.timedelta(hours=8, minutes=12, seconds=30)
+    assert parse_time('0812H') == datetime.timedelta(hours=8, minutes=12, seconds=30)
+    assert parse_time(None) is None
+    assert parse_time('') is None
+
+
+def test_placed_seconds_roll_over_midnight():
+    service = overnight_service()
+
+    assert time_seconds('0812H') == 8 * 3600 + 12 * 60 + 30
+    assert placed_seconds(
+        service.locations, ('gbtt_booked_arrival', 'realtime_pass')
+    ) == [
+        [None, None, 87000, None, 88200],
+        [None, 86460, None, 87600, None],
+    ]
+    assert placed_seconds([], ('gbtt_booked_arrival',)) == [[]]
+
+
+def test_service_minutes_roll_over_midnight():
+    service = overnight_service()
+
+    assert service.minutes('gbtt_booked_arrival') == [None, None, 1450, None, 1470]
+    assert service.minutes('realtime_pass') == [None, 1441, None, 1460, None]
+    assert service.minutes('wtt_booked_pass')[1] == 1435
+    assert service.timings[1].offset('wtt_booked_pass') == datetime.timedelta(
+        hours=23, minutes=55, seconds=30
+    )
+
+
+def test_service_delays_across_midnight():
+    service = overnight_service()
+
+    assert service.delays() == [5, None, None, None, None]
+    assert service.delays('arrival') == [None, None, -1, None, None]
+
+
+def test_service_datetimes_are_aware():
+    service = overnight_service()
+
+    departure, *_ = service.datetimes('gbtt_booked_departure')
+    arrival = service.datetimes('gbtt_booked_arrival')[2]
+    assert departure.isoformat() == '2024-03-30T23:45:00+00:00'
+    assert arrival.isoformat() == '2024-03-31T00:10:00+00:00'
+    assert service.datetimes('gbtt_booked_arrival', datetime.timezone.utc)[4] == (
+        datetime.datetime(2024, 3, 31, 0, 30, tzinfo=datetime.timezone.utc)
+    )
+    assert service.timings[3].datetime('realtime_arrival') is None
+
+
+def test_timings_are_cached():
+    service = overnight_service()
+
+    assert service.timings is service.timings
+    assert service.locations[0].raw_offsets is service.locations[0].raw_offsets
+
+
+def test_copies_and_assignments_clear_cached_timings():
+    service = overnight_service()
+    event = service.locations[0]
+    assert service.minutes('gbtt_booked_departure')[0] == 1425
+    assert event.first_booked() == datetime.timedelta(hours=23, minutes=45, seconds=30)
+
+    copied = service.model_copy(update={'locations': [LocationEvent(tiploc='B')]})
+    assert copied.timings[0].offsets == {}
+    assert len(service.timings) == 5
+
+    event.gbtt_booked_departure = '2350'
+    event.wtt_booked_departure = None
+    service.locations = [event]
+    assert event.first_booked() == datetime.timedelta(hours=23, minutes=50)
+    assert service.minutes('gbtt_booked_departure') == [1430]
+    assert service.delays() == [0]
+
+    pair = Pair(tiploc='CHRX', description='Charing Cross', publicTime='0800')
+    assert pair.offset == datetime.timedelta(hours=8)
+    assert pair.model_copy(update={'public_time': '0900'}).offset == (
+        datetime.timedelta(hours=9)
+    )
+
+
+def test_realtime_before_midnight_for_booked_after():
+    service = overnight_service()
+    event = service.locations[2].model_copy(update={'realtime_arrival': '2358'})
+    service = service.model_copy(update={'locations': service.locations[:2] + [event]})
+
+    assert service.minutes('realtime_arrival') == [None, None, 1438]
+
+
+def test_realtime_after_midnight_for_early_booking():
+    service = overnight_service()
+    event = service.locations[0].model_copy(
+        update={'gbtt_booked_departure': '0005', 'wtt_booked_departure': None}
+    )
+    service = service.model_copy(update={'locations': [event]})
+
+    assert service.minutes('realtime_departure') == [-10]
+
+
+def board_entry(location_detail, origin_time):
+    return LocationService.model_validate(
+        {
+            'locationDetail': location_detail,
+            'serviceUid': 'A12345',
+            'runDate': '2024-01-01',
+            'atocCode': 'SE',
+            'atocName': 'Southeastern',
+            'serviceType': 'train',
+            'isPassenger': True,
+            'origin': [
+                {'tiploc': 'CHRX', 'description': 'London Charing Cross'} | origin_time
+            ],
+        }
+    )
+
+
+def test_board_entry_after_midnight_of_origin():
+    entry = board_entry(
+        {'tiploc': 'HIBURY', 'gbttBookedDeparture': '0015'},
+        {'workingTime': '234500'},
+    )
+
+    assert entry.timings.minutes('gbtt_booked_departure') == 1455
+    assert entry.origin[0].offset == datetime.timedelta(hours=23, minutes=45)
+
+
+def test_board_entry_same_day_as_origin():
+    entry = board_entry(
+        {'tiploc': 'HIBURY', 'gbttBookedDeparture': '0815'}, {'publicTime': '0800'}
+    )
+
+    assert entry.timings.minutes('gbtt_booked_departure') == 495
+
+
+def test_board_entry_without_origin():
+    entry = LocationService.model_validate(
+        {
+            'locationDetail': {'tiploc': 'HIBURY'},
+            'serviceUid': 'A12345',
+            'runDate': '2024-01-01',
+            'atocCode': 'SE',
+            'atocName': 'Southeastern',
+            'serviceType': 'train',
+            'isPassenger': True,
+        }
+    )
+
+    assert entry.timings.offsets == {}
+    assert repr(entry.timings) == 'EventTimes(datetime.date(2024, 1, 1), {})'
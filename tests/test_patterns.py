@@ -0,0 +1,246 @@
+import asyncio
+import datetime
+
+import httpx
+import pytest
+import requests
+from utils import make_client, service_payload
+
+from traintimes import config as config_module
+from traintimes.aio import AsyncService
+from traintimes.config import Config, configure
+from traintimes.models import LocationResponse, ServiceResponse
+from traintimes.patterns import Call, PatternIndex
+from traintimes.sdk import Service
+
+
+DATE = datetime.date(2025, 10, 16)
+
+
+def calling_at(uid, calls, run_date='2025-10-16'):
+    """A service calling at ``(tiploc, crs, booked, realtime)`` in order."""
+    locations = []
+    for tiploc, crs, booked, realtime in calls:
+        event = {'tiploc': tiploc, 'crs': crs, 'description': tiploc.title()}
+        if booked is not None:
+            event.update(gbttBookedArrival=booked, gbttBookedDeparture=booked)
+        if realtime is not None:
+            event.update(realtimeArrival=realtime, realtimeDeparture=realtime)
+        locations.append(event)
+    return service_payload(
+        uid,
+        run_date,
+        locations,
+        origin=[{'tiploc': calls[0][0], 'description': 'Origin'}],
+        destination=[{'tiploc': calls[-1][0], 'description': 'Destination'}],
+    )
+
+
+def service(uid, calls, run_date='2025-10-16'):
+    return ServiceResponse.model_validate(calling_at(uid, calls, run_date))
+
+
+UP = service(
+    'W10001',
+    [
+        ('HSTNGS', 'HGS', '0700', '0701'),
+        ('HILDBRO', 'HIB', '0745', '0748'),
+        ('LNDNBDE', 'LBG', '0830', '0835'),
+        ('CHRX', 'CHX', '0840', None),
+    ],
+)
+EARLY_UP = service(
+    'W10002',
+    [
+        ('HILDBRO', 'HIB', '0645', None),
+        ('CHRX', 'CHX', '0740', None),
+    ],
+)
+DOWN = service(
+    'W20001',
+    [
+        ('CHRX', 'CHX', '1800', None),
+        ('LNDNBDE', 'LBG', '1807', None),
+        ('HILDBRO', 'HIB', '1850', None),
+    ],
+)
+
+
+@pytest.fixture
+def patterns():
+    return PatternIndex([UP, DOWN, EARLY_UP])
+
+
+def test_services_calling_at_a_then_b(patterns):
+    journeys = patterns.between('HIB', 'CHX', DATE)
+
+    assert [journey.service_uid for journey in journeys] == ['W10002', 'W10001']
+    journey = journeys[1]
+    assert journey.service is UP
+    assert journey.run_date == DATE
+    assert journey.depart.tiploc == 'HILDBRO'
+    assert journey.depart.position == 1
+    assert journey.depart.scheduled.strftime('%H:%M') == '07:45'
+    assert journey.depart.actual.strftime('%H:%M') == '07:48'
+    assert journey.depart.delay == 3
+    assert journey.arrive == Call(
+        'CHRX',
+        'CHX',
+        3,
+        UP.timings[3].datetime('gbtt_booked_arrival'),
+        None,
+        None,
+    )
+
+
+def test_order_and_codes(patterns):
+    assert [
+        journey.service_uid for journey in patterns.between('CHX', 'HIB', DATE)
+    ] == ['W20001']
+    assert [j.service_uid for j in patterns.between('LNDNBDE', 'CHRX', DATE)] == [
+        'W10001'
+    ]
+    assert patterns.between('HIB', 'HGS', DATE) == []
+    assert patterns.between('HIB', 'XXX', DATE) == []
+    assert patterns.between('HIB', 'CHX', DATE + datetime.timedelta(days=1)) == []
+    assert patterns.calling_at('LBG', DATE) == [UP, DOWN]
+    assert patterns.calling_at('LBG', DATE + datetime.timedelta(days=1)) == []
+
+
+def test_repeated_calls_give_the_shortest_leg():
+    loop = service(
+        'L00001',
+        [
+            ('AAA', None, '0900', None),
+            ('BBB', None, '0910', None),
+            ('AAA', None, '0920', None),
+            ('BBB', None, '0930', None),
+            ('AAA', None, '0940', None),
+        ],
+    )
+    patterns = PatternIndex([loop, EARLY_UP])
+
+    assert patterns.between('AAA', 'HIB', DATE) == []
+    [journey] = patterns.between('AAA', 'BBB', DATE)
+
+    assert (journey.depart.position, journey.arrive.position) == (2, 3)
+
+
+def test_only_public_calls_are_indexed():
+    passing = calling_at(
+        'P00001',
+        [('HILDBRO', 'HIB', '0700', None), ('TONBDG', 'TON', None, None)],
+    )
+    passing['locations'][1]['wttBookedPass'] = '0710'
+    cancelled = calling_at(
+        'P00002',
+        [('HILDBRO', 'HIB', '0700', None), ('TONBDG', 'TON', None, None)],
+    )
+    cancelled['locations'][1]['displayAs'] = 'CANCELLED_PASS'
+    cancelled_call = calling_at(
+        'P00003',
+        [('HILDBRO', 'HIB', '0700', None), ('TONBDG', 'TON', '0710', None)],
+    )
+    cancelled_call['locations'][1]['displayAs'] = 'CANCELLED_CALL'
+    staff_only = calling_at(
+        'P00004',
+        [('HILDBRO', 'HIB', '0700', None), ('TONBDG', 'TON', '0710', None)],
+    )
+    staff_only['locations'][1]['isPublicCall'] = False
+    payloads = (passing, cancelled, cancelled_call, staff_only)
+    patterns = PatternIndex(
+        ServiceResponse.model_validate(payload) for payload in payloads
+    )
+
+    assert patterns.between('HIB', 'TON', DATE) == []
+    assert patterns.calling_at('TON', DATE) == []
+    assert len(patterns) == 4
+
+
+def test_journeys_without_a_scheduled_departure_sort_last():
+    unbooked = service(
+        'U00001', [('HILDBRO', 'HIB', None, None), ('CHRX', 'CHX', '0500', None)]
+    )
+    patterns = PatternIndex([unbooked, EARLY_UP])
+
+    journeys = patterns.between('HIB', 'CHX', DATE)
+
+    assert [journey.service_uid for journey in journeys] == ['W10002', 'U00001']
+    assert journeys[1].depart.scheduled is None
+
+
+def test_updates_replace_earlier_postings(patterns):
+    rerouted = service(
+        'W10001',
+        [('HSTNGS', 'HGS', '0700', None), ('HILDBRO', 'HIB', '0745', '0750')],
+    )
+
+    patterns.add(rerouted)
+    patterns.add(rerouted)
+
+    assert len(patterns) == 3
+    assert [j.service_uid for j in patterns.between('HGS', 'HIB', DATE)] == ['W10001']
+    assert [j.service_uid for j in patterns.between('HIB', 'CHX', DATE)] == ['W10002']
+    assert ('HSTNGS', DATE) in patterns.postings
+    assert ('W10001', DATE) in patterns
+
+    patterns.discard('W10001', DATE)
+    patterns.discard('W10001', DATE)
+
+    assert ('HSTNGS', DATE) not in patterns.postings
+    assert ('W10001', DATE) not in patterns
+
+
+def test_observe_ignores_location_line_ups():
+    patterns = PatternIndex()
+
+    patterns.observe(LocationResponse.model_validate({'location': {'name': 'X'}}))
+    patterns.observe(UP)
+
+    assert len(patterns) == 1
+
+
+def test_indexes_every_service_fetched(requests_mock):
+    patterns = PatternIndex()
+    requests_mock.get(
+        Service('W10001', DATE).uri,
+        json=calling_at(
+            'W10001', [('HILDBRO', 'HIB', '0745', None), ('CHRX', 'CHX', '0840', None)]
+        ),
+    )
+    config = Config(auth=('u', 'p'), pattern_index=patterns)
+
+    Service('W10001', DATE, session=requests.Session(), config=config).get()
+
+    assert [j.service_uid for j in patterns.between('HIB', 'CHX', DATE)] == ['W10001']
+
+
+def test_async_indexes_every_service_fetched():
+    patterns = PatternIndex()
+
+    async def handler(request):
+        return httpx.Response(
+            200,
+            json=calling_at(
+                'W10001',
+                [('HILDBRO', 'HIB', '0745', None), ('CHRX', 'CHX', '0840', None)],
+            ),
+        )
+
+    async def main():
+        async with make_client(handler) as client:
+            config = Config(pattern_index=patterns)
+            await AsyncService('W10001', DATE, client=client, config=config).get()
+
+    asyncio.run(main())
+
+    assert ('W10001', DATE) in patterns
+
+
+def test_configure_pattern_index(patterns):
+    previous = config_module.default.pattern_index
+    try:
+        configure(pattern_index=patterns)
+        assert config_module.default.pattern_index is patterns
+    finally:
+        config_module.default.pattern_index = previous
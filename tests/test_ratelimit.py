@@ -0,0 +1,249 @@
+import asyncio
+import datetime
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+import requests
+import requests_cache
+from utils import Clock, make_client
+
+from traintimes import config as config_module
+from traintimes.aio import AsyncLocation
+from traintimes.cache import CachePolicy
+from traintimes.config import Config, configure
+from traintimes.models import london
+from traintimes.ratelimit import (
+    DailyQuota,
+    QuotaExceeded,
+    RateLimiter,
+    TokenBucket,
+    parse_retry_after,
+)
+from traintimes.sdk import Location, ResponseError
+from traintimes.session import make_session
+
+
+BOARD = {'location': {'name': 'Highbury & Islington'}, 'services': None}
+
+
+@pytest.fixture
+def clock():
+    return Clock(100.0)
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture
+def limiter(clock, sleeps):
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock.sleep(seconds)
+
+    return RateLimiter(rate=2, clock=clock, sleep=sleep)
+
+
+def test_bucket_spaces_out_calls(clock):
+    bucket = TokenBucket(rate=2, capacity=1, clock=clock)
+
+    assert [bucket.reserve() for _ in range(3)] == [0, 0.5, 1.0]
+
+
+def test_bucket_refills_up_to_capacity(clock):
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+    bucket.reserve(3)
+    clock.now += 60
+
+    assert [bucket.reserve() for _ in range(4)] == [0, 0, 0, 0.5]
+
+
+def test_bucket_pause(clock):
+    bucket = TokenBucket(rate=2, capacity=1, clock=clock)
+    bucket.pause(3)
+
+    assert [bucket.reserve() for _ in range(2)] == [3.5, 4.0]
+
+
+def test_bucket_try_take(clock):
+    bucket = TokenBucket(rate=2, capacity=1, clock=clock)
+
+    assert [bucket.try_take() for _ in range(2)] == [0, 0.5]
+    clock.now += 0.5
+    assert bucket.try_take() == 0
+    bucket.pause(3)
+    assert bucket.try_take() == 3.5
+
+
+def test_bucket_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_bucket_shared_between_threads(clock, sleeps):
+    limiter = RateLimiter(rate=10, clock=clock, sleep=sleeps.append)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: limiter.acquire(), range(10)))
+
+    assert sorted(sleeps) == pytest.approx([n / 10 for n in range(1, 10)])
+
+
+def test_quota_is_enforced_and_persisted(tmp_path):
+    path = str(tmp_path / 'quota.json')
+    quota = DailyQuota(limit=2, path=path)
+
+    quota.take()
+    quota.take()
+    with pytest.raises(QuotaExceeded):
+        quota.take()
+
+    assert quota.remaining == 0
+    with open(path) as f:
+        assert json.load(f) == {'date': quota.date.isoformat(), 'count': 2}
+    assert DailyQuota(limit=5, path=path).used == 2
+
+
+def test_quota_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / 'quota.json')
+    first, second = DailyQuota(limit=3, path=path), DailyQuota(limit=3, path=path)
+
+    first.take()
+    second.take()
+    first.take()
+
+    assert second.used == 3
+    with pytest.raises(QuotaExceeded):
+        second.take()
+
+
+def test_quota_days_are_london_days():
+    assert DailyQuota(limit=1).date == datetime.datetime.now(london()).date()
+
+
+def test_quota_resets_each_day(tmp_path):
+    days = iter([datetime.date(2025, 10, 16), datetime.date(2025, 10, 17)])
+    today = datetime.date(2025, 10, 15)
+    path = tmp_path / 'quota.json'
+    path.write_text(json.dumps({'date': '2025-10-14', 'count': 7}))
+
+    quota = DailyQuota(limit=10, path=str(path), today=lambda: today)
+    assert quota.used == 0
+    quota.take()
+    assert quota.used == 1
+
+    today = next(days)
+    assert quota.used == 0
+    today = next(days)
+    assert quota.remaining == 10
+
+
+@pytest.mark.parametrize(
+    'value, expected',
+    [
+        (None, None),
+        ('120', 120.0),
+        ('Thu, 16 Oct 2025 12:00:30 GMT', 30.0),
+        ('Thu, 16 Oct 2025 11:00:00 GMT', 0.0),
+        ('soon', None),
+    ],
+)
+def test_parse_retry_after(value, expected):
+    now = datetime.datetime(2025, 10, 16, 12, tzinfo=datetime.timezone.utc)
+
+    assert parse_retry_after(value, now=now) == expected
+
+
+def test_parse_retry_after_defaults_to_now():
+    assert parse_retry_after('Thu, 01 Jan 1970 00:00:00 GMT') == 0.0
+
+
+def test_throttled_requests_are_retried(limiter, sleeps, requests_mock):
+    subject = Location('HIB', session=requests.Session(), config=Config())
+    subject.config.rate_limiter = limiter
+    requests_mock.get(
+        subject.uri,
+        [
+            {'status_code': 429, 'headers': {'Retry-After': '5'}},
+            {'status_code': 429},
+            {'json': BOARD},
+        ],
+    )
+
+    response = subject.get()
+
+    assert response.location.name == 'Highbury & Islington'
+    assert requests_mock.call_count == 3
+    assert sleeps == [5.5, 1.5]
+
+
+def test_retries_are_bounded(clock, sleeps, requests_mock):
+    limiter = RateLimiter(rate=2, max_retries=1, clock=clock, sleep=sleeps.append)
+    subject = Location('HIB', session=requests.Session(), config=Config())
+    subject.config.rate_limiter = limiter
+    requests_mock.get(subject.uri, status_code=429, reason='Too Many Requests')
+
+    with pytest.raises(ResponseError, match='Too Many Requests'):
+        subject.get()
+
+    assert requests_mock.call_count == 2
+
+
+def test_quota_exceeded_before_sending(clock, requests_mock):
+    limiter = RateLimiter(rate=2, quota=DailyQuota(limit=0), clock=clock)
+    subject = Location('HIB', session=requests.Session(), config=Config())
+    subject.config.rate_limiter = limiter
+    requests_mock.get(subject.uri, json=BOARD)
+
+    with pytest.raises(QuotaExceeded):
+        subject.get()
+
+    assert requests_mock.call_count == 0
+
+
+def test_cached_responses_are_not_charged(clock, sleeps, requests_mock):
+    quota = DailyQuota(limit=10)
+    limiter = RateLimiter(rate=2, quota=quota, clock=clock, sleep=sleeps.append)
+    config = Config(cache_policy=CachePolicy(), rate_limiter=limiter)
+    session = make_session(session=requests_cache.CachedSession(backend='memory'))
+    requests_mock.get(Location('HIB').uri, json=BOARD)
+
+    for _ in range(3):
+        Location('HIB', session=session, config=config).get()
+
+    assert requests_mock.call_count == 1
+    assert quota.used == 1
+    assert sleeps == []
+
+
+def test_async_requests_share_the_limiter(requests_mock):
+    limiter = RateLimiter(rate=1000)
+    responses = iter([httpx.Response(429, headers={'Retry-After': '0'})])
+
+    async def handler(request):
+        return next(responses, httpx.Response(200, json=BOARD))
+
+    async def main():
+        async with make_client(handler) as client:
+            return await asyncio.gather(
+                *(
+                    AsyncLocation(
+                        'HIB', client=client, config=Config(rate_limiter=limiter)
+                    ).get_json()
+                    for _ in range(2)
+                )
+            )
+
+    assert asyncio.run(main())[1] == BOARD
+
+
+def test_configure_rate_limiter(limiter):
+    previous = config_module.default.rate_limiter
+    try:
+        configure(rate_limiter=limiter)
+        assert config_module.default.rate_limiter is limiter
+    finally:
+        config_module.default.rate_limiter = previous
@@ -0,0 +1,288 @@
+import asyncio
+import datetime
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import requests
+from utils import make_client, service_payload
+
+from traintimes import config as config_module
+from traintimes.aio import AsyncService
+from traintimes.config import Config, configure
+from traintimes.retry import Attempt, RetryPolicy
+from traintimes.sdk import Location, ResponseError
+
+
+BOARD = {'location': {'name': 'Highbury & Islington'}, 'services': None}
+
+SERVICE_SAMPLE = service_payload('A12345', '2024-01-01')
+
+OK = SimpleNamespace(status_code=200)
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture
+def policy(sleeps):
+    return RetryPolicy(timeout=5, jitter=False, sleep=sleeps.append)
+
+
+def location(policy):
+    return Location(
+        'HIB', session=requests.Session(), config=Config(retry_policy=policy)
+    )
+
+
+def warmed(policy, latency=0.01):
+    """Give ``policy`` enough fast samples to start hedging."""
+    policy.hedge_percentile = 90
+    policy.latencies.extend([latency] * policy.hedge_min_samples)
+    return policy
+
+
+def test_delay_doubles_up_to_the_cap():
+    policy = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+
+    assert [policy.delay(retry) for retry in range(1, 5)] == [1, 2, 4, 5]
+
+
+def test_delay_jitter_stays_below_the_cap():
+    policy = RetryPolicy(backoff=1)
+
+    assert all(0 <= policy.delay(3) <= 4 for _ in range(100))
+
+
+def test_hedge_threshold():
+    policy = RetryPolicy()
+    assert policy.hedge_threshold() is None
+
+    policy.hedge_percentile = 50
+    policy.latencies.extend([0.1, 0.2, 0.3])
+    assert policy.hedge_threshold() is None
+
+    policy.hedge_min_samples = 3
+    assert policy.hedge_threshold() == 0.2
+
+
+def test_transient_failures_are_retried(policy, sleeps, requests_mock):
+    observed = []
+    policy.on_attempt = observed.append
+    subject = location(policy)
+    requests_mock.get(
+        subject.uri,
+        [
+            {'status_code': 503},
+            {'exc': requests.ConnectionError},
+            {'json': BOARD},
+        ],
+    )
+
+    response = subject.get()
+
+    assert response.location.name == 'Highbury & Islington'
+    assert [attempt.status_code for attempt in subject.attempts] == [503, None, 200]
+    assert isinstance(subject.attempts[1].error, requests.ConnectionError)
+    assert all(attempt.elapsed >= 0 for attempt in subject.attempts)
+    assert observed == subject.attempts
+    assert sleeps == [0.5, 1.0]
+    assert requests_mock.last_request.timeout == 5
+    assert len(policy.latencies) == 2
+
+
+def test_answers_from_the_api_are_not_retried(policy, requests_mock):
+    subject = location(policy)
+    requests_mock.get(subject.uri, status_code=404, json={'error': 'No schedule found'})
+
+    with pytest.raises(ResponseError, match='No schedule found'):
+        subject.get()
+
+    assert requests_mock.call_count == 1
+
+
+def test_last_failure_is_reported(policy, sleeps, requests_mock):
+    subject = location(policy)
+    requests_mock.get(subject.uri, status_code=502, reason='Bad Gateway')
+
+    with pytest.raises(ResponseError, match='Bad Gateway'):
+        subject.get()
+
+    requests_mock.get(subject.uri, exc=requests.ConnectTimeout)
+    with pytest.raises(requests.ConnectTimeout):
+        subject.get()
+
+    assert len(subject.attempts) == 3
+    assert sleeps == [0.5, 1.0] * 2
+
+
+def test_hedged_request_wins_over_slow_attempt(policy):
+    warmed(policy)
+    answered = threading.Event()
+    observed = threading.Semaphore(0)
+    policy.on_attempt = lambda attempt: observed.release()
+    calls = []
+
+    def call(timeout):
+        calls.append(timeout)
+        if len(calls) == 1:
+            answered.wait(5)
+            return SimpleNamespace(status_code=200, slow=True)
+        answered.set()
+        return SimpleNamespace(status_code=200, slow=False)
+
+    attempts = []
+    response = policy.run(call, attempts, ())
+    settled = list(attempts)
+
+    assert response.slow is False
+    assert calls == [5, 5]
+    assert attempts[0] == Attempt(1, attempts[0].elapsed, 200, hedged=True)
+    # The slow loser still finishes, but not into the returned request's list.
+    assert observed.acquire(timeout=5) and observed.acquire(timeout=5)
+    assert attempts == settled
+
+
+def test_fast_attempt_is_not_hedged(policy):
+    warmed(policy, latency=5)
+    attempts = []
+
+    assert policy.run(lambda timeout: OK, attempts, ()) is OK
+    assert policy.run(lambda timeout: OK, attempts, ()) is OK
+    assert [attempt.hedged for attempt in attempts] == [False, False]
+
+
+def slow(outcome, seconds=0.05):
+    """A call answering ``OK`` or failing after ``seconds``."""
+    time.sleep(seconds)
+    if outcome == 'error':
+        raise requests.ConnectionError
+    return OK
+
+
+def test_hedged_request_after_failure(policy):
+    warmed(policy)
+    outcomes = iter([('error', 0.03), ('ok', 0.1)])
+
+    response = policy.run(
+        lambda timeout: slow(*next(outcomes)), [], (requests.ConnectionError,)
+    )
+
+    assert response is OK
+
+
+def test_hedged_failures_are_raised(policy):
+    warmed(policy)
+    policy.max_attempts = 1
+
+    with pytest.raises(requests.ConnectionError):
+        policy.run(lambda timeout: slow('error'), [], (requests.ConnectionError,))
+
+
+def test_async_transient_failures_are_retried():
+    responses = iter([httpx.Response(503), httpx.ConnectError('refused')])
+    timeouts = []
+
+    async def handler(request):
+        timeouts.append(request.extensions['timeout']['read'])
+        response = next(responses, httpx.Response(200, json=SERVICE_SAMPLE))
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def main():
+        async with make_client(handler) as client:
+            subject = AsyncService(
+                'A12345',
+                datetime.date(2024, 1, 1),
+                client=client,
+                config=Config(retry_policy=RetryPolicy(timeout=3, backoff=0)),
+            )
+            return subject, await subject.get()
+
+    subject, response = asyncio.run(main())
+
+    assert response.service_uid == 'A12345'
+    assert [attempt.status_code for attempt in subject.attempts] == [503, None, 200]
+    assert timeouts == [3, 3, 3]
+
+
+def test_async_last_failure_is_raised():
+    async def handler(request):
+        raise httpx.ReadTimeout('slow')
+
+    async def main():
+        async with make_client(handler) as client:
+            policy = RetryPolicy(max_attempts=2, backoff=0)
+            subject = AsyncService(
+                'A12345',
+                datetime.date(2024, 1, 1),
+                client=client,
+                config=Config(retry_policy=policy),
+            )
+            await subject.get()
+
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(main())
+
+
+def test_async_hedging(policy):
+    warmed(policy)
+
+    async def main():
+        calls = []
+
+        async def call(timeout):
+            calls.append(timeout)
+            if len(calls) == 1:
+                await asyncio.sleep(10)
+            return SimpleNamespace(status_code=200, hedged=len(calls) > 1)
+
+        hedged = await policy.run_async(call, [], ())
+        fast = await policy.run_async(lambda timeout: answer(OK), [], ())
+        return hedged, fast
+
+    async def answer(response):
+        return response
+
+    hedged, fast = asyncio.run(main())
+
+    assert hedged.hedged
+    assert fast is OK
+
+
+async def slow_async(outcome, seconds=0.05):
+    await asyncio.sleep(seconds)
+    if outcome == 'error':
+        raise httpx.ConnectError('refused')
+    return OK
+
+
+def test_async_hedged_failures(policy):
+    warmed(policy)
+    errors = (httpx.ConnectError,)
+
+    async def main():
+        outcomes = iter([('error', 0.03), ('ok', 0.1)])
+        response = await policy.run_async(
+            lambda timeout: slow_async(*next(outcomes)), [], errors
+        )
+        assert response is OK
+        policy.max_attempts = 1
+        await policy.run_async(lambda timeout: slow_async('error'), [], errors)
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(main())
+
+
+def test_configure_retry_policy(policy):
+    previous = config_module.default.retry_policy
+    try:
+        configure(retry_policy=policy)
+        assert config_module.default.retry_policy is policy
+    finally:
+        config_module.default.retry_policy = previous
@@ -0,0 +1,139 @@
+import asyncio
+
+import httpx
+import pytest
+import requests
+from utils import make_client
+
+from traintimes import config as config_module
+from traintimes.aio import AsyncLocation
+from traintimes.config import Config, configure
+from traintimes.revalidate import RevalidationStats, Revalidator
+from traintimes.sdk import Location, ResponseError
+
+
+BOARD = {'location': {'name': 'Charing Cross', 'crs': 'CHX'}, 'services': None}
+MOVED_BOARD = {'location': {'name': 'Charing Cross', 'crs': 'CHX'}, 'services': []}
+
+
+@pytest.fixture
+def revalidator():
+    return Revalidator()
+
+
+def location(revalidator, station='CHX'):
+    return Location(
+        station, session=requests.Session(), config=Config(revalidator=revalidator)
+    )
+
+
+def test_not_modified_returns_previous_model(revalidator, requests_mock):
+    uri = Location('CHX').uri
+    requests_mock.get(uri, json=BOARD, headers={'ETag': '"v1"'})
+    first = location(revalidator).get()
+
+    requests_mock.get(uri, status_code=304)
+    second = location(revalidator).get()
+
+    assert second is first
+    assert requests_mock.last_request.headers['If-None-Match'] == '"v1"'
+    assert revalidator.stats == RevalidationStats(not_modified=1, parsed=1)
+
+
+def test_last_modified_is_sent_back(revalidator, requests_mock):
+    modified = 'Thu, 16 Oct 2025 08:00:00 GMT'
+    requests_mock.get(
+        Location('CHX').uri, json=BOARD, headers={'Last-Modified': modified}
+    )
+
+    location(revalidator).get()
+    location(revalidator).get()
+
+    headers = requests_mock.last_request.headers
+    assert headers['If-Modified-Since'] == modified
+    assert 'If-None-Match' not in headers
+
+
+def test_conditional_headers_are_not_kept_between_calls(revalidator, requests_mock):
+    requests_mock.get(Location('CHX').uri, json=BOARD, headers={'ETag': '"v1"'})
+    subject = location(revalidator)
+    subject.get()
+    subject.get()
+
+    board = subject.get_lazy()
+
+    assert board.location.name == 'Charing Cross'
+    assert 'If-None-Match' not in requests_mock.last_request.headers
+
+
+def test_unchanged_body_is_not_parsed_again(revalidator, requests_mock):
+    uri = Location('CHX').uri
+    requests_mock.get(uri, json=BOARD)
+    first = location(revalidator).get()
+    second = location(revalidator).get()
+
+    requests_mock.get(uri, json=MOVED_BOARD)
+    third = location(revalidator).get()
+
+    assert second is first
+    assert third is not first
+    assert 'If-None-Match' not in requests_mock.last_request.headers
+    assert revalidator.stats == RevalidationStats(unchanged=1, parsed=2)
+
+
+def test_failures_are_not_remembered(revalidator, requests_mock):
+    requests_mock.get(
+        Location('CHX').uri, status_code=404, json={'error': 'Unknown station'}
+    )
+
+    with pytest.raises(ResponseError, match='Unknown station'):
+        location(revalidator).get()
+
+    requests_mock.get(Location('CHX').uri, status_code=304, reason='Not Modified')
+    with pytest.raises(ResponseError):
+        location(revalidator).get()
+
+    assert revalidator.entries == {}
+
+
+def test_least_recently_used_entries_are_dropped(requests_mock):
+    revalidator = Revalidator(max_entries=2)
+    for station in ('CHX', 'HIB', 'LBG'):
+        requests_mock.get(Location(station).uri, json=BOARD)
+    location(revalidator, 'CHX').get()
+    location(revalidator, 'HIB').get()
+    location(revalidator, 'CHX').get()
+
+    location(revalidator, 'LBG').get()
+
+    assert list(revalidator.entries) == [Location('CHX').uri, Location('LBG').uri]
+
+
+def test_async_not_modified():
+    revalidator = Revalidator()
+
+    async def handler(request):
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=BOARD, headers={'ETag': '"v1"'})
+
+    async def main():
+        async with make_client(handler) as client:
+            config = Config(revalidator=revalidator)
+            first = await AsyncLocation('CHX', client=client, config=config).get()
+            second = await AsyncLocation('CHX', client=client, config=config).get()
+            return first, second
+
+    first, second = asyncio.run(main())
+
+    assert second is first
+    assert revalidator.stats == RevalidationStats(not_modified=1, parsed=1)
+
+
+def test_configure_revalidator(revalidator):
+    previous = config_module.default.revalidator
+    try:
+        configure(revalidator=revalidator)
+        assert config_module.default.revalidator is revalidator
+    finally:
+        config_module.default.revalidator = previous
@@ -0,0 +1,201 @@
+import datetime
+
+import pytest
+import requests
+from utils import Clock, service_payload
+
+from traintimes.config import Config
+from traintimes.models import LocationService, ServiceResponse
+from traintimes.scheduler import PollIntervals, PollScheduler, poll_interval
+from traintimes.sdk import ResponseError, Service
+
+
+RUN_DATE = datetime.date(2025, 10, 16)
+LONDON = datetime.timezone(datetime.timedelta(hours=1))
+NOW = datetime.datetime(2025, 10, 16, 7, 0, tzinfo=LONDON)
+KEY = ('W12345', RUN_DATE)
+OTHER = ('W54321', RUN_DATE)
+
+
+def service(*locations, activated=False):
+    return service_payload('W12345', RUN_DATE, locations, realtimeActivated=activated)
+
+
+def response(*locations, **kwargs):
+    return ServiceResponse.model_validate(service(*locations, **kwargs))
+
+
+def origin(departure='0900', **realtime):
+    return {'tiploc': 'HIBURY', 'gbttBookedDeparture': departure, **realtime}
+
+
+def calling(**realtime):
+    return {'tiploc': 'CNNB', 'gbttBookedArrival': '0915', **realtime}
+
+
+def terminus(**realtime):
+    return {'tiploc': 'DALS', 'gbttBookedArrival': '0930', **realtime}
+
+
+def board_entry(countdown=None, **detail):
+    return LocationService.model_validate(
+        {
+            'locationDetail': {'tiploc': 'HIBURY', **detail},
+            'serviceUid': 'W12345',
+            'runDate': RUN_DATE.isoformat(),
+            'atocCode': 'LO',
+            'atocName': 'London Overground',
+            'serviceType': 'train',
+            'isPassenger': True,
+            'countdownMinutes': countdown,
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    'subject, interval',
+    [
+        (response(origin(), terminus(realtimeArrivalActual=True)), None),
+        (
+            response(
+                origin(realtimeDepartureActual=True),
+                calling(realtimeArrivalActual=True),
+                terminus(displayAs='CANCELLED_CALL'),
+            ),
+            None,
+        ),
+        (
+            response(
+                origin(displayAs='CANCELLED_CALL'),
+                terminus(displayAs='CANCELLED_CALL'),
+            ),
+            None,
+        ),
+        (response(origin('0300')), None),
+        (response(origin('0600')), 120),
+        (response(origin(serviceLocation='AT_PLAT'), terminus()), 15),
+        (response(origin(serviceLocation='DEP_READY'), terminus()), 15),
+        (response(origin(), terminus(serviceLocation='APPR_STAT')), 30),
+        (response(origin(realtimeDepartureActual=True), terminus()), 60),
+        (response(origin('1100'), terminus()), 1800),
+        (response(origin('0740'), terminus()), 1200),
+        (response(origin('0710'), terminus()), 120),
+        (response(terminus(), activated=True), 60),
+        (response(terminus()), 1800),
+        (response(), 1800),
+        (board_entry(countdown=5), 120),
+        (board_entry(gbttBookedDeparture='0800', realtimeDepartureActual=True), None),
+        (board_entry(gbttBookedArrival='0800', realtimeArrivalActual=True), None),
+        (board_entry(gbttBookedDeparture='0800', realtimeActivated=True), 60),
+        (board_entry(gbttBookedDeparture='0800', displayAs='CANCELLED_CALL'), None),
+        (board_entry(gbttBookedDeparture='0300', realtimeActivated=True), None),
+    ],
+)
+def test_poll_interval(subject, interval):
+    assert poll_interval(subject, NOW) == interval
+
+
+@pytest.fixture
+def clock():
+    return Clock(NOW)
+
+
+def test_polls_are_spaced_within_the_budget(clock):
+    scheduler = PollScheduler(requests_per_minute=60, clock=clock)
+    scheduler.add(KEY)
+    scheduler.add(OTHER)
+
+    assert len(scheduler) == 2
+    assert scheduler.pop() == (KEY, 0.0)
+    assert scheduler.pop() == (OTHER, 1.0)
+
+
+def test_intervals_stretch_to_fit_the_budget(clock):
+    scheduler = PollScheduler(requests_per_minute=2, clock=clock)
+    at_platform = response(origin(serviceLocation='AT_PLAT'), terminus())
+
+    assert scheduler.observe(KEY, at_platform) == 15 * 2
+    assert scheduler.observe(OTHER, at_platform) == 15 * 4
+    assert scheduler.observe(KEY, at_platform) == 15 * 4
+    assert scheduler.demand == 8
+
+
+def test_finished_and_removed_services_are_dropped(clock):
+    scheduler = PollScheduler(clock=clock)
+    scheduler.add(KEY)
+    scheduler.observe(KEY, response(origin(), terminus()))
+    scheduler.add(OTHER)
+    scheduler.remove(OTHER)
+
+    assert (
+        scheduler.observe(KEY, response(terminus(realtimeArrivalActual=True))) is None
+    )
+    assert KEY not in scheduler
+    assert scheduler.demand == 0
+    assert scheduler.pop() is None
+
+
+def test_run_until_every_service_finishes(clock, caplog):
+    responses = {
+        KEY: iter(
+            [
+                response(origin('0710'), terminus()),
+                ValueError('upstream failed'),
+                response(origin(realtimeDepartureActual=True), terminus()),
+                response(terminus(realtimeArrivalActual=True)),
+            ]
+        ),
+    }
+    polled = []
+
+    def fetch(key):
+        polled.append(clock.now)
+        result = next(responses[key])
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    seen = []
+    scheduler = PollScheduler(intervals=PollIntervals(soon=120), clock=clock)
+    scheduler.add(KEY)
+    scheduler.run(fetch, on_response=seen.append, sleep=clock.sleep)
+
+    assert [(when - NOW).total_seconds() for when in polled] == [0, 120, 240, 300]
+    assert len(seen) == 3
+    assert 'Polling W12345 2025-10-16 failed' in caplog.text
+
+
+def test_run_drops_services_the_api_rejects(clock, caplog):
+    errors = {KEY: ResponseError('not found', 404), OTHER: ResponseError('busy', 503)}
+    polled = []
+
+    def fetch(key):
+        polled.append(key)
+        if len(polled) > 2:
+            return response(terminus(realtimeArrivalActual=True))
+        raise errors[key]
+
+    scheduler = PollScheduler(clock=clock)
+    scheduler.add(KEY)
+    scheduler.add(OTHER)
+    scheduler.run(fetch, sleep=clock.sleep)
+
+    assert polled == [KEY, OTHER, OTHER]
+    assert 'Polling W12345 2025-10-16 failed, dropping it: not found' in caplog.text
+
+
+def test_run_fetches_services(clock, requests_mock):
+    requests_mock.get(
+        Service(*KEY).uri, json=service(terminus(realtimeArrivalActual=True))
+    )
+    scheduler = PollScheduler(clock=clock)
+    scheduler.add(KEY)
+
+    scheduler.run(session=requests.Session(), config=Config())
+
+    assert requests_mock.call_count == 1
+    assert len(scheduler) == 0
+
+
+def test_default_clock_is_timezone_aware():
+    assert PollScheduler().clock().utcoffset() == datetime.timedelta(0)
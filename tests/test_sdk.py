@@ -2,6 +2,7 @@ import datetime
 
 import pytest
 from freezegun import freeze_time
+from pydantic import ValidationError
 
 from traintimes.models import (
     LocationRequest,
@@ -266,3 +267,25 @@ class TestErrorHandling:
         with pytest.raises(ResponseError) as exc:
             subject.get()
         assert 'response.text=' in exc.value.message
+
+    def test_ok_response_with_error_envelope(self, requests_mock):
+        """Test handling of OK response carrying an error payload"""
+        subject = Service('Q98765', datetime.date(2024, 1, 1))
+        requests_mock.get(subject.uri, json={'error': 'No schedule found'})
+        with pytest.raises(ResponseError) as exc:
+            subject.get()
+        assert exc.value.message == '<no errcode>: No schedule found'
+
+    def test_ok_response_not_matching_model(self, requests_mock):
+        """Valid JSON of the wrong shape surfaces the validation error"""
+        subject = Location('HIB')
+        requests_mock.get(subject.uri, json={'services': []})
+        with pytest.raises(ValidationError):
+            subject.get()
+
+
+def test_get_json_returns_raw_payload(requests_mock):
+    subject = Location('HIB')
+    requests_mock.get(subject.uri, json={'location': {'name': 'Highbury'}})
+
+    assert subject.get_json() == {'location': {'name': 'Highbury'}}
@@ -5,8 +5,11 @@ import pytest
 from freezegun import freeze_time
 from utils import date_in_range
 
+from traintimes import config as config_module
+from traintimes.config import configure
 from traintimes.models import LocationResponse, ServiceResponse
 from traintimes.sdk import Location, ResponseError, Service
+from traintimes.session import set_session
 
 
 pytestmark = pytest.mark.skipif(
@@ -15,6 +18,17 @@ pytestmark = pytest.mark.skipif(
 )
 
 
+@pytest.fixture(scope='module', autouse=True)
+def cached_session():
+    """Cache responses on disk to spare the daily request allowance."""
+    cache_policy = config_module.default.cache_policy
+    previous = set_session(None)
+    configure(cache='sqlite')
+    yield
+    set_session(previous)
+    config_module.default.cache_policy = cache_policy
+
+
 @pytest.fixture
 def frozen_date():
     """Test against a known, rarely changing date, within range.
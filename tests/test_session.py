@@ -0,0 +1,74 @@
+import datetime
+import threading
+
+import pytest
+import requests
+
+from traintimes import session as session_module
+from traintimes.sdk import Location, Service
+
+
+@pytest.fixture
+def fresh_session():
+    previous = session_module.set_session(None)
+    yield
+    session_module.set_session(previous)
+
+
+def test_make_session_mounts_pooled_adapters():
+    subject = session_module.make_session(pool_connections=2, pool_maxsize=7)
+
+    adapter = subject.get_adapter('https://api.rtt.io/')
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 7
+    assert subject.headers['Connection'] == 'keep-alive'
+
+
+def test_make_session_reuses_given_session():
+    existing = requests.Session()
+
+    assert session_module.make_session(session=existing) is existing
+
+
+def test_get_session_is_shared(fresh_session):
+    assert session_module.get_session() is session_module.get_session()
+
+
+def test_get_session_is_created_once_across_threads(fresh_session):
+    seen = []
+    threads = [
+        threading.Thread(target=lambda: seen.append(session_module.get_session()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(s) for s in seen}) == 1
+
+
+def test_set_session_returns_previous(fresh_session):
+    first = session_module.get_session()
+    replacement = requests.Session()
+
+    assert session_module.set_session(replacement) is first
+    assert session_module.get_session() is replacement
+
+
+def test_location_and_service_use_shared_session(fresh_session):
+    shared = session_module.get_session()
+
+    assert Location('HIB').session is shared
+    assert Service('A12345', datetime.date(2024, 1, 1)).session is shared
+
+
+def test_injected_session_is_used(requests_mock):
+    custom = requests.Session()
+    subject = Location('HIB', session=custom)
+    requests_mock.get(subject.uri, json={'location': {'name': 'Highbury'}})
+
+    subject.get()
+
+    assert subject.session is custom
+    assert requests_mock.call_count == 1
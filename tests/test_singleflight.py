@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+import requests
+from utils import make_client
+
+from traintimes import config as config_module
+from traintimes.aio import AsyncLocation
+from traintimes.config import Config, configure
+from traintimes.sdk import Location
+from traintimes.singleflight import FlightStats, SingleFlight
+
+
+BOARD = {'location': {'name': 'Charing Cross', 'crs': 'CHX'}, 'services': None}
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(flight.do, 'CHX', fn) for _ in range(5)]
+        wait_for(lambda: flight.stats.saved == 4)
+        release.set()
+        results = {id(future.result()) for future in futures}
+
+    assert len(results) == 1
+    assert calls == [1]
+    assert flight.stats == FlightStats(calls=1, saved=4)
+
+
+def test_errors_are_shared_and_forgotten():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError('upstream failed')
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(flight.do, 'CHX', fail) for _ in range(2)]
+        wait_for(lambda: flight.stats.saved == 1)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError, match='upstream failed'):
+                future.result()
+
+    assert flight.do('CHX', lambda: 'again') == 'again'
+    assert flight.stats == FlightStats(calls=2, saved=1)
+
+
+def test_location_get_is_coalesced(requests_mock):
+    flight = SingleFlight()
+    config = Config(single_flight=flight)
+    release = threading.Event()
+
+    def board(request, context):
+        release.wait(5)
+        return BOARD
+
+    requests_mock.get(Location('CHX').uri, json=board)
+    session = requests.Session()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(Location('CHX', session=session, config=config).get)
+            for _ in range(4)
+        ]
+        wait_for(lambda: flight.stats.saved == 3)
+        release.set()
+        responses = [future.result() for future in futures]
+
+    assert requests_mock.call_count == 1
+    assert all(response is responses[0] for response in responses)
+    assert responses[0].location.crs == 'CHX'
+
+
+def test_async_get_is_coalesced():
+    flight = SingleFlight()
+    config = Config(single_flight=flight)
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=BOARD)
+
+    async def main():
+        async with make_client(handler) as client:
+            calls = [
+                AsyncLocation('CHX', client=client, config=config).get()
+                for _ in range(5)
+            ]
+            return await asyncio.gather(*calls)
+
+    responses = asyncio.run(main())
+
+    assert len(requests) == 1
+    assert all(response is responses[0] for response in responses)
+    assert flight.stats == FlightStats(calls=1, saved=4)
+
+
+def test_cancelled_waiter_leaves_the_call_running():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return 'board'
+
+    async def main():
+        first = asyncio.ensure_future(flight.do_async('CHX', fetch))
+        second = asyncio.ensure_future(flight.do_async('CHX', fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == 'board'
+    assert flight._tasks == {}
+
+
+def test_configure_single_flight():
+    flight = SingleFlight()
+    previous = config_module.default.single_flight
+    try:
+        configure(single_flight=flight)
+        assert config_module.default.single_flight is flight
+    finally:
+        config_module.default.single_flight = previous
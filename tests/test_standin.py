@@ -0,0 +1,212 @@
+import asyncio
+import datetime
+import random
+
+import httpx
+import pytest
+import requests
+
+from traintimes import standin
+from traintimes.aio import AsyncClient, AsyncService
+from traintimes.bulk import sweep_location
+from traintimes.config import Config
+from traintimes.models import LocationResponse
+from traintimes.sdk import Location, ResponseError, Service
+from traintimes.standin import (
+    Route,
+    StandIn,
+    empirical,
+    fixed,
+    lognormal,
+    parse_latency,
+    parse_route,
+    uniform,
+)
+
+
+DATE = datetime.date(2025, 10, 16)
+RECORDED = {
+    'location': {'name': 'Highbury & Islington', 'crs': 'HIB'},
+    'services': None,
+}
+
+
+@pytest.fixture
+def server():
+    with StandIn(seed=0) as server:
+        yield server
+
+
+def config(server):
+    return Config(auth=('user', 'password'), api_root=server.url)
+
+
+def path(subject):
+    return subject.uri.removeprefix(subject.config.api_root)
+
+
+@pytest.mark.parametrize(
+    'subject, route',
+    [
+        (Location('HIB'), Route('search', station='HIB')),
+        (
+            Location('HIB', 'CHX', datetime.datetime(2025, 10, 16, 8, 30), True),
+            Route('search', DATE, 'HIB', to_station='CHX', time='0830', arrivals=True),
+        ),
+        (Location('HIB', when=DATE), Route('search', DATE, 'HIB')),
+        (Service('W12345', DATE), Route('service', DATE, service_uid='W12345')),
+    ],
+)
+def test_parse_route(subject, route):
+    assert parse_route(path(subject)) == route
+    assert parse_route(path(subject) + '?cached=1') == route
+
+
+def test_unknown_route():
+    assert parse_route('/api/v1/json/trains/HIB') is None
+
+
+def test_latency_distributions():
+    rng = random.Random(0)
+
+    assert fixed(0.1)(rng) == 0.1
+    assert 0.1 <= uniform(0.1, 0.2)(rng) <= 0.2
+    assert lognormal(0.05, 0.5)(rng) > 0
+    assert empirical([0.3, 0.4])(rng) in (0.3, 0.4)
+    assert parse_latency('uniform:1:2').__call__(rng) >= 1
+    with pytest.raises(ValueError, match='unknown latency distribution'):
+        parse_latency('normal:1')
+
+
+def test_synthetic_board(server):
+    subject = Location(
+        'HIB', when=DATE, session=requests.Session(), config=config(server)
+    )
+
+    board = subject.get()
+
+    assert len(board.services) == standin.DEFAULT_BOARD_SIZE
+    assert board.services[0].run_date == DATE
+    assert board.services[0].location_detail.tiploc == 'HIB'
+    assert server.stats == {200: 1}
+
+
+def test_synthetic_boards_differ_by_station_and_time():
+    rng = random.Random(0)
+
+    def uids(station, time):
+        board = standin.synthetic_board(Route('search', DATE, station, time=time), rng)
+        return [service['serviceUid'] for service in board['services']]
+
+    morning = uids('HIB', '0800')
+    assert len(set(morning)) == standin.DEFAULT_BOARD_SIZE
+    assert all(uid[0].isupper() and uid[1:].isdigit() for uid in morning)
+    assert uids('HIB', '0830')[:10] == morning[10:]
+    assert not set(uids('HIB', '1000')) & set(morning)
+    assert not set(uids('CHX', '0800')) & set(morning)
+
+
+def test_sweep_sees_every_window(server):
+    board = sweep_location(
+        'HIB',
+        datetime.datetime(2025, 10, 16, 8, 0),
+        datetime.datetime(2025, 10, 16, 10, 0),
+        session=requests.Session(),
+        config=config(server),
+    )
+
+    assert len({service.service_uid for service in board.services}) == 40
+
+
+def test_synthetic_service_is_stable(server):
+    subject = Service('W12345', DATE, session=requests.Session(), config=config(server))
+
+    first = subject.get()
+
+    assert len(first.locations) == standin.DEFAULT_CALLING_POINTS
+    assert first.service_uid == 'W12345'
+    assert len({event.crs for event in first.locations}) == len(first.locations)
+    assert subject.get() == first
+
+
+def test_recorded_responses():
+    board = path(Location('HIB'))
+    service = path(Service('W12345', DATE))
+    with StandIn(
+        responses={board: RECORDED, service: b'{"error": "No data"}'}
+    ) as server:
+        session = requests.Session()
+        response = Location('HIB', session=session, config=config(server)).get()
+        with pytest.raises(ResponseError, match='No data'):
+            Service('W12345', DATE, session=session, config=config(server)).get()
+
+    assert response == LocationResponse.model_validate(RECORDED)
+
+
+def test_unknown_route_and_missing_auth():
+    server = StandIn()
+    server.stop()
+
+    assert server.respond('/api/v1/json/search/HIB')[0] == 401
+    status, _, body = server.respond('/api/v2/json/search/HIB', 'Basic dTpw')
+    assert (status, body) == (404, b'{"error": "Unknown endpoint", "errcode": "404"}')
+
+
+def test_server_errors(server):
+    server.error_rate = 1
+
+    with pytest.raises(ResponseError, match='Server Error|Bad Gateway|Unavailable'):
+        Location('HIB', session=requests.Session(), config=config(server)).get()
+
+
+def test_error_envelopes(server):
+    server.envelope_rate = 1
+
+    with pytest.raises(ResponseError, match='Temporary failure'):
+        Location('HIB', session=requests.Session(), config=config(server)).get()
+
+
+def test_rate_limiting():
+    server = StandIn(rate=0.5, burst=2, require_auth=False)
+    server.stop()
+    uri = path(Location('HIB'))
+
+    statuses = [server.respond(uri)[0] for _ in range(3)]
+
+    assert statuses == [200, 200, 429]
+    assert server.respond(uri)[1] == {'Retry-After': '2'}
+    assert server.stats == {200: 2, 429: 2}
+
+
+def test_latency_is_applied_to_every_response():
+    sleeps = []
+    server = StandIn(latency=uniform(-1, -1), sleep=sleeps.append)
+    server.stop()
+    server.latency = fixed(0.25)
+
+    server.respond('/unknown')
+
+    assert sleeps == [0.25]
+
+
+def test_async_client(server):
+    async def main():
+        async with AsyncClient(http=httpx.AsyncClient()) as client:
+            subject = AsyncService('W12345', DATE, client=client, config=config(server))
+            return await asyncio.gather(subject.get(), subject.get())
+
+    first, second = asyncio.run(main())
+
+    assert first == second
+    assert server.stats == {200: 2}
+
+
+def test_main(monkeypatch, capsys):
+    def serve_forever(httpd):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(standin.ThreadingHTTPServer, 'serve_forever', serve_forever)
+
+    standin.main(['--port', '0', '--latency', 'fixed:0.01', '--rate', '5'])
+
+    assert 'Serving the RTT API on http://127.0.0.1:' in capsys.readouterr().out
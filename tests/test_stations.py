@@ -0,0 +1,172 @@
+import asyncio
+from array import array
+
+import httpx
+import pytest
+import requests
+from utils import make_client, service_payload
+
+from traintimes import config as config_module
+from traintimes.aio import AsyncLocation
+from traintimes.config import Config, configure
+from traintimes.models import LocationResponse, ServiceResponse
+from traintimes.sdk import Location
+from traintimes.stations import MISSING_ID, Station, StationIndex
+
+
+CHARING_CROSS = {'tiploc': 'CHRX', 'description': 'London Charing Cross'}
+HASTINGS = {'tiploc': 'HSTNGS', 'description': 'Hastings'}
+
+SERVICE = ServiceResponse.model_validate(
+    service_payload(
+        'W12345',
+        '2025-10-16',
+        [
+            {'tiploc': 'CHRX', 'crs': 'CHX', 'description': 'London Charing Cross'},
+            {'tiploc': 'LNDNBDE', 'crs': 'LBG', 'description': 'London Bridge'},
+            {'tiploc': 'HSTNGS', 'crs': 'HGS', 'description': 'Hastings'},
+        ],
+        origin=[CHARING_CROSS],
+        destination=[HASTINGS],
+    )
+)
+
+BOARD = {
+    'location': {'name': 'London Bridge', 'crs': 'LBG', 'tiploc': 'LNDNBDG'},
+    'filter': {
+        'from': {'name': 'London Bridge', 'crs': 'LBG'},
+        'to': {'name': 'London Blackfriars', 'crs': 'BFR', 'tiploc': 'BLFR'},
+    },
+    'services': [
+        {
+            'locationDetail': {
+                'tiploc': 'LNDNBDE',
+                'crs': 'LBG',
+                'origin': [CHARING_CROSS],
+                'destination': [
+                    {'tiploc': 'TUNWELL', 'description': 'Tunbridge Wells'}
+                ],
+            },
+            'serviceUid': 'W12345',
+            'runDate': '2025-10-16',
+            'atocCode': 'SE',
+            'atocName': 'Southeastern',
+            'serviceType': 'train',
+            'isPassenger': True,
+            'origin': [{'tiploc': 'CANONST', 'description': 'London Cannon Street'}],
+        }
+    ],
+}
+
+
+@pytest.fixture
+def index():
+    index = StationIndex()
+    index.observe(SERVICE)
+    index.observe(LocationResponse.model_validate(BOARD))
+    return index
+
+
+def test_lookups(index):
+    assert index.get('CHRX') == Station(0, 'CHRX', 'CHX', 'London Charing Cross')
+    assert index.crs('HSTNGS') == 'HGS'
+    assert index.crs('CANONST') is None
+    assert index.crs('XXXX') is None
+    assert index.tiplocs('LBG') == ['LNDNBDE', 'LNDNBDG']
+    assert index.ids('LBG') == [2, 3]
+    assert index.ids('BLFR') == [4]
+    assert index.ids('XXX') == []
+    assert index.name('LBG') == 'London Bridge'
+    assert index.name('XXX') is None
+    assert [station.tiploc for station in index.named('hastings')] == ['HSTNGS']
+    assert index[index.id('TUNWELL')].name == 'Tunbridge Wells'
+    assert 'BFR' in index and 'BLFR' in index and 'XXX' not in index
+    assert [station.id for station in index] == list(range(len(index)))
+
+
+def test_later_responses_fill_in_codes_and_names():
+    index = StationIndex()
+    index.add('CHRX')
+    index.add('CHRX', name='London Charing Cross')
+
+    assert index.add('CHRX', 'CHX', 'Charing Cross') == 0
+    assert index.get('CHRX') == Station(0, 'CHRX', 'CHX', 'London Charing Cross')
+    assert index.ids('CHX') == [0]
+    assert index.named('Charing Cross') == []
+    index.add('CHRXSDG', 'CXS')
+    index.add('CHRXSD2', 'CXS', 'Charing Cross Sidings')
+    assert index.name('CXS') == 'Charing Cross Sidings'
+
+
+def test_same_response_is_observed_once(index):
+    index.observe(SERVICE)
+    index.add = None
+
+    index.observe(SERVICE)
+
+
+def test_prefix_search(index):
+    names = [station.name for station in index.search('london b')]
+
+    assert names == ['London Blackfriars', 'London Bridge', 'London Bridge']
+    assert [station.tiploc for station in index.search('HS')] == ['HSTNGS']
+    assert [station.tiploc for station in index.search('l', limit=2)] == [
+        'LNDNBDE',
+        'LNDNBDG',
+    ]
+    assert index.search('zz') == []
+
+
+def test_encode_and_decode(index):
+    ids = index.encode(['CHRX', None, 'NEWTPLC'])
+
+    assert ids == array('i', [0, MISSING_ID, len(index) - 1])
+    assert index.decode(ids) == ['CHRX', None, 'NEWTPLC']
+
+
+def test_ids_are_stable_when_saved(index, tmp_path):
+    path = str(tmp_path / 'stations.json')
+    index.save(path)
+
+    loaded = StationIndex.load(path)
+
+    assert list(loaded) == list(index)
+    assert loaded.search('london b') == index.search('london b')
+    assert len(StationIndex.load(str(tmp_path / 'missing.json'))) == 0
+    with pytest.raises(ValueError, match='ids must run from 0'):
+        StationIndex([Station(1, 'CHRX')])
+
+
+def test_learns_from_every_response(requests_mock):
+    index = StationIndex()
+    requests_mock.get(Location('LBG').uri, json={**BOARD, 'filter': None})
+    config = Config(auth=('u', 'p'), station_index=index)
+
+    Location('LBG', session=requests.Session(), config=config).get()
+
+    assert index.tiplocs('LBG') == ['LNDNBDG', 'LNDNBDE']
+
+
+def test_async_learns_from_every_response():
+    index = StationIndex()
+
+    async def handler(request):
+        return httpx.Response(200, json=BOARD)
+
+    async def main():
+        async with make_client(handler) as client:
+            config = Config(station_index=index)
+            await AsyncLocation('LBG', client=client, config=config).get()
+
+    asyncio.run(main())
+
+    assert index.crs('BLFR') == 'BFR'
+
+
+def test_configure_station_index(index):
+    previous = config_module.default.station_index
+    try:
+        configure(station_index=index)
+        assert config_module.default.station_index is index
+    finally:
+        config_module.default.station_index = previous
@@ -0,0 +1,157 @@
+import datetime
+
+import pytest
+from utils import service_payload
+
+from traintimes.analytics import DelayAnalysis
+from traintimes.columns import batch_columns, empty_columns
+from traintimes.models import ServiceResponse
+from traintimes.store import ColumnStore, Part
+
+
+FIRST = datetime.date(2025, 10, 16)
+SECOND = datetime.date(2025, 10, 17)
+
+
+def service(uid, run_date, *locations):
+    return ServiceResponse.model_validate(service_payload(uid, run_date, locations))
+
+
+CHARING_CROSS = {
+    'tiploc': 'CHRX',
+    'crs': 'CHX',
+    'gbttBookedDeparture': '0800',
+    'realtimeDeparture': '0803',
+    'realtimeGbttDepartureLateness': 3,
+    'platform': '4',
+    'displayAs': 'ORIGIN',
+}
+LONDON_BRIDGE = {
+    'tiploc': 'LNDNBDE',
+    'crs': 'LBG',
+    'gbttBookedArrival': '0805',
+    'gbttBookedDeparture': '0806',
+    'displayAs': 'CALL',
+}
+JUNCTION = {'tiploc': 'HTHRGRN', 'gbttBookedArrival': '0830'}
+
+SERVICES = [
+    service('A00001', FIRST, CHARING_CROSS, LONDON_BRIDGE, JUNCTION),
+    service('A00002', SECOND, CHARING_CROSS, JUNCTION),
+    service('A00003', FIRST, LONDON_BRIDGE),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ColumnStore(str(tmp_path / 'history'))
+    store.write(SERVICES)
+    return store
+
+
+def test_round_trip(store):
+    assert store.partitions() == [FIRST, SECOND]
+    assert store.read(FIRST, SECOND) == batch_columns(
+        [SERVICES[0], SERVICES[2], SERVICES[1]]
+    )
+    assert store.read(SECOND) == batch_columns([SERVICES[1]])
+
+
+def test_round_trip_awkward_strings(tmp_path):
+    services = [
+        service('B00001', FIRST, dict(LONDON_BRIDGE, platform='')),
+        service('B00002', SECOND, dict(JUNCTION, platform='3\nA'), LONDON_BRIDGE),
+    ]
+    store = ColumnStore(str(tmp_path))
+    store.write(services)
+
+    assert store.read(FIRST, SECOND) == batch_columns(services)
+    assert store.read(FIRST)['platform'] == ['']
+
+
+def test_read_the_services_at_one_station(store):
+    by_crs = store.read(FIRST, SECOND, station='LBG')
+    by_tiploc = store.read(FIRST, SECOND, station='HTHRGRN')
+
+    assert by_crs == batch_columns([SERVICES[0], SERVICES[2]])
+    assert by_tiploc == batch_columns([SERVICES[0], SERVICES[1]])
+    assert store.read(FIRST, station='XXX') == empty_columns()
+
+
+def test_rows_at_one_station(store):
+    [path] = store.part_paths(FIRST)
+
+    with Part(path) as part:
+        assert part.rows_at('LBG') == [1, 3]
+        assert part.rows_at('HTHRGRN') == [2]
+        assert part.services_at('HTHRGRN') == [0, 1, 2]
+
+
+def test_writes_add_parts(store):
+    store.write([service('A00004', FIRST, CHARING_CROSS)])
+
+    assert [path[-6:] for path in store.part_paths(FIRST)] == ['000001', '000002']
+    assert store.read(FIRST, station='CHX')['service_uid'] == ['A00001'] * 3 + [
+        'A00004'
+    ]
+    assert store.part_paths(datetime.date(2025, 1, 1)) == []
+
+
+def test_parts_are_memory_mapped_and_closed(store):
+    [path] = store.part_paths(SECOND)
+
+    with Part(path) as part:
+        assert len(part) == 2
+        assert part.numeric('realtime_departure')[0] == 8 * 60 + 3
+        assert part.dictionary('platform') == ['4']
+        assert list(part.codes('platform')) == [0, -1]
+        view = part.numeric('departure_lateness')
+
+    with pytest.raises(ValueError):
+        view[0]
+    assert part._maps == {}
+
+
+def test_feeds_delay_analysis(store):
+    analysis = DelayAnalysis(store.read(FIRST, SECOND, station='CHX'))
+
+    assert len(analysis) == 5
+
+
+def test_analyses_a_station_read(tmp_path):
+    def call(tiploc, crs, booked, realtime):
+        return {
+            'tiploc': tiploc,
+            'crs': crs,
+            'gbttBookedArrival': booked,
+            'gbttBookedDeparture': booked,
+            'realtimeArrival': realtime,
+            'realtimeDeparture': realtime,
+        }
+
+    store = ColumnStore(str(tmp_path))
+    store.write(
+        [
+            service(
+                uid,
+                FIRST,
+                call('HGHI', 'HIB', '0700', late),
+                call('CHRX', 'CHX', '0740', '0745'),
+            )
+            for uid, late in [
+                ('L00001', '0735'),
+                ('L00002', '0702'),
+                ('L00003', '0740'),
+            ]
+        ]
+        + [service('L00004', FIRST, call('CHRX', 'CHX', '0700', '0800'))]
+    )
+
+    analysis = DelayAnalysis(store.read(FIRST, station='HIB'))
+
+    assert analysis.late_services(30) == [('L00001', FIRST), ('L00003', FIRST)]
+    assert [delay.service_uid for delay in analysis.journey_delays('HIB', 'CHX')] == [
+        'L00001',
+        'L00002',
+        'L00003',
+    ]
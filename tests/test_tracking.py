@@ -0,0 +1,149 @@
+import datetime
+
+import pytest
+import requests
+from utils import service_payload
+
+from traintimes.config import Config
+from traintimes.models import ServiceResponse
+from traintimes.sdk import Service
+from traintimes.tracking import EventChange, ServiceTracker
+
+
+RUN_DATE = datetime.date(2025, 10, 16)
+KEY = ('W12345', RUN_DATE)
+
+
+def call(tiploc, crs, **realtime):
+    return {
+        'tiploc': tiploc,
+        'crs': crs,
+        'gbttBookedArrival': '0800',
+        'gbttBookedDeparture': '0801',
+        **realtime,
+    }
+
+
+def service(*locations):
+    return service_payload('W12345', RUN_DATE, locations)
+
+
+def response(*locations):
+    return ServiceResponse.model_validate(service(*locations))
+
+
+DEPARTED = {
+    'realtimeDeparture': '0803',
+    'realtimeDepartureActual': True,
+    'realtimeGbttDepartureLateness': 2,
+}
+
+
+@pytest.fixture
+def tracker():
+    tracker = ServiceTracker(history=2)
+    tracker.update(
+        response(call('HIBURY', 'HIB'), call('CNNB', 'CNN'), call('DALS', 'DLJ'))
+    )
+    return tracker
+
+
+def test_first_fetch_reports_every_event(tracker):
+    tracked = tracker[KEY]
+
+    assert KEY in tracker
+    assert len(tracker) == 1
+    assert tracked.origin.crs == 'HIB'
+    assert tracked.destination.crs == 'DLJ'
+    assert tracked.current is None
+    assert tracked.lateness is None
+    assert not tracked.finished
+
+
+def test_only_changed_events_are_applied(tracker):
+    tracked = tracker[KEY]
+    unchanged = tracked.locations[2]
+
+    changes = tracker.update(
+        response(
+            call('HIBURY', 'HIB', **DEPARTED),
+            call('CNNB', 'CNN', realtimeArrival='0806'),
+            call('DALS', 'DLJ'),
+        )
+    )
+
+    assert [change.position for change in changes] == [0, 1]
+    assert changes[0].old.realtime_departure is None
+    assert tracked.locations[2] is unchanged
+    assert tracked.current.crs == 'HIB'
+    assert tracked.lateness == 2
+    assert tracked.lateness_at('HIB') == 2
+    assert tracked.lateness_at('HIBURY') == 2
+    assert tracked.lateness_at('CNN') is None
+    assert tracked.lateness_at('ZZZ') is None
+    assert tracked.position('DALS') == 2
+
+
+def test_arrival_lateness_at_destination(tracker):
+    tracker.update(
+        response(
+            call('HIBURY', 'HIB', **DEPARTED),
+            call('CNNB', 'CNN', realtimePassActual=True),
+            call(
+                'DALS',
+                'DLJ',
+                realtimeArrivalActual=True,
+                realtimeGbttArrivalLateness=-1,
+            ),
+        )
+    )
+    tracked = tracker[KEY]
+
+    assert tracked.finished
+    assert tracked.lateness == -1
+    assert tracked.event_at('CNN').realtime_pass_actual
+
+
+def test_changed_calling_pattern_rebuilds_the_index(tracker):
+    changes = tracker.update(
+        response(call('HIBURY', 'HIB', **DEPARTED), call('DALS', 'DLJ'))
+    )
+    tracked = tracker[KEY]
+
+    assert [change.position for change in changes] == [0, 1]
+    assert changes[0] == EventChange(0, None, tracked.locations[0])
+    assert tracked.position('CNN') is None
+    assert tracked.position('DLJ') == 1
+    assert tracked.current.tiploc == 'HIBURY'
+
+
+def test_loops_index_the_first_call():
+    tracker = ServiceTracker()
+    tracker.update(response(call('A', None), call('B', 'BBB'), call('A', None)))
+
+    assert tracker[KEY].position('A') == 0
+    assert tracker[KEY].position(None) is None
+
+
+def test_history_is_bounded(tracker):
+    tracked = tracker[KEY]
+    latest = response(call('HIBURY', 'HIB', **DEPARTED))
+    tracker.update(response(call('HIBURY', 'HIB')))
+    tracker.update(latest)
+
+    assert tracker.update(latest) == []
+    assert len(tracked.history) == 2
+    assert tracked.response is latest
+
+
+def test_refresh_and_forget(tracker, requests_mock):
+    subject = Service('W12345', RUN_DATE)
+    requests_mock.get(subject.uri, json=service(call('HIBURY', 'HIB', **DEPARTED)))
+
+    changes = tracker.refresh(
+        'W12345', RUN_DATE, session=requests.Session(), config=Config()
+    )
+
+    assert len(changes) == 1
+    tracker.forget(KEY)
+    assert KEY not in tracker
@@ -0,0 +1,165 @@
+import asyncio
+import datetime
+
+import httpx
+import requests
+from utils import make_client
+
+from traintimes.aio import AsyncLocation
+from traintimes.config import Config
+from traintimes.models import LocationResponse, ServiceLocationState
+from traintimes.sdk import Location
+from traintimes.watch import BoardDiff, Change, ChangeKind, diff_boards
+
+
+RUN_DATE = datetime.date(2025, 10, 16)
+
+
+def service(uid, **detail):
+    detail.setdefault('realtimeDeparture', '0800')
+    return {
+        'locationDetail': {'tiploc': 'CHRX', 'crs': 'CHX', **detail},
+        'serviceUid': uid,
+        'runDate': RUN_DATE.isoformat(),
+        'atocCode': 'SE',
+        'atocName': 'Southeastern',
+        'serviceType': 'train',
+        'isPassenger': True,
+    }
+
+
+def board(*services):
+    return {'location': {'name': 'Charing Cross'}, 'services': list(services)}
+
+
+def response(*services):
+    return LocationResponse.model_validate(board(*services))
+
+
+def kinds(changes):
+    return [(change.kind, change.key[0]) for change in changes]
+
+
+def test_first_board_is_all_added():
+    changes = diff_boards(None, response(service('A1'), service('A2')))
+
+    assert kinds(changes) == [(ChangeKind.ADDED, 'A1'), (ChangeKind.ADDED, 'A2')]
+    assert changes[0].key == ('A1', RUN_DATE)
+
+
+def test_added_and_removed():
+    changes = diff_boards(
+        response(service('A1'), service('A2')), response(service('A2'), service('A3'))
+    )
+
+    assert kinds(changes) == [(ChangeKind.ADDED, 'A3'), (ChangeKind.REMOVED, 'A1')]
+    assert changes[1].service.service_uid == 'A1'
+
+
+def test_service_changes():
+    previous = response(
+        service('A1', platform='4'),
+        service('A2', serviceLocation='APPR_PLAT'),
+        service('A3'),
+    )
+    current = response(
+        service('A1', realtimeDeparture='0805', platform='5', platformConfirmed=True),
+        service('A2', serviceLocation='AT_PLAT'),
+        service(
+            'A3',
+            displayAs='CANCELLED_CALL',
+            cancelReasonCode='XA',
+            cancelReasonShortText='trespass',
+        ),
+    )
+
+    changes = diff_boards(previous, current)
+
+    assert changes == [
+        Change(
+            ChangeKind.DEPARTURE_CHANGED,
+            ('A1', RUN_DATE),
+            current.services[0],
+            '0800',
+            '0805',
+        ),
+        Change(
+            ChangeKind.PLATFORM_CHANGED, ('A1', RUN_DATE), current.services[0], '4', '5'
+        ),
+        Change(
+            ChangeKind.PLATFORM_CONFIRMED,
+            ('A1', RUN_DATE),
+            current.services[0],
+            new='5',
+        ),
+        Change(
+            ChangeKind.SERVICE_LOCATION_CHANGED,
+            ('A2', RUN_DATE),
+            current.services[1],
+            ServiceLocationState.APPROACHING_PLATFORM,
+            ServiceLocationState.AT_PLATFORM,
+        ),
+        Change(
+            ChangeKind.CANCELLED, ('A3', RUN_DATE), current.services[2], new='trespass'
+        ),
+    ]
+
+
+def test_cancellations_are_reported_once():
+    cancelled = service('A1')
+    cancelled['plannedCancel'] = True
+
+    assert diff_boards(response(cancelled), response(cancelled)) == []
+
+
+def test_unchanged_boards_are_skipped():
+    diff = BoardDiff()
+    first = response(service('A1'))
+    diff.update(first)
+
+    assert diff.update(first) == []
+    assert diff.update(response(service('A1'))) == []
+
+
+def test_location_watch(requests_mock):
+    requests_mock.get(
+        Location('CHX').uri,
+        [
+            {'json': board(service('A1'))},
+            {'json': board(service('A1', platform='2'))},
+            {'json': board()},
+        ],
+    )
+    sleeps = []
+    subject = Location('CHX', session=requests.Session(), config=Config())
+
+    changes = list(subject.watch(interval=15, polls=3, sleep=sleeps.append))
+
+    assert kinds(changes) == [
+        (ChangeKind.ADDED, 'A1'),
+        (ChangeKind.PLATFORM_CHANGED, 'A1'),
+        (ChangeKind.REMOVED, 'A1'),
+    ]
+    assert sleeps == [15, 15]
+
+
+def test_async_location_watch():
+    boards = iter(
+        [board(service('A1')), board(service('A1', realtimeDeparture='0802'))]
+    )
+
+    async def handler(request):
+        return httpx.Response(200, json=next(boards))
+
+    async def main():
+        async with make_client(handler) as client:
+            subject = AsyncLocation('CHX', client=client, config=Config())
+            return [change async for change in subject.watch(interval=0, polls=2)]
+
+    changes = asyncio.run(main())
+
+    assert kinds(changes) == [
+        (ChangeKind.ADDED, 'A1'),
+        (ChangeKind.DEPARTURE_CHANGED, 'A1'),
+    ]
+    assert changes[1].new == '0802'
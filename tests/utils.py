@@ -1,5 +1,9 @@
 import datetime
 
+import httpx
+
+from traintimes.aio import AsyncClient
+
 
 def date_in_range(backward=7, forward=90):
     """Find a date within -7 to +90 days from current date."""
@@ -11,3 +15,44 @@ def date_in_range(backward=7, forward=90):
     dates = [new_year + (mdelta * 31 * day) for mdelta in range(0, 15, 3)]
     in_range = [date for date in dates if start < date < end][0]
     return in_range
+
+
+def service_payload(
+    service_uid='W12345', run_date='2025-10-16', locations=(), **fields
+):
+    """A minimal ``ServiceResponse`` payload; ``fields`` add or override keys."""
+    return {
+        'serviceUid': service_uid,
+        'runDate': str(run_date),
+        'serviceType': 'train',
+        'isPassenger': True,
+        'atocCode': 'SE',
+        'atocName': 'Southeastern',
+        'performanceMonitored': True,
+        'origin': [],
+        'destination': [],
+        'locations': list(locations),
+        **fields,
+    }
+
+
+class Clock:
+    """A settable clock reading ``now``; ``sleep`` moves it on."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if isinstance(self.now, datetime.datetime):
+            self.now += datetime.timedelta(seconds=seconds)
+        else:
+            self.now += seconds
+
+
+def make_client(handler, **kwargs):
+    """An ``AsyncClient`` answering every request with ``handler``."""
+    transport = httpx.MockTransport(handler)
+    return AsyncClient(http=httpx.AsyncClient(transport=transport), **kwargs)
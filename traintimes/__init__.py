@@ -1,14 +1,34 @@
-import logging
-import os
+"""A Python SDK for realtimetrains' API.
 
-import requests_cache
+Importing the package is deliberately cheap and side-effect free: the HTTP
+stack and pydantic models are only imported when one of the names below is
+first used.  See :mod:`traintimes.config` for opting in to caching and logging.
+"""
 
+import importlib
 
-logging.basicConfig(level=logging.DEBUG)
 
-cache_dir = '.requests_cache'
-os.makedirs(cache_dir, exist_ok=True)
-requests_cache.install_cache(
-    cache_name=os.path.join(cache_dir, 'cache'),
-    allowable_codes=(200,),
-)
+_LAZY_ATTRIBUTES = {
+    'Location': 'sdk',
+    'Service': 'sdk',
+    'ResponseError': 'sdk',
+    'Config': 'config',
+    'configure': 'config',
+    'get_config': 'config',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
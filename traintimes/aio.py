@@ -0,0 +1,234 @@
+"""Native asyncio client for the RealTimeTrains API.
+
+:class:`AsyncLocation` and :class:`AsyncService` build their URIs exactly like
+their synchronous counterparts and return the same ``LocationResponse`` /
+``ServiceResponse`` models, but ``get()`` is a coroutine::
+
+    async with AsyncClient(max_concurrency=50) as client:
+        boards = await asyncio.gather(
+            *(AsyncLocation(crs, client=client).get() for crs in stations)
+        )
+
+Each :class:`AsyncClient` owns a pooled ``httpx.AsyncClient`` and a semaphore
+capping the number of requests it has in flight, so a single event loop can
+drive hundreds of concurrent calls without opening hundreds of connections.
+Requests made without a ``client`` share the loop's :func:`default_client`;
+await :func:`aclose_default_client` once done with it::
+
+    async def main():
+        try:
+            return await AsyncService(service_uid, date).get()
+        finally:
+            await aclose_default_client()
+
+Responses are not cached: ``configure(cache=...)`` and the ``cache_policy``
+apply to the synchronous classes only.  The rate limiter, retries, single
+flight, revalidator and archive all apply here too.
+
+Requires the optional ``httpx`` dependency (``pip install traintimes[async]``).
+"""
+
+import asyncio
+import functools
+import weakref
+
+import httpx
+
+from .bulk import BulkResult, service_keys
+from .lazy import LazyLocationResponse
+from .sdk import Location, Service
+from .watch import DEFAULT_INTERVAL, BoardDiff
+
+
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_MAX_CONNECTIONS = 64
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 16
+
+_default_clients = weakref.WeakKeyDictionary()
+
+
+class AsyncClient:
+    """Connection pool and concurrency limit shared by async requests.
+
+    ``max_concurrency`` bounds the number of requests awaiting a response at
+    any one time; further callers wait their turn.  ``max_connections`` and
+    ``max_keepalive_connections`` size the underlying connection pool.  An
+    existing ``httpx.AsyncClient`` may be supplied as ``http``, in which case
+    the pool limits are taken from it.
+    """
+
+    def __init__(
+        self,
+        max_concurrency=DEFAULT_MAX_CONCURRENCY,
+        max_connections=DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections=DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        http=None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        if http is None:
+            http = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                )
+            )
+        self.http = http
+
+    async def get(self, uri, auth=None, **kwargs):
+        async with self.semaphore:
+            return await self.http.get(uri, auth=auth, **kwargs)
+
+    async def aclose(self):
+        await self.http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+def default_client():
+    """Return the client shared by requests on the running event loop.
+
+    Requests made without a ``client`` use it.  ``httpx`` connection pools are
+    bound to the loop that created them, so one default client is kept per
+    loop.  Close it with :func:`aclose_default_client` before the loop ends,
+    or pass an ``AsyncClient`` used with ``async with`` to every request.
+    """
+    loop = asyncio.get_running_loop()
+    client = _default_clients.get(loop)
+    if client is None:
+        client = _default_clients[loop] = AsyncClient()
+    return client
+
+
+async def aclose_default_client():
+    """Close the running loop's default client, if it has one.
+
+    A later request without a ``client`` opens a new one.
+    """
+    client = _default_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+class AsyncRTTMixin:
+    """Swap the blocking ``get`` of an ``RTTBase`` subclass for coroutines."""
+
+    def __init__(self, *args, client=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.client = client
+
+    # Failures in transit, worth retrying under a ``retry_policy``.
+    transient_errors = (httpx.TransportError,)
+
+    @staticmethod
+    def unpack(response):
+        return (
+            response.is_success,
+            response.status_code,
+            response.reason_phrase,
+            response.content,
+        )
+
+    async def send(self, headers=None):
+        policy = self.config.retry_policy
+        if policy is None:
+            return await self.attempt(headers)
+        self.attempts = []
+        return await policy.run_async(
+            functools.partial(self.attempt, headers),
+            self.attempts,
+            self.transient_errors,
+        )
+
+    async def attempt(self, headers=None, timeout=None):
+        limiter = self.config.rate_limiter
+        if limiter is None:
+            return await self.fetch(headers, timeout)
+        retries = 0
+        while True:
+            await limiter.acquire_async()
+            response = await self.fetch(headers, timeout)
+            if not limiter.should_retry(
+                response.status_code, response.headers, retries
+            ):
+                return response
+            retries += 1
+
+    async def fetch(self, headers=None, timeout=None):
+        client = self.client if self.client is not None else default_client()
+        options = {}
+        if timeout is not None:
+            options['timeout'] = timeout
+        if headers:
+            options['headers'] = headers
+        return await client.get(self.uri, auth=self.auth, **options)
+
+    async def get_json(self):
+        response = await self.send()
+        return self.parse(
+            response.is_success,
+            response.status_code,
+            response.reason_phrase,
+            response.text,
+        )
+
+    async def get(self):
+        flight = self.config.single_flight
+        if flight is None:
+            response = await self.load()
+        else:
+            response = await flight.do_async(self.uri, self.load)
+        return self.observe(response)
+
+    async def load(self):
+        if self.replaying:
+            return self.replay()
+        return self.resolve(await self.send(self.conditional_headers()))
+
+
+class AsyncLocation(AsyncRTTMixin, Location):
+    """Async Location List API, see :class:`~traintimes.sdk.Location`."""
+
+    async def get_lazy(self):
+        """Async counterpart of :meth:`Location.get_lazy`."""
+        return LazyLocationResponse.from_dict(await self.get_json())
+
+    async def watch(self, interval=DEFAULT_INTERVAL, polls=None):
+        """Async iterator counterpart of :meth:`Location.watch`."""
+        diff = BoardDiff()
+        poll = 0
+        while True:
+            poll += 1
+            for change in diff.update(await self.get()):
+                yield change
+            if poll == polls:
+                return
+            await asyncio.sleep(interval)
+
+
+class AsyncService(AsyncRTTMixin, Service):
+    """Async Service Information API, see :class:`~traintimes.sdk.Service`."""
+
+
+async def _fetch_one(key, kwargs):
+    service_uid, date = key
+    try:
+        response = await AsyncService(service_uid, date, **kwargs).get()
+    except Exception as error:
+        return BulkResult(service_uid, date, error=error)
+    return BulkResult(service_uid, date, response=response)
+
+
+async def fetch_services(services, **kwargs):
+    """Async counterpart of :func:`traintimes.bulk.fetch_services`.
+
+    Concurrency is capped by the ``client`` passed in ``kwargs`` (or the
+    default client for the running loop, see :func:`default_client`).
+    Results come back in input order with failures captured per item.
+    """
+    keys = service_keys(services)
+    return list(await asyncio.gather(*(_fetch_one(key, kwargs) for key in keys)))
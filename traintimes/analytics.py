@@ -0,0 +1,291 @@
+"""Vectorised delay analytics over many services.
+
+The questions the ``random-scripts/delays*.py`` scripts answer one calling
+point at a time -- how late were trains at each station, which services ran
+more than half an hour late, how often were calls cancelled -- are answered
+here with NumPy operations over the columns of :mod:`traintimes.columns`::
+
+    analysis = DelayAnalysis.from_responses(services)
+    analysis.summary('crs')['HIB'].percentiles[90]
+    analysis.cancellation_rates('operator')
+    analysis.late_services(threshold=30)
+    analysis.journey_delays('CHX', 'HIB')
+
+Lateness is realtime minus public booked time, computed from the rollover
+aware minutes of each calling point, using the departure where both times
+are known and the arrival otherwise.
+
+Requires the optional ``numpy`` dependency (``pip install traintimes[numpy]``).
+"""
+
+import datetime as _dt
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+
+from .columns import DISPLAY_AS_CODES, MISSING, Columns, batch_columns, to_numpy
+from .models import DisplayAs, LocationResponse, ServiceResponse
+
+
+DEFAULT_PERCENTILES = (50, 90, 95, 99)
+
+# A call that did not happen, or a service cut short before this point.
+CANCELLED = (DisplayAs.CANCELLED_CALL, DisplayAs.TERMINATES)
+
+GROUPINGS = ('tiploc', 'crs', 'operator', 'hour')
+
+
+@dataclass
+class GroupStats:
+    """Lateness distribution for one station, operator or hour."""
+
+    count: int
+    mean: float
+    max: int
+    percentiles: dict[int, float]
+
+
+@dataclass
+class JourneyDelay:
+    """Lateness of one service leaving ``origin`` and reaching ``destination``."""
+
+    service_uid: str
+    run_date: _dt.date
+    departure_lateness: int | None
+    arrival_lateness: int | None
+
+    @property
+    def change(self) -> int | None:
+        """Minutes lost (positive) or made up (negative) between the two."""
+        if self.departure_lateness is None or self.arrival_lateness is None:
+            return None
+        return self.arrival_lateness - self.departure_lateness
+
+
+def _difference(realtime: np.ndarray, booked: np.ndarray) -> np.ma.MaskedArray:
+    missing = (realtime == MISSING) | (booked == MISSING)
+    return np.ma.array(realtime.astype(np.int64) - booked, mask=missing)
+
+
+def _group_percentiles(
+    groups: np.ndarray, values: np.ndarray, size: int, percentiles: Iterable[int]
+) -> dict[int, np.ndarray]:
+    """Linearly interpolated percentiles of ``values`` within each group.
+
+    Matches ``numpy.percentile`` per group, computed for all groups at once by
+    sorting on (group, value) and indexing into each group's run.  Every group
+    must be non-empty.
+    """
+    order = np.lexsort((values, groups))
+    values = values[order].astype(float)
+    counts = np.bincount(groups, minlength=size)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    result = {}
+    for percentile in percentiles:
+        position = (counts - 1) * (percentile / 100)
+        low = np.floor(position).astype(int)
+        high = np.ceil(position).astype(int)
+        lower = values[starts + low]
+        upper = values[starts + high]
+        result[percentile] = lower + (upper - lower) * (position - low)
+    return result
+
+
+def _services(
+    service_uid: np.ndarray, run_date: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Number each ``(service_uid, run_date)`` in order of first appearance.
+
+    Returns the number of every row and the first row of each service, so
+    rows need not be whole services, nor start at position 0.
+    """
+    _, uids = np.unique(service_uid, return_inverse=True)
+    keys = np.stack((uids.reshape(-1), run_date), axis=1)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return rank[inverse.reshape(-1)], first[order]
+
+
+def _label(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class DelayAnalysis:
+    """Lateness and cancellation statistics over a batch of calling points."""
+
+    def __init__(self, columns: Columns):
+        self.columns = columns
+        arrays = to_numpy(columns)
+        self.arrays = arrays
+        self.service_uid = arrays['service_uid']
+        self.run_date = arrays['run_date'].data
+        self.tiploc = arrays['tiploc']
+        self.crs = arrays['crs']
+        self.operator = arrays['atoc_code']
+        self.display_as = arrays['display_as'].data
+        self.position = arrays['position'].data
+        self.departure_lateness = _difference(
+            arrays['realtime_departure'].data, arrays['booked_departure'].data
+        )
+        self.arrival_lateness = _difference(
+            arrays['realtime_arrival'].data, arrays['booked_arrival'].data
+        )
+        self.lateness = np.ma.where(
+            np.ma.getmaskarray(self.departure_lateness),
+            self.arrival_lateness,
+            self.departure_lateness,
+        )
+        booked = np.where(
+            arrays['booked_departure'].data == MISSING,
+            arrays['booked_arrival'].data,
+            arrays['booked_departure'].data,
+        )
+        self.hour = np.where(booked == MISSING, -1, (booked // 60) % 24)
+        self.service_index, self.service_rows = _services(
+            self.service_uid, self.run_date
+        )
+
+    @classmethod
+    def from_responses(
+        cls, responses: Iterable[LocationResponse | ServiceResponse]
+    ) -> 'DelayAnalysis':
+        return cls(batch_columns(responses))
+
+    def __len__(self) -> int:
+        return len(self.position)
+
+    def _keys(self, by: str) -> np.ndarray:
+        if by not in GROUPINGS:
+            raise ValueError(f'unknown grouping {by!r}, expected one of {GROUPINGS}')
+        return {
+            'tiploc': self.tiploc,
+            'crs': self.crs,
+            'operator': self.operator,
+            'hour': self.hour,
+        }[by]
+
+    def _groups(
+        self, by: str, rows: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        keys = self._keys(by)[rows]
+        if keys.dtype == object:
+            known = np.array([key is not None for key in keys], dtype=bool)
+        else:
+            known = keys >= 0
+        labels, groups = np.unique(keys[known], return_inverse=True)
+        return labels, groups.reshape(-1), rows[known]
+
+    def summary(
+        self, by: str = 'tiploc', percentiles: Iterable[int] = DEFAULT_PERCENTILES
+    ) -> dict:
+        """Lateness distribution per ``tiploc``, ``crs``, ``operator`` or ``hour``.
+
+        Only calling points with both booked and realtime times count.
+        """
+        percentiles = tuple(percentiles)
+        rows = np.flatnonzero(~np.ma.getmaskarray(self.lateness))
+        labels, groups, rows = self._groups(by, rows)
+        values = self.lateness.data[rows]
+        size = len(labels)
+        counts = np.bincount(groups, minlength=size)
+        totals = np.bincount(groups, weights=values, minlength=size)
+        maxima = np.full(size, np.iinfo(values.dtype).min, dtype=values.dtype)
+        np.maximum.at(maxima, groups, values)
+        spread = _group_percentiles(groups, values, size, percentiles)
+        return {
+            _label(label): GroupStats(
+                count=int(counts[i]),
+                mean=float(totals[i] / counts[i]),
+                max=int(maxima[i]),
+                percentiles={p: float(spread[p][i]) for p in percentiles},
+            )
+            for i, label in enumerate(labels)
+        }
+
+    def _cancelled(self) -> np.ndarray:
+        codes = [DISPLAY_AS_CODES[member] for member in CANCELLED]
+        return np.isin(self.display_as, codes)
+
+    def cancellation_rates(self, by: str = 'tiploc') -> dict:
+        """Share of calling points shown as cancelled or terminated short.
+
+        By ``operator`` the rate is per service instead: the share of services
+        with at least one cancelled call.
+        """
+        cancelled = self._cancelled()
+        if by == 'operator':
+            hit = np.zeros(len(self), dtype=bool)
+            hit[self.service_index[cancelled]] = True
+            labels, groups, first = self._groups(by, self.service_rows)
+            hits = np.bincount(
+                groups, weights=hit[self.service_index[first]], minlength=len(labels)
+            )
+            totals = np.bincount(groups, minlength=len(labels))
+        else:
+            labels, groups, rows = self._groups(by, np.arange(len(self)))
+            hits = np.bincount(groups, weights=cancelled[rows], minlength=len(labels))
+            totals = np.bincount(groups, minlength=len(labels))
+        return {
+            _label(label): float(hits[i] / totals[i]) for i, label in enumerate(labels)
+        }
+
+    def display_counts(self) -> Counter:
+        """How often each ``display_as`` state occurs, like ``Counter(displays)``."""
+        codes = np.bincount(self.display_as[self.display_as >= 0])
+        members = list(DISPLAY_AS_CODES)
+        return Counter({members[code]: int(n) for code, n in enumerate(codes) if n})
+
+    def late_services(self, threshold: int = 30) -> list[tuple[str, _dt.date]]:
+        """Services more than ``threshold`` minutes late at any calling point."""
+        late = (self.lateness > threshold).filled(False)
+        rows = np.flatnonzero(late)
+        _, first = np.unique(self.service_index[rows], return_index=True)
+        return [
+            (self.service_uid[row], _dt.date.fromordinal(int(self.run_date[row])))
+            for row in rows[first]
+        ]
+
+    def journey_delays(
+        self, origin: str, destination: str, by: str = 'crs'
+    ) -> list[JourneyDelay]:
+        """Lateness leaving ``origin`` and reaching a later ``destination``.
+
+        Stations are matched on ``crs`` or ``tiploc``; services calling at
+        ``destination`` before ``origin`` (or not at both) are skipped.
+        """
+        keys = self._keys(by)
+        origin_rows = np.flatnonzero(keys == origin)
+        destination_rows = np.flatnonzero(keys == destination)
+        # The first call at the origin and the last at the destination.
+        services, first = np.unique(self.service_index[origin_rows], return_index=True)
+        origin_rows = origin_rows[first]
+        reversed_rows = destination_rows[::-1]
+        dest_services, last = np.unique(
+            self.service_index[reversed_rows], return_index=True
+        )
+        destination_rows = reversed_rows[last]
+        _, from_origin, from_destination = np.intersect1d(
+            services, dest_services, assume_unique=True, return_indices=True
+        )
+        origin_rows = origin_rows[from_origin]
+        destination_rows = destination_rows[from_destination]
+        forward = origin_rows < destination_rows
+        delays = []
+        for start, end in zip(origin_rows[forward], destination_rows[forward]):
+            departure = self.departure_lateness[start]
+            arrival = self.arrival_lateness[end]
+            delays.append(
+                JourneyDelay(
+                    service_uid=self.service_uid[start],
+                    run_date=_dt.date.fromordinal(int(self.run_date[start])),
+                    departure_lateness=(
+                        None if departure is np.ma.masked else int(departure)
+                    ),
+                    arrival_lateness=None if arrival is np.ma.masked else int(arrival),
+                )
+            )
+        return delays
@@ -0,0 +1,212 @@
+"""Record raw API responses to disk, and replay requests from them.
+
+The ``requests_cache`` database keeps only the latest response to each URI,
+and only for as long as it is fresh.  An :class:`Archive` keeps every
+response fetched from the API (cache hits are not recorded again), with the
+request that produced it and when it was fetched, so analysis can be re-run
+offline against exactly what the API said::
+
+    archive = Archive('rtt-archive')
+    traintimes.configure(archive=archive)              # record every response
+
+    replay = Config(archive=Archive('rtt-archive', replay=True))
+    Location('CHX', when=date, config=replay).get()    # served from disk
+
+Records are appended as separate gzip members to chunk files, started afresh
+once a chunk reaches ``chunk_bytes``, so files are only ever appended to and
+each record can be decompressed on its own.  An index of
+``(endpoint, station or service UID, date)`` to chunk offsets is appended to
+``index.jsonl`` alongside, and a lookup seeks straight to the record.
+"""
+
+import datetime as _dt
+import gzip
+import json
+import os
+import threading
+import zlib
+from dataclasses import asdict, dataclass
+
+from .models import ServiceRequest
+
+
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+INDEX_NAME = 'index.jsonl'
+
+ArchiveKey = tuple[str, str, _dt.date | None]
+
+
+class ArchiveMiss(LookupError):
+    """Raised when replaying a request that was never recorded."""
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """Where one record is stored."""
+
+    endpoint: str
+    key: str
+    date: _dt.date | None
+    uri: str
+    fetched_at: _dt.datetime
+    chunk: str
+    offset: int
+    length: int
+
+    def to_json(self) -> str:
+        fields = asdict(self)
+        fields['date'] = None if self.date is None else self.date.isoformat()
+        fields['fetched_at'] = self.fetched_at.isoformat()
+        return json.dumps(fields)
+
+    @classmethod
+    def from_json(cls, line: str) -> 'IndexEntry':
+        fields = json.loads(line)
+        if fields['date'] is not None:
+            fields['date'] = _dt.date.fromisoformat(fields['date'])
+        fields['fetched_at'] = _dt.datetime.fromisoformat(fields['fetched_at'])
+        return cls(**fields)
+
+
+@dataclass(frozen=True)
+class Record:
+    """A raw response and the request it answered."""
+
+    uri: str
+    request: dict
+    fetched_at: _dt.datetime
+    status_code: int
+    reason: str
+    content: bytes
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+
+def archive_key(subject) -> ArchiveKey:
+    """The index key of a ``Location`` or ``Service`` request.
+
+    Live boards have no date, and are keyed under ``None``.
+    """
+    request = subject.request
+    if isinstance(request, ServiceRequest):
+        return 'service', request.service_uid, request.date
+    return 'search', request.station, request.date
+
+
+def _utcnow() -> _dt.datetime:
+    return _dt.datetime.now(_dt.timezone.utc)
+
+
+class Archive:
+    """An append-only, indexed store of raw responses under ``path``.
+
+    With ``replay`` set, requests are answered from the archive instead of
+    the API, from the latest record of the same URI.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        replay: bool = False,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+        clock=_utcnow,
+    ):
+        self.path = path
+        self.replay = replay
+        self.chunk_bytes = chunk_bytes
+        self.clock = clock
+        self.index: dict[ArchiveKey, list[IndexEntry]] = {}
+        self.entries: list[IndexEntry] = []
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        index_path = os.path.join(path, INDEX_NAME)
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                for line in f:
+                    self._add(IndexEntry.from_json(line))
+        self.chunk = self.entries[-1].chunk if self.entries else self._chunk_name(1)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        """Every record, in the order it was archived."""
+        for entry in list(self.entries):
+            yield self.read(entry)
+
+    @staticmethod
+    def _chunk_name(number: int) -> str:
+        return f'chunk-{number:06d}.gz'
+
+    def _add(self, entry: IndexEntry) -> None:
+        self.entries.append(entry)
+        self.index.setdefault((entry.endpoint, entry.key, entry.date), []).append(entry)
+
+    def _chunk_for(self, size: int) -> str:
+        path = os.path.join(self.path, self.chunk)
+        if os.path.exists(path) and os.path.getsize(path) + size > self.chunk_bytes:
+            number = int(self.chunk.removeprefix('chunk-').removesuffix('.gz'))
+            self.chunk = self._chunk_name(number + 1)
+        return self.chunk
+
+    def write(self, key: ArchiveKey, record: Record) -> IndexEntry:
+        """Append ``record`` under ``key``, returning its index entry."""
+        header = {
+            'uri': record.uri,
+            'request': record.request,
+            'fetched_at': record.fetched_at.isoformat(),
+            'status_code': record.status_code,
+            'reason': record.reason,
+        }
+        member = gzip.compress(json.dumps(header).encode() + b'\n' + record.content)
+        with self._lock:
+            chunk = self._chunk_for(len(member))
+            with open(os.path.join(self.path, chunk), 'ab') as f:
+                offset = f.tell()
+                f.write(member)
+            entry = IndexEntry(
+                *key, record.uri, record.fetched_at, chunk, offset, len(member)
+            )
+            with open(os.path.join(self.path, INDEX_NAME), 'a') as f:
+                f.write(entry.to_json() + '\n')
+            self._add(entry)
+        return entry
+
+    def append(self, subject, status_code: int, reason: str, content: bytes):
+        """Archive the response to a ``Location`` or ``Service`` request."""
+        record = Record(
+            subject.uri,
+            subject.request.model_dump(mode='json'),
+            self.clock(),
+            status_code,
+            reason,
+            content,
+        )
+        return self.write(archive_key(subject), record)
+
+    def read(self, entry: IndexEntry) -> Record:
+        """Load the record an index entry points to."""
+        with open(os.path.join(self.path, entry.chunk), 'rb') as f:
+            f.seek(entry.offset)
+            member = f.read(entry.length)
+        # One member at a time: wbits=31 expects a single gzip header.
+        header, content = zlib.decompress(member, wbits=31).split(b'\n', 1)
+        fields = json.loads(header)
+        fields['fetched_at'] = _dt.datetime.fromisoformat(fields['fetched_at'])
+        return Record(content=content, **fields)
+
+    def lookup(
+        self, endpoint: str, key: str, date: _dt.date | None
+    ) -> list[IndexEntry]:
+        """Index entries for a station or service UID on ``date``, oldest first."""
+        return list(self.index.get((endpoint, key, date), ()))
+
+    def find(self, subject) -> Record:
+        """The latest record for a request's URI, raising :class:`ArchiveMiss`."""
+        uri = subject.uri
+        for entry in reversed(self.lookup(*archive_key(subject))):
+            if entry.uri == uri:
+                return self.read(entry)
+        raise ArchiveMiss(uri)
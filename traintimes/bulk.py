@@ -0,0 +1,221 @@
+"""Concurrent fan-out helpers for fetching many services at once.
+
+A location line-up lists services by UID only, so finding out where each of
+them goes means one ``Service(...).get()`` per entry.  :func:`fetch_services`
+issues those calls from a thread pool over the shared keep-alive session
+instead of one after the other::
+
+    board = Location('HIB', 'CHX', when).get()
+    for result in fetch_services(board, max_workers=8):
+        if result.ok:
+            print(result.response.destination)
+        else:
+            print(result.service_uid, result.error)
+
+Failures are captured per item, so one bad UID does not abort the batch.
+
+:func:`sweep_location` does the same for line-ups: it splits a time span into
+the fewest ``/search/<station>/<y>/<m>/<d>[/<hhmm>]`` windows, fetches them
+concurrently and merges the results into one deduplicated board, trimmed to
+the span.
+"""
+
+import datetime as _dt
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .models import (
+    BOOKED_TIME_FIELDS,
+    LocationResponse,
+    LocationService,
+    ServiceResponse,
+    london,
+)
+from .sdk import Location, Service
+
+
+DEFAULT_MAX_WORKERS = 8
+
+# Span of services returned by a line-up query for a specific date and time.
+WINDOW = _dt.timedelta(hours=1)
+
+_DAY = _dt.timedelta(days=1)
+
+
+@dataclass
+class BulkResult:
+    """Outcome of fetching a single service within a batch."""
+
+    service_uid: str
+    date: _dt.date
+    response: ServiceResponse | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def service_keys(
+    services: LocationResponse | list[tuple[str, _dt.date]],
+) -> list[tuple[str, _dt.date]]:
+    """Normalise a batch to ``(service_uid, date)`` pairs.
+
+    Services from a ``LocationResponse`` are deduplicated, keeping the order in
+    which they first appear on the board.  Explicit pairs are used as given.
+    """
+    if isinstance(services, LocationResponse):
+        keys = ((s.service_uid, s.run_date) for s in services.services)
+        return list(dict.fromkeys(keys))
+    return list(services)
+
+
+def _fetch_one(key, kwargs):
+    service_uid, date = key
+    try:
+        response = Service(service_uid, date, **kwargs).get()
+    except Exception as error:
+        return BulkResult(service_uid, date, error=error)
+    return BulkResult(service_uid, date, response=response)
+
+
+def fetch_services(
+    services: LocationResponse | list[tuple[str, _dt.date]],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    **kwargs,
+) -> list[BulkResult]:
+    """Fetch many services concurrently, returning results in input order.
+
+    At most ``max_workers`` requests are in flight at once.  Remaining keyword
+    arguments (such as ``session``) are passed on to each
+    :class:`~traintimes.sdk.Service`.
+    """
+    keys = service_keys(services)
+    if not keys:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+        return list(executor.map(lambda key: _fetch_one(key, kwargs), keys))
+
+
+def _local(when: _dt.datetime) -> _dt.datetime:
+    """``when`` as a naive ``Europe/London`` time, as line-ups are queried."""
+    if when.tzinfo is None:
+        return when
+    return when.astimezone(london()).replace(tzinfo=None)
+
+
+def plan_windows(
+    start: _dt.datetime, end: _dt.datetime, window: _dt.timedelta = WINDOW
+) -> list[_dt.date | _dt.datetime]:
+    """Plan the fewest line-up queries covering ``start`` up to ``end``.
+
+    Whole calendar days inside the span are fetched with a single date query.
+    Partial days are split into consecutive ``window`` sized time queries,
+    starting at ``start`` (to the minute) and cut short at midnight, so the
+    following whole day can use a date query.
+    Each entry is suitable as the ``when`` argument of ``Location``.
+    Timezone-aware ``start`` and ``end`` are converted to London time first;
+    naive ones are taken to be London time already.
+    """
+    start = _local(start).replace(second=0, microsecond=0)
+    end = _local(end)
+    windows: list[_dt.date | _dt.datetime] = []
+    while start < end:
+        next_midnight = _dt.datetime.combine(start.date(), _dt.time()) + _DAY
+        if start.time() == _dt.time() and end >= next_midnight:
+            windows.append(start.date())
+            start = next_midnight
+        else:
+            windows.append(start)
+            start = min(start + window, next_midnight)
+    return windows
+
+
+def _booked(service: LocationService, arrivals: bool) -> _dt.datetime | None:
+    """The booked time of a line-up entry, local to the station."""
+    offsets = service.timings.offsets
+    preferred = 'gbtt_booked_arrival' if arrivals else 'gbtt_booked_departure'
+    for field in (preferred, *BOOKED_TIME_FIELDS):
+        if field in offsets:
+            return _dt.datetime.combine(service.run_date, _dt.time()) + offsets[field]
+    return None
+
+
+def _sort_key(booked: _dt.datetime | None) -> tuple[bool, _dt.datetime]:
+    return booked is None, booked or _dt.datetime.min
+
+
+def trim_location(
+    response: LocationResponse,
+    start: _dt.datetime,
+    end: _dt.datetime,
+    arrivals: bool = False,
+) -> LocationResponse:
+    """Keep the services booked from ``start`` up to (not including) ``end``.
+
+    Services are placed by their public booked departure (or arrival, with
+    ``arrivals``), else by any booked time.  Those with no booked time at all
+    are kept.  Aware ``start`` and ``end`` are compared in London time.
+    """
+    start, end = _local(start), _local(end)
+    services = []
+    for service in response.services:
+        booked = _booked(service, arrivals)
+        if booked is None or start <= booked < end:
+            services.append(service)
+    return response.model_copy(update={'services': services})
+
+
+def merge_locations(
+    responses: list[LocationResponse], arrivals: bool = False
+) -> LocationResponse:
+    """Combine line-ups into one, keeping each service once.
+
+    Services are deduplicated on ``(service_uid, run_date)``, with the first
+    sighting kept, then sorted by booked time as :func:`trim_location` places
+    them, so the windows may come in any order.  Services with no booked time
+    go last, in the order they were seen.
+    """
+    seen: set[tuple[str, _dt.date]] = set()
+    services = []
+    for response in responses:
+        for service in response.services:
+            key = (service.service_uid, service.run_date)
+            if key not in seen:
+                seen.add(key)
+                services.append(service)
+    services.sort(key=lambda service: _sort_key(_booked(service, arrivals)))
+    first = responses[0]
+    return LocationResponse(
+        location=first.location, filter=first.filter, services=services
+    )
+
+
+def sweep_location(
+    station: str,
+    start: _dt.datetime,
+    end: _dt.datetime,
+    to_station: str | None = None,
+    arrivals: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    window: _dt.timedelta = WINDOW,
+    **kwargs,
+) -> LocationResponse:
+    """Fetch every service at ``station`` between ``start`` and ``end``.
+
+    The windows from :func:`plan_windows` are fetched concurrently, with at
+    most ``max_workers`` in flight, merged with :func:`merge_locations` and
+    trimmed to the span with :func:`trim_location`.  Any failing window
+    raises, as a partial board would silently miss services.  Remaining
+    keyword arguments are passed on to each :class:`~traintimes.sdk.Location`.
+    """
+    windows = plan_windows(start, end, window)
+    if not windows:
+        raise ValueError('end must be after start')
+
+    def fetch(when):
+        return Location(station, to_station, when, arrivals, **kwargs).get()
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(windows))) as executor:
+        merged = merge_locations(list(executor.map(fetch, windows)), arrivals)
+    return trim_location(merged, start, end, arrivals)
@@ -0,0 +1,97 @@
+"""Cache expiry rules keyed on what a request asks for.
+
+How long a response stays valid depends on the date it covers:
+
+- ``history``: dates before yesterday never change, so are cached
+  indefinitely.
+- ``live``: today's and yesterday's boards and services (and undated live
+  queries) change minute to minute, so are cached for seconds.  Yesterday is
+  live too, as services that started then can still be running after
+  midnight.
+- ``timetable``: future dates only change with timetable amendments, so are
+  cached for hours.
+
+A :class:`CachePolicy` is applied to the shared session by
+``traintimes.configure(cache=...)``; each rule keeps its own hit/miss counts::
+
+    policy = traintimes.configure(cache='sqlite').cache_policy
+    ...
+    policy.stats['history'].hits
+
+Only the synchronous ``Location`` and ``Service`` read the cache.  The async
+client (:mod:`traintimes.aio`) sends every request, counts none of them in
+``stats``, and every one is charged by a rate limiter's daily quota.  A
+:class:`~traintimes.revalidate.Revalidator` works for both, making repeated
+requests cheap conditional ones.
+"""
+
+import datetime as _dt
+import threading
+from dataclasses import dataclass, field
+
+from .models import london
+
+
+# Matches requests_cache.NEVER_EXPIRE, without importing requests_cache.
+NEVER_EXPIRE = -1
+
+HISTORY = 'history'
+LIVE = 'live'
+TIMETABLE = 'timetable'
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counts for a single cache rule."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class CachePolicy:
+    """Choose a cache lifetime for each ``LocationRequest`` / ``ServiceRequest``.
+
+    Lifetimes are anything ``requests_cache`` accepts for ``expire_after``:
+    seconds, a ``timedelta`` or :data:`NEVER_EXPIRE`.
+    """
+
+    history: int | _dt.timedelta = NEVER_EXPIRE
+    live: int | _dt.timedelta = _dt.timedelta(seconds=30)
+    timetable: int | _dt.timedelta = _dt.timedelta(hours=6)
+    stats: dict[str, CacheStats] = field(init=False)
+
+    def __post_init__(self):
+        self.stats = {rule: CacheStats() for rule in (HISTORY, LIVE, TIMETABLE)}
+        self._lock = threading.Lock()
+
+    def rule_for(self, request) -> str:
+        """Name the rule covering ``request``, based on the date it asks for.
+
+        Dates are compared with today in ``Europe/London``, where RTT run
+        dates are reckoned, whatever the host's timezone.
+        """
+        if request.date is None:
+            return LIVE
+        today = _dt.datetime.now(london()).date()
+        if request.date < today - _dt.timedelta(days=1):
+            return HISTORY
+        if request.date <= today:
+            return LIVE
+        return TIMETABLE
+
+    def expire_after(self, rule: str) -> int | _dt.timedelta:
+        return getattr(self, rule)
+
+    def record(self, rule: str, from_cache: bool) -> None:
+        with self._lock:
+            stats = self.stats[rule]
+            if from_cache:
+                stats.hits += 1
+            else:
+                stats.misses += 1
@@ -0,0 +1,257 @@
+"""Columnar export of location and service responses.
+
+Analytics over many calling points is far cheaper on a handful of typed
+arrays than on millions of ``LocationEvent`` objects.  The functions here
+flatten responses into a dict of columns, one row per calling point (or per
+service on a line-up)::
+
+    columns = batch_columns(responses)
+    late = [
+        row for row, lateness in enumerate(columns['departure_lateness'])
+        if lateness != MISSING and lateness > 5
+    ]
+
+Numeric columns are ``array.array`` instances, with :data:`MISSING` marking
+absent values; text columns are plain lists.  :func:`to_numpy` and
+:func:`to_arrow` convert the result for vectorised work, given the optional
+``numpy`` or ``pyarrow`` dependency.
+
+Flattening is pure Python, at roughly 6 microseconds a calling point: about 1.2 s for
+10k services of 20 calls, so some 12 s for 100k.  For analysis repeated over
+that much history, flatten once into a :class:`~traintimes.store.ColumnStore`
+and read the columns back from there.
+
+=====================  ========  =============================================
+column                 type      contents
+=====================  ========  =============================================
+service_uid            list      service UID
+run_date               int32     ``date.toordinal()`` of the service run date
+atoc_code              list      operator code
+position               int32     index of the calling point within the service
+tiploc                 list      TIPLOC
+crs                    list      CRS code, or ``None``
+platform               list      platform, or ``None``
+display_as             int8      index into :data:`DISPLAY_AS_CODES`
+booked_arrival         int32     public booked arrival, minutes after midnight
+                                 on the run date (so past 1440 after midnight)
+booked_departure       int32     public booked departure, likewise
+realtime_arrival       int32     realtime arrival, likewise
+realtime_departure     int32     realtime departure, likewise
+arrival_lateness       int32     public arrival lateness in minutes
+departure_lateness     int32     public departure lateness in minutes
+=====================  ========  =============================================
+"""
+
+from array import array
+from collections.abc import Iterable
+
+from .models import (
+    DisplayAs,
+    EventTimes,
+    LocationEvent,
+    LocationResponse,
+    ServiceResponse,
+    placed_seconds,
+)
+
+
+# Sentinel for absent numeric values; outside any real minute or lateness.
+MISSING = -(2**31)
+
+DISPLAY_AS_CODES = {member: code for code, member in enumerate(DisplayAs)}
+DISPLAY_AS_MISSING = -1
+
+TEXT_COLUMNS = ('service_uid', 'atoc_code', 'tiploc', 'crs', 'platform')
+INT_COLUMNS = (
+    'run_date',
+    'position',
+    'booked_arrival',
+    'booked_departure',
+    'realtime_arrival',
+    'realtime_departure',
+    'arrival_lateness',
+    'departure_lateness',
+)
+
+Columns = dict[str, array | list]
+
+
+def _or_missing(value: int | None) -> int:
+    return MISSING if value is None else value
+
+
+def empty_columns() -> Columns:
+    columns: Columns = {name: [] for name in TEXT_COLUMNS}
+    columns.update({name: array('i') for name in INT_COLUMNS})
+    columns['display_as'] = array('b')
+    return columns
+
+
+def _append(
+    columns: Columns,
+    service_uid: str,
+    run_date: int,
+    atoc_code: str,
+    position: int,
+    event: LocationEvent,
+    times: EventTimes,
+) -> None:
+    columns['service_uid'].append(service_uid)
+    columns['run_date'].append(run_date)
+    columns['atoc_code'].append(atoc_code)
+    columns['position'].append(position)
+    columns['tiploc'].append(event.tiploc)
+    columns['crs'].append(event.crs)
+    columns['platform'].append(event.platform)
+    columns['display_as'].append(
+        DISPLAY_AS_MISSING
+        if event.display_as is None
+        else DISPLAY_AS_CODES[event.display_as]
+    )
+    columns['booked_arrival'].append(_or_missing(times.minutes('gbtt_booked_arrival')))
+    columns['booked_departure'].append(
+        _or_missing(times.minutes('gbtt_booked_departure'))
+    )
+    columns['realtime_arrival'].append(_or_missing(times.minutes('realtime_arrival')))
+    columns['realtime_departure'].append(
+        _or_missing(times.minutes('realtime_departure'))
+    )
+    columns['arrival_lateness'].append(
+        _or_missing(event.realtime_gbtt_arrival_lateness)
+    )
+    columns['departure_lateness'].append(
+        _or_missing(event.realtime_gbtt_departure_lateness)
+    )
+
+
+# The placed times of each service, in the order of the time columns.
+PLACED_FIELDS = (
+    'gbtt_booked_arrival',
+    'gbtt_booked_departure',
+    'realtime_arrival',
+    'realtime_departure',
+)
+PLACED_COLUMNS = (
+    'booked_arrival',
+    'booked_departure',
+    'realtime_arrival',
+    'realtime_departure',
+)
+
+
+def _extend_service(columns: Columns, response: ServiceResponse) -> None:
+    """Append a service's rows a column at a time.
+
+    Times are placed by :func:`~traintimes.models.placed_seconds`, as for
+    ``timings``, without building an ``EventTimes`` per row.
+    """
+    events = response.locations
+    count = len(events)
+    columns['service_uid'].extend([response.service_uid] * count)
+    columns['run_date'].extend([response.run_date.toordinal()] * count)
+    columns['atoc_code'].extend([response.atoc_code] * count)
+    columns['position'].extend(range(count))
+    columns['tiploc'].extend([event.tiploc for event in events])
+    columns['crs'].extend([event.crs for event in events])
+    columns['platform'].extend([event.platform for event in events])
+    columns['display_as'].extend(
+        [
+            DISPLAY_AS_MISSING
+            if event.display_as is None
+            else DISPLAY_AS_CODES[event.display_as]
+            for event in events
+        ]
+    )
+    placed = placed_seconds(events, PLACED_FIELDS)
+    for name, times in zip(PLACED_COLUMNS, placed):
+        columns[name].extend(
+            [MISSING if seconds is None else seconds // 60 for seconds in times]
+        )
+    columns['arrival_lateness'].extend(
+        [_or_missing(event.realtime_gbtt_arrival_lateness) for event in events]
+    )
+    columns['departure_lateness'].extend(
+        [_or_missing(event.realtime_gbtt_departure_lateness) for event in events]
+    )
+
+
+def extend_columns(
+    columns: Columns, response: LocationResponse | ServiceResponse
+) -> Columns:
+    """Append the rows of ``response`` to ``columns`` in place."""
+    if isinstance(response, ServiceResponse):
+        _extend_service(columns, response)
+        return columns
+    for service in response.services:
+        _append(
+            columns,
+            service.service_uid,
+            service.run_date.toordinal(),
+            service.atoc_code,
+            0,
+            service.location_detail,
+            service.timings,
+        )
+    return columns
+
+
+def batch_columns(
+    responses: Iterable[LocationResponse | ServiceResponse],
+) -> Columns:
+    """Flatten many responses into a single set of columns."""
+    columns = empty_columns()
+    for response in responses:
+        extend_columns(columns, response)
+    return columns
+
+
+def to_numpy(columns: Columns) -> dict:
+    """Convert columns to NumPy arrays.
+
+    Numeric columns become masked arrays, masking :data:`MISSING` (and
+    :data:`DISPLAY_AS_MISSING`) values; text columns become object arrays.
+    """
+    import numpy as np
+
+    converted = {}
+    for name, values in columns.items():
+        if isinstance(values, list):
+            converted[name] = np.array(values, dtype=object)
+        else:
+            missing = DISPLAY_AS_MISSING if values.typecode == 'b' else MISSING
+            data = np.frombuffer(values, dtype=values.typecode)
+            converted[name] = np.ma.masked_equal(data, missing)
+    return converted
+
+
+def to_arrow(columns: Columns):
+    """Convert columns to a ``pyarrow.Table``, with missing values as nulls."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    arrays = {}
+    for name, values in columns.items():
+        if isinstance(values, list):
+            arrays[name] = pa.array(values, type=pa.string())
+            continue
+        if values.typecode == 'b':
+            type_, missing = pa.int8(), DISPLAY_AS_MISSING
+        else:
+            type_, missing = pa.int32(), MISSING
+        data = pa.Array.from_buffers(type_, len(values), [None, pa.py_buffer(values)])
+        arrays[name] = pc.if_else(
+            pc.equal(data, missing), pa.scalar(None, type=type_), data
+        )
+    return pa.table(arrays)
+
+
+def to_arrays(columns: Columns, backend: str = 'numpy'):
+    """Convert columns with the named ``backend``: ``'numpy'`` or ``'arrow'``."""
+    converters = {'numpy': to_numpy, 'arrow': to_arrow}
+    try:
+        converter = converters[backend]
+    except KeyError:
+        raise ValueError(
+            f'unknown backend {backend!r}, expected one of {list(converters)}'
+        )
+    return converter(columns)
@@ -0,0 +1,244 @@
+"""Compact, read-only copies of responses for holding many in memory.
+
+A ``LocationEvent`` carries more than forty fields, most of them ``None`` on
+any one calling point, and every calling point of a service repeats the same
+origin and destination.  The classes here keep only the fields that are set,
+in a tuple indexed by a bitmask, with enums stored as small ints and repeated
+strings and origin/destination pairs shared::
+
+    compact = CompactService.from_model(service)
+    compact.locations[3].display_as        # DisplayAs.CALL, as for the model
+    compact.to_model() == service          # True
+
+Attributes read like the models', except that lists are tuples and pairs are
+:class:`CompactPair` tuples.  Share one :class:`Interner` across many
+conversions to share strings and pairs between responses too.  See
+``benchmarks/bench_memory.py`` for the saving on large boards.
+"""
+
+import sys
+from enum import Enum
+from typing import Any, NamedTuple
+
+from pydantic import BaseModel
+
+from .models import (
+    DisplayAs,
+    LocationEvent,
+    LocationResponse,
+    LocationService,
+    Pair,
+    ServiceLocationState,
+    ServiceResponse,
+    ServiceType,
+)
+
+
+class CompactPair(NamedTuple):
+    """An origin or destination, as a tuple."""
+
+    tiploc: str
+    description: str
+    working_time: str | None = None
+    public_time: str | None = None
+
+
+class Interner:
+    """Shares equal strings and pairs between compact records."""
+
+    def __init__(self):
+        self.pairs: dict[tuple, CompactPair] = {}
+        self.pair_lists: dict[tuple, tuple[CompactPair, ...]] = {}
+
+    @staticmethod
+    def string(value: str) -> str:
+        return sys.intern(value)
+
+    def pair(self, pair: Pair) -> CompactPair:
+        key = (pair.tiploc, pair.description, pair.working_time, pair.public_time)
+        compact = self.pairs.get(key)
+        if compact is None:
+            compact = self.pairs[key] = CompactPair(
+                *(None if value is None else sys.intern(value) for value in key)
+            )
+        return compact
+
+    def pair_list(self, pairs: list[Pair]) -> tuple[CompactPair, ...]:
+        compact = tuple(self.pair(pair) for pair in pairs)
+        return self.pair_lists.setdefault(compact, compact)
+
+
+class _Sparse:
+    """Base for records storing only the fields of ``model`` that are set.
+
+    Bit ``i`` of ``_mask`` is set when field ``i`` has a value, which is held
+    in ``_values`` at the index given by the number of lower bits set.
+    """
+
+    __slots__ = ('_mask', '_values')
+
+    model: type[BaseModel]
+    # Field name to the Enum or compact record class it is stored as.
+    codecs: dict[str, Any] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        fields = cls.model.model_fields
+        cls._bits = {name: 1 << index for index, name in enumerate(fields)}
+        # Values left out of ``_values``, and what reading them returns.
+        cls._omitted = {}
+        cls._defaults = {}
+        for name, field in fields.items():
+            default = field.get_default(call_default_factory=True)
+            cls._omitted[name] = default
+            cls._defaults[name] = () if isinstance(default, list) else default
+        enums = {
+            name: codec
+            for name, codec in cls.codecs.items()
+            if isinstance(codec, type) and issubclass(codec, Enum)
+        }
+        cls._members = {name: list(codec) for name, codec in enums.items()}
+        cls._codes = {
+            name: {member: code for code, member in enumerate(codec)}
+            for name, codec in enums.items()
+        }
+
+    def __init__(self, mask: int, values: tuple):
+        self._mask = mask
+        self._values = values
+
+    @classmethod
+    def _encode(cls, name: str, value, interner: Interner):
+        codec = cls.codecs.get(name)
+        if name in cls._codes:
+            return cls._codes[name][value]
+        if codec is Pair:
+            return interner.pair_list(value)
+        if codec is not None:
+            if isinstance(value, list):
+                return tuple(codec.from_model(item, interner) for item in value)
+            return codec.from_model(value, interner)
+        if isinstance(value, str):
+            return interner.string(value)
+        return value
+
+    @classmethod
+    def from_model(cls, model: BaseModel, interner: Interner | None = None):
+        """A compact copy of ``model``."""
+        if interner is None:
+            interner = Interner()
+        mask = 0
+        values = []
+        for name, bit in cls._bits.items():
+            value = getattr(model, name)
+            if value is None or value == cls._omitted[name]:
+                continue
+            mask |= bit
+            values.append(cls._encode(name, value, interner))
+        return cls(mask, tuple(values))
+
+    def __getattr__(self, name: str):
+        try:
+            bit = self._bits[name]
+        except KeyError:
+            raise AttributeError(
+                f'{type(self).__name__!r} object has no attribute {name!r}'
+            )
+        if not self._mask & bit:
+            return self._defaults[name]
+        value = self._values[(self._mask & (bit - 1)).bit_count()]
+        members = self._members.get(name)
+        return value if members is None else members[value]
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._mask == other._mask and self._values == other._values
+
+    def __hash__(self):
+        return hash((type(self), self._mask, self._values))
+
+    def __repr__(self):
+        fields = ', '.join(
+            f'{name}={getattr(self, name)!r}'
+            for name, bit in self._bits.items()
+            if self._mask & bit
+        )
+        return f'{type(self).__name__}({fields})'
+
+    def _plain(self, name: str):
+        value = getattr(self, name)
+        if self.codecs.get(name) is Pair:
+            return [pair._asdict() for pair in value]
+        if isinstance(value, _Sparse):
+            return value.to_model()
+        if isinstance(value, tuple):
+            return [item.to_model() for item in value]
+        return value
+
+    def to_model(self):
+        """The equivalent pydantic model."""
+        return self.model.model_validate(
+            {
+                name: self._plain(name)
+                for name, bit in self._bits.items()
+                if self._mask & bit
+            }
+        )
+
+
+class CompactEvent(_Sparse):
+    """A compact :class:`~traintimes.models.LocationEvent`."""
+
+    __slots__ = ()
+    model = LocationEvent
+    codecs = {
+        'origin': Pair,
+        'destination': Pair,
+        'display_as': DisplayAs,
+        'service_location': ServiceLocationState,
+    }
+
+
+class CompactLocationService(_Sparse):
+    """A compact :class:`~traintimes.models.LocationService`."""
+
+    __slots__ = ()
+    model = LocationService
+    codecs = {
+        'location_detail': CompactEvent,
+        'origin': Pair,
+        'destination': Pair,
+        'service_type': ServiceType,
+    }
+
+
+class CompactService(_Sparse):
+    """A compact :class:`~traintimes.models.ServiceResponse`."""
+
+    __slots__ = ()
+    model = ServiceResponse
+    codecs = {
+        'origin': Pair,
+        'destination': Pair,
+        'locations': CompactEvent,
+        'service_type': ServiceType,
+    }
+
+
+class CompactBoard(_Sparse):
+    """A compact :class:`~traintimes.models.LocationResponse`.
+
+    The ``location`` and ``filter`` summaries are kept as models.
+    """
+
+    __slots__ = ()
+    model = LocationResponse
+    codecs = {'services': CompactLocationService}
+
+
+def compact(response: LocationResponse | ServiceResponse, interner=None):
+    """A compact copy of a location line-up or service response."""
+    if isinstance(response, ServiceResponse):
+        return CompactService.from_model(response, interner)
+    return CompactBoard.from_model(response, interner)
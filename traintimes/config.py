@@ -0,0 +1,179 @@
+"""Explicit, process-wide settings for the SDK.
+
+Importing :mod:`traintimes` has no side effects: nothing is logged, cached or
+read from the environment until it is needed.  Applications opt in to the
+extras by calling :func:`configure`::
+
+    import traintimes
+    from traintimes.archive import Archive
+    from traintimes.cache import CachePolicy
+    from traintimes.patterns import PatternIndex
+    from traintimes.ratelimit import DailyQuota, RateLimiter
+    from traintimes.retry import RetryPolicy
+    from traintimes.revalidate import Revalidator
+    from traintimes.singleflight import SingleFlight
+    from traintimes.stations import StationIndex
+
+    traintimes.configure(
+        auth=('user', 'password'),  # default: RTT_AUTH from the environment
+        cache='sqlite',             # or 'memory' / 'filesystem'
+        cache_policy=CachePolicy(live=10),
+        rate_limiter=RateLimiter(rate=2, quota=DailyQuota(limit=1000)),
+        retry_policy=RetryPolicy(max_attempts=4, timeout=5),
+        single_flight=SingleFlight(),
+        revalidator=Revalidator(),
+        archive=Archive('rtt-archive'),
+        station_index=StationIndex(),
+        pattern_index=PatternIndex(),
+        log_level=logging.INFO,
+    )
+
+Credentials not given explicitly are read from the ``RTT_AUTH`` environment
+variable (formatted ``username:password``) the first time a request is made,
+loading a ``.env`` file first if the variable is not already set.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests_cache
+
+    from .archive import Archive
+    from .cache import CachePolicy
+    from .patterns import PatternIndex
+    from .ratelimit import RateLimiter
+    from .retry import RetryPolicy
+    from .revalidate import Revalidator
+    from .singleflight import SingleFlight
+    from .stations import StationIndex
+
+
+DEFAULT_CACHE_NAME = os.path.join('.requests_cache', 'cache')
+API_ROOT = 'https://api.rtt.io'
+
+
+@dataclass
+class Config:
+    """Settings shared by every request that isn't given its own."""
+
+    auth: tuple[str, ...] | None = None
+    load_dotenv: bool = True
+    api_root: str = API_ROOT
+    cache_policy: 'CachePolicy | None' = None
+    rate_limiter: 'RateLimiter | None' = None
+    retry_policy: 'RetryPolicy | None' = None
+    single_flight: 'SingleFlight | None' = None
+    revalidator: 'Revalidator | None' = None
+    archive: 'Archive | None' = None
+    station_index: 'StationIndex | None' = None
+    pattern_index: 'PatternIndex | None' = None
+
+    def get_auth(self) -> tuple[str, ...] | None:
+        """Return the credentials, resolving them from the environment once."""
+        if self.auth is None:
+            if 'RTT_AUTH' not in os.environ and self.load_dotenv:
+                from dotenv import find_dotenv, load_dotenv
+
+                load_dotenv(find_dotenv(usecwd=True))
+            if 'RTT_AUTH' in os.environ:
+                self.auth = tuple(os.environ['RTT_AUTH'].split(':'))
+        return self.auth
+
+
+default = Config()
+
+
+def get_config() -> Config:
+    """Return the settings used by requests without a ``config`` of their own."""
+    return default
+
+
+def _install_cache(cache, cache_name: str, cache_options: dict) -> None:
+    import requests_cache
+
+    from .cache import CachePolicy
+    from .session import make_session, set_session
+
+    if default.cache_policy is None:
+        default.cache_policy = CachePolicy()
+    if isinstance(cache, str):
+        cache_options['cache_name'] = cache_name
+        directory = os.path.dirname(cache_name)
+        if cache in ('sqlite', 'filesystem') and directory:
+            os.makedirs(directory, exist_ok=True)
+    cache_options.setdefault('allowable_codes', (200,))
+    set_session(
+        make_session(
+            session=requests_cache.CachedSession(backend=cache, **cache_options)
+        )
+    )
+
+
+def configure(
+    auth: tuple[str, ...] | None = None,
+    cache: 'str | requests_cache.BaseCache | None' = None,
+    cache_name: str = DEFAULT_CACHE_NAME,
+    cache_policy: 'CachePolicy | None' = None,
+    rate_limiter: 'RateLimiter | None' = None,
+    retry_policy: 'RetryPolicy | None' = None,
+    single_flight: 'SingleFlight | None' = None,
+    revalidator: 'Revalidator | None' = None,
+    archive: 'Archive | None' = None,
+    station_index: 'StationIndex | None' = None,
+    pattern_index: 'PatternIndex | None' = None,
+    api_root: str | None = None,
+    log_level: int | None = None,
+    **cache_options,
+) -> Config:
+    """Set up credentials, response caching and logging explicitly.
+
+    ``cache`` names a ``requests_cache`` backend (``'sqlite'``, ``'memory'``,
+    ``'filesystem'``, ...) or is a backend instance.  When given, the shared
+    session is replaced with a pooled ``CachedSession`` storing responses
+    under ``cache_name``; further keyword arguments are passed on to
+    ``CachedSession``.  Unlike a global ``requests_cache.install_cache``, only
+    requests made by the SDK are cached, and only by its synchronous classes:
+    the async client in :mod:`traintimes.aio` is never cached.
+
+    Expiry is decided per request by ``cache_policy``, defaulting to a
+    :class:`~traintimes.cache.CachePolicy` with its standard lifetimes.
+
+    ``rate_limiter`` throttles every request made with the default config,
+    see :class:`~traintimes.ratelimit.RateLimiter`, and ``retry_policy``
+    retries their transient failures, see :class:`~traintimes.retry.RetryPolicy`.
+    ``single_flight`` coalesces concurrent identical requests, see
+    :class:`~traintimes.singleflight.SingleFlight`, and ``revalidator`` makes
+    repeated requests conditional, see :class:`~traintimes.revalidate.Revalidator`.
+    ``archive`` records every response, or replays them, see
+    :class:`~traintimes.archive.Archive`.  ``station_index`` learns the
+    stations in every response, see :class:`~traintimes.stations.StationIndex`.
+    ``pattern_index`` indexes the calling pattern of every service, see
+    :class:`~traintimes.patterns.PatternIndex`.
+    ``api_root`` sends requests somewhere other than ``https://api.rtt.io``,
+    such as a :mod:`traintimes.standin` server.
+    """
+    if auth is not None:
+        default.auth = tuple(auth)
+    policies = {
+        'cache_policy': cache_policy,
+        'rate_limiter': rate_limiter,
+        'retry_policy': retry_policy,
+        'single_flight': single_flight,
+        'revalidator': revalidator,
+        'archive': archive,
+        'station_index': station_index,
+        'pattern_index': pattern_index,
+        'api_root': api_root,
+    }
+    for name, policy in policies.items():
+        if policy is not None:
+            setattr(default, name, policy)
+    if cache is not None:
+        _install_cache(cache, cache_name, cache_options)
+    if log_level is not None:
+        logging.basicConfig(level=log_level)
+    return default
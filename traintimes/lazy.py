@@ -0,0 +1,132 @@
+"""Lazily validated location line-ups.
+
+A busy board holds hundreds of services, each with a ``LocationEvent`` of 40+
+fields, yet callers often want only the next few departures or the services
+bound for a handful of destinations.  :class:`LazyLocationResponse` keeps the
+services as raw JSON and validates each one into a ``LocationService`` only
+when it is accessed::
+
+    board = Location('HIB', 'CHX', when).get_lazy()
+    for service in board.services.filter(destination_tiploc='CHRX')[:5]:
+        ...
+
+Filtering works on the raw fields, so rejected services are never validated.
+"""
+
+import json
+from collections.abc import Callable, Collection, Sequence
+
+from .models import LocationResponse, LocationService, StationFilter, StationSummary
+
+
+def _as_set(value: str | Collection[str]) -> set[str]:
+    return {value} if isinstance(value, str) else set(value)
+
+
+def _destination_tiplocs(raw: dict) -> set[str]:
+    destinations = raw.get('locationDetail', {}).get('destination') or ()
+    return {pair.get('tiploc') for pair in destinations}
+
+
+class LazyServices(Sequence):
+    """A read-only sequence of ``LocationService`` validated on access.
+
+    Each service is validated at most once; the model is cached for later
+    accesses.  The untouched JSON objects are available as :attr:`raw`.
+    """
+
+    def __init__(self, raw: list[dict]):
+        self.raw = raw
+        self._models: list[LocationService | None] = [None] * len(raw)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        model = self._models[index]
+        if model is None:
+            model = self._models[index] = LocationService.model_validate(
+                self.raw[index]
+            )
+        return model
+
+    @property
+    def validated(self) -> int:
+        """How many services have been validated so far."""
+        return sum(model is not None for model in self._models)
+
+    def filter(
+        self,
+        service_uid: str | Collection[str] | None = None,
+        atoc_code: str | Collection[str] | None = None,
+        destination_tiploc: str | Collection[str] | None = None,
+        predicate: Callable[[dict], bool] | None = None,
+    ) -> 'LazyServices':
+        """Select services by raw field values, without validating them.
+
+        Each criterion accepts a single value or a collection of values to
+        match; a service matches ``destination_tiploc`` if any of its
+        destinations does.  ``predicate`` is called with the raw JSON object of
+        each service.  All given criteria must match.
+        """
+        checks: list[Callable[[dict], bool]] = []
+        if service_uid is not None:
+            uids = _as_set(service_uid)
+            checks.append(lambda raw: raw.get('serviceUid') in uids)
+        if atoc_code is not None:
+            codes = _as_set(atoc_code)
+            checks.append(lambda raw: raw.get('atocCode') in codes)
+        if destination_tiploc is not None:
+            tiplocs = _as_set(destination_tiploc)
+            checks.append(lambda raw: not tiplocs.isdisjoint(_destination_tiplocs(raw)))
+        if predicate is not None:
+            checks.append(predicate)
+
+        selected = LazyServices([])
+        for raw, model in zip(self.raw, self._models):
+            if all(check(raw) for check in checks):
+                selected.raw.append(raw)
+                selected._models.append(model)
+        return selected
+
+
+class LazyLocationResponse:
+    """Location line-up whose services are validated on demand.
+
+    ``location`` and ``filter`` are small and validated up front.  Use
+    :meth:`materialize` to obtain an ordinary ``LocationResponse``.
+    """
+
+    def __init__(
+        self,
+        location: StationSummary,
+        filter: StationFilter | None,
+        services: LazyServices,
+    ):
+        self.location = location
+        self.filter = filter
+        self.services = services
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LazyLocationResponse':
+        return cls(
+            location=StationSummary.model_validate(data['location']),
+            filter=(
+                None
+                if data.get('filter') is None
+                else StationFilter.model_validate(data['filter'])
+            ),
+            services=LazyServices(data.get('services') or []),
+        )
+
+    @classmethod
+    def from_json(cls, content: str | bytes) -> 'LazyLocationResponse':
+        return cls.from_dict(json.loads(content))
+
+    def materialize(self) -> LocationResponse:
+        """Validate every remaining service into a full ``LocationResponse``."""
+        return LocationResponse(
+            location=self.location, filter=self.filter, services=list(self.services)
+        )
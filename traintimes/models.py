@@ -6,18 +6,179 @@ https://www.realtimetrains.co.uk/about/developer/pull/docs/
 They provide structure around both the request parameters we can supply to the
 API and the responses returned from the location line-up and service
 information endpoints.
+
+Times are reported by the API as local ``HHMM`` (public) or ``HHMMSS``
+(working timetable) strings.  :attr:`ServiceResponse.timings` and
+:attr:`LocationService.timings` parse them once per instance into offsets
+from midnight on the service's run date, rolling over correctly for services
+that run past midnight.  Assigning a field, or ``model_copy``, clears the
+parsed times of that model; a nested model changed in place is not noticed
+by its parent, so assign the changed list or model back to it.
 """
 
 import datetime as _dt
+import functools
 import re
+from collections.abc import Sequence
 from enum import Enum
-from typing import Annotated
+from functools import cached_property
+from typing import Annotated, ClassVar
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 _SERVICE_UID_RE = re.compile(r"^[A-Z][0-9]{5}$")
 
+# Rollover arithmetic is done in whole seconds after midnight.
+_DAY = 24 * 60 * 60
+_HALF_DAY = _DAY // 2
+
+# Time fields of a LocationEvent, in the order a train reaches them.
+BOOKED_TIME_FIELDS = (
+    "wtt_booked_arrival",
+    "gbtt_booked_arrival",
+    "wtt_booked_pass",
+    "wtt_booked_departure",
+    "gbtt_booked_departure",
+)
+REALTIME_FIELDS = ("realtime_arrival", "realtime_pass", "realtime_departure")
+TIME_FIELDS = BOOKED_TIME_FIELDS + REALTIME_FIELDS
+
+_london = None
+
+
+def london():
+    """The ``Europe/London`` timezone all RTT times are local to."""
+    global _london
+    if _london is None:
+        from zoneinfo import ZoneInfo
+
+        _london = ZoneInfo("Europe/London")
+    return _london
+
+
+@functools.lru_cache(maxsize=None)
+def time_seconds(value: str) -> int:
+    """Seconds after midnight of an RTT time of day, without day rollover.
+
+    Accepts ``HHMM``, ``HHMMSS`` and ``HHMMH`` (``H`` marking a working
+    timetable half minute).  There are few distinct times, so they are
+    parsed once each.
+    """
+    seconds = int(value[:2]) * 3600 + int(value[2:4]) * 60
+    if value[4:] == "H":
+        seconds += 30
+    elif value[4:]:
+        seconds += int(value[4:6])
+    return seconds
+
+
+def parse_time(value: str | None) -> _dt.timedelta | None:
+    """Parse an RTT time of day into an offset from midnight.
+
+    Returns ``None`` for a missing value; see :func:`time_seconds`.
+    """
+    if not value:
+        return None
+    return _dt.timedelta(seconds=time_seconds(value))
+
+
+def booked_seconds(event: "LocationEvent") -> int | None:
+    """Earliest booked time at ``event`` in seconds, without day rollover."""
+    for field in BOOKED_TIME_FIELDS:
+        value = getattr(event, field)
+        if value:
+            return time_seconds(value)
+    return None
+
+
+def placed_seconds(
+    events: Sequence["LocationEvent"], fields: Sequence[str], day: int = 0
+) -> list[list[int | None]]:
+    """``fields`` of each of ``events`` in seconds after run date midnight.
+
+    Returns one list per field, with ``None`` where a time is not reported.
+    Walking the calling points in order from ``day`` (in seconds), a booked
+    time more than twelve hours before the previous one means the service has
+    passed midnight.  Realtime (and any stray booked) times more than twelve
+    hours away from a location's first booked time are taken to be across
+    midnight from it.  Both ``timings`` and :mod:`traintimes.columns` place
+    times with this one function.
+    """
+    placed = [[] for _ in fields]
+    previous = None
+    for event in events:
+        anchor = booked_seconds(event)
+        if anchor is not None:
+            if previous is not None and anchor + day < previous - _HALF_DAY:
+                day += _DAY
+            previous = anchor + day
+            earliest, latest = previous - _HALF_DAY, previous + _HALF_DAY
+        for times, field in zip(placed, fields):
+            value = getattr(event, field)
+            if not value:
+                times.append(None)
+                continue
+            seconds = time_seconds(value) + day
+            if anchor is not None:
+                if seconds < earliest:
+                    seconds += _DAY
+                elif seconds > latest:
+                    seconds -= _DAY
+            times.append(seconds)
+    return placed
+
+
+def _event_times(run_date: _dt.date, placed: tuple[int | None, ...]) -> "EventTimes":
+    """The ``EventTimes`` of one location's :data:`TIME_FIELDS` seconds."""
+    offsets = {
+        field: _dt.timedelta(seconds=seconds)
+        for field, seconds in zip(TIME_FIELDS, placed)
+        if seconds is not None
+    }
+    return EventTimes(run_date, offsets)
+
+
+class EventTimes:
+    """Parsed times of one calling point, relative to the service run date.
+
+    Offsets are from midnight at the start of ``run_date``, so a call at
+    00:10 the following morning is ``timedelta(days=1, minutes=10)``.
+    """
+
+    __slots__ = ("run_date", "offsets")
+
+    def __init__(self, run_date: _dt.date, offsets: dict[str, _dt.timedelta]):
+        self.run_date = run_date
+        self.offsets = offsets
+
+    def __repr__(self):
+        return f"EventTimes({self.run_date!r}, {self.offsets!r})"
+
+    def offset(self, field: str) -> _dt.timedelta | None:
+        return self.offsets.get(field)
+
+    def minutes(self, field: str) -> int | None:
+        """Whole minutes after run date midnight, or ``None`` if not reported."""
+        offset = self.offsets.get(field)
+        return None if offset is None else offset // _dt.timedelta(minutes=1)
+
+    def datetime(self, field: str, tz: _dt.tzinfo | None = None) -> _dt.datetime | None:
+        """Timezone aware datetime, in ``Europe/London`` unless ``tz`` given."""
+        offset = self.offsets.get(field)
+        if offset is None:
+            return None
+        midnight = _dt.datetime.combine(self.run_date, _dt.time(), tz or london())
+        return midnight + offset
+
+    def delay(self, kind: str = "departure") -> int | None:
+        """Realtime minus public booked ``arrival`` or ``departure``, in minutes."""
+        booked = self.offsets.get(f"gbtt_booked_{kind}")
+        actual = self.offsets.get(f"realtime_{kind}")
+        if booked is None or actual is None:
+            return None
+        return (actual - booked) // _dt.timedelta(minutes=1)
+
 
 class ServiceType(str, Enum):
     """Types of services reported by the API."""
@@ -69,21 +230,52 @@ class StationFilter(BaseModel):
     to: StationSummary | None = None
 
 
-class Pair(BaseModel):
+class _CachingModel(BaseModel):
+    """A model whose ``cached_property`` values are cleared when it changes.
+
+    The cached values live in the instance ``__dict__`` alongside the fields,
+    where assignment would otherwise leave them stale and ``model_copy``
+    would carry them over to the copy.
+    """
+
+    _cached_properties: ClassVar[tuple[str, ...]] = ()
+
+    def _clear_cached(self) -> None:
+        for name in self._cached_properties:
+            self.__dict__.pop(name, None)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        self._clear_cached()
+
+    def model_copy(self, *, update=None, deep=False):
+        copied = super().model_copy(update=update, deep=deep)
+        copied._clear_cached()
+        return copied
+
+
+class Pair(_CachingModel):
     """Origin/destination pairs used throughout the API."""
 
     model_config = ConfigDict(extra="ignore", populate_by_name=True)
+    _cached_properties = ("offset",)
 
     tiploc: str
     description: str
     working_time: str | None = Field(default=None, alias="workingTime")
     public_time: str | None = Field(default=None, alias="publicTime")
 
+    @cached_property
+    def offset(self) -> _dt.timedelta | None:
+        """Working (else public) time as an offset from midnight."""
+        return parse_time(self.working_time or self.public_time)
 
-class LocationEvent(BaseModel):
+
+class LocationEvent(_CachingModel):
     """Detailed information about a service at a specific location."""
 
     model_config = ConfigDict(extra="ignore", populate_by_name=True)
+    _cached_properties = ("raw_offsets",)
 
     realtime_activated: bool = Field(default=False, alias="realtimeActivated")
     tiploc: str
@@ -148,11 +340,27 @@ class LocationEvent(BaseModel):
         default=None, alias="serviceLocation"
     )
 
+    @cached_property
+    def raw_offsets(self) -> dict[str, _dt.timedelta]:
+        """Reported times as offsets from midnight, without day rollover."""
+        offsets = {}
+        for field in TIME_FIELDS:
+            offset = parse_time(getattr(self, field))
+            if offset is not None:
+                offsets[field] = offset
+        return offsets
+
+    def first_booked(self) -> _dt.timedelta | None:
+        """Earliest booked time at this location, without day rollover."""
+        seconds = booked_seconds(self)
+        return None if seconds is None else _dt.timedelta(seconds=seconds)
 
-class LocationService(BaseModel):
+
+class LocationService(_CachingModel):
     """A service entry returned by the location line-up endpoint."""
 
     model_config = ConfigDict(extra="ignore", populate_by_name=True)
+    _cached_properties = ("timings",)
 
     location_detail: LocationEvent = Field(alias="locationDetail")
     service_uid: Annotated[str, Field(alias="serviceUid")]
@@ -168,6 +376,22 @@ class LocationService(BaseModel):
     destination: list[Pair] | None = Field(default=None, alias="destination")
     countdown_minutes: int | None = Field(default=None, alias="countdownMinutes")
 
+    @cached_property
+    def timings(self) -> EventTimes:
+        """Parsed times at this location, relative to ``run_date``.
+
+        Times earlier in the day than the service's origin departure are
+        taken to fall on the following day.
+        """
+        day = 0
+        booked = booked_seconds(self.location_detail)
+        origins = self.origin or self.location_detail.origin
+        start = origins[0].offset if origins else None
+        if booked is not None and start is not None and booked < start.total_seconds():
+            day = _DAY
+        [placed] = zip(*placed_seconds([self.location_detail], TIME_FIELDS, day))
+        return _event_times(self.run_date, placed)
+
 
 class LocationResponse(BaseModel):
     """Full response payload for the location line-up endpoint."""
@@ -176,9 +400,11 @@ class LocationResponse(BaseModel):
 
     location: StationSummary
     filter: StationFilter | None = None
-    services: list[LocationService] = Field(default_factory=list)
+    # Typed as optional so that raw JSON validates in one pass; a "before"
+    # validator would force the whole array through Python objects first.
+    services: list[LocationService] | None = Field(default_factory=list)
 
-    @field_validator("services", mode="before")
+    @field_validator("services", mode="after")
     @classmethod
     def _coerce_null_services(
         cls, value: list[LocationService] | None
@@ -188,11 +414,24 @@ class LocationResponse(BaseModel):
             return []
         return value
 
+    def to_columns(self):
+        """Flatten into typed columns, see :mod:`traintimes.columns`."""
+        from .columns import batch_columns
 
-class ServiceResponse(BaseModel):
+        return batch_columns([self])
+
+    def to_arrays(self, backend="numpy"):
+        """Flatten into NumPy arrays or a ``pyarrow.Table``."""
+        from .columns import to_arrays
+
+        return to_arrays(self.to_columns(), backend)
+
+
+class ServiceResponse(_CachingModel):
     """Full response payload for the service information endpoint."""
 
     model_config = ConfigDict(extra="ignore", populate_by_name=True)
+    _cached_properties = ("timings",)
 
     service_uid: Annotated[str, Field(alias="serviceUid")]
     run_date: _dt.date = Field(alias="runDate")
@@ -211,6 +450,42 @@ class ServiceResponse(BaseModel):
     realtime_activated: bool = Field(default=False, alias="realtimeActivated")
     running_identity: str | None = Field(default=None, alias="runningIdentity")
 
+    @cached_property
+    def timings(self) -> list[EventTimes]:
+        """Parsed times for each of ``locations``, relative to ``run_date``.
+
+        Walking the calling points in order, a booked time more than twelve
+        hours before the previous one means the service has passed midnight.
+        """
+        placed = placed_seconds(self.locations, TIME_FIELDS)
+        return [_event_times(self.run_date, times) for times in zip(*placed)]
+
+    def minutes(self, field: str) -> list[int | None]:
+        """Minutes after run date midnight of ``field`` at every location."""
+        return [times.minutes(field) for times in self.timings]
+
+    def datetimes(
+        self, field: str, tz: _dt.tzinfo | None = None
+    ) -> list[_dt.datetime | None]:
+        """Aware datetimes of ``field`` at every location."""
+        return [times.datetime(field, tz) for times in self.timings]
+
+    def delays(self, kind: str = "departure") -> list[int | None]:
+        """Realtime minus booked ``arrival`` or ``departure`` minutes per location."""
+        return [times.delay(kind) for times in self.timings]
+
+    def to_columns(self):
+        """Flatten into typed columns, see :mod:`traintimes.columns`."""
+        from .columns import batch_columns
+
+        return batch_columns([self])
+
+    def to_arrays(self, backend="numpy"):
+        """Flatten into NumPy arrays or a ``pyarrow.Table``."""
+        from .columns import to_arrays
+
+        return to_arrays(self.to_columns(), backend)
+
 
 class LocationRequest(BaseModel):
     """Validated request payload for a location line-up query."""
@@ -0,0 +1,189 @@
+"""An inverted index of calling patterns: which services call at A, then B.
+
+Finding the trains between two stations otherwise means fetching every
+service and walking its ``locations`` in order, as the ``delays`` scripts do.
+A :class:`PatternIndex` keeps a posting list for every TIPLOC and CRS code on
+each run date: the services calling there, and at which positions.  A query
+intersects two posting lists and compares positions::
+
+    patterns = PatternIndex()
+    traintimes.configure(pattern_index=patterns)   # index every service fetched
+    ...
+    for journey in patterns.between('HIB', 'CHX', date(2025, 10, 16)):
+        journey.service_uid, journey.depart.scheduled, journey.arrive.actual
+
+Services are indexed as they are added; adding one again replaces its
+postings, so realtime times stay current.  Only public calls are indexed:
+passing points, cancelled calls and calls not open to passengers are not.
+"""
+
+import bisect
+import datetime as _dt
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .models import DisplayAs, LocationEvent, LocationResponse, ServiceResponse
+
+
+ServiceKey = tuple[str, _dt.date]
+# Code (TIPLOC or CRS) and run date to the positions of each service there.
+Postings = dict[ServiceKey, tuple[int, ...]]
+
+_NOT_CALLING = (DisplayAs.PASS, DisplayAs.CANCELLED_PASS, DisplayAs.CANCELLED_CALL)
+_LATEST = _dt.datetime.max.replace(tzinfo=_dt.timezone.utc)
+
+
+def _calls(event: LocationEvent) -> bool:
+    return (
+        event.display_as not in _NOT_CALLING
+        and event.wtt_booked_pass is None
+        and event.is_public_call is not False
+    )
+
+
+@dataclass(frozen=True)
+class Call:
+    """One end of a journey: where a service calls, and when."""
+
+    tiploc: str
+    crs: str | None
+    position: int
+    scheduled: _dt.datetime | None
+    actual: _dt.datetime | None
+    delay: int | None
+
+    @classmethod
+    def at(cls, service: ServiceResponse, position: int, kind: str) -> 'Call':
+        """The ``arrival`` or ``departure`` at ``service.locations[position]``."""
+        event = service.locations[position]
+        times = service.timings[position]
+        return cls(
+            event.tiploc,
+            event.crs,
+            position,
+            times.datetime(f'gbtt_booked_{kind}'),
+            times.datetime(f'realtime_{kind}'),
+            times.delay(kind),
+        )
+
+
+@dataclass(frozen=True)
+class Journey:
+    """A service departing one location and later arriving at another."""
+
+    service: ServiceResponse
+    depart: Call
+    arrive: Call
+
+    @property
+    def service_uid(self) -> str:
+        return self.service.service_uid
+
+    @property
+    def run_date(self) -> _dt.date:
+        return self.service.run_date
+
+
+def _leg(departs: tuple[int, ...], arrives: tuple[int, ...]) -> tuple[int, int] | None:
+    """The shortest departure and arrival positions with the arrival later.
+
+    Both position tuples are ascending; a service can call at a location
+    more than once.
+    """
+    for depart in reversed(departs):
+        after = bisect.bisect_right(arrives, depart)
+        if after < len(arrives):
+            return depart, arrives[after]
+    return None
+
+
+class PatternIndex:
+    """Posting lists of the calls of every service added, by location and date."""
+
+    def __init__(self, services: Iterable[ServiceResponse] = ()):
+        self.services: dict[ServiceKey, ServiceResponse] = {}
+        self.postings: dict[tuple[str, _dt.date], Postings] = {}
+        self._lock = threading.Lock()
+        for service in services:
+            self.add(service)
+
+    def __len__(self) -> int:
+        return len(self.services)
+
+    def __contains__(self, key: ServiceKey) -> bool:
+        return key in self.services
+
+    @staticmethod
+    def _positions(service: ServiceResponse) -> dict[str, list[int]]:
+        positions: dict[str, list[int]] = {}
+        for position, event in enumerate(service.locations):
+            if _calls(event):
+                for code in {event.tiploc, event.crs} - {None}:
+                    positions.setdefault(code, []).append(position)
+        return positions
+
+    def _remove(self, key: ServiceKey) -> None:
+        service = self.services.pop(key)
+        for code in self._positions(service):
+            postings = self.postings[code, service.run_date]
+            del postings[key]
+            if not postings:
+                del self.postings[code, service.run_date]
+
+    def add(self, service: ServiceResponse) -> None:
+        """Index a service, replacing any earlier copy of it."""
+        key = (service.service_uid, service.run_date)
+        with self._lock:
+            if self.services.get(key) is service:
+                return
+            if key in self.services:
+                self._remove(key)
+            self.services[key] = service
+            for code, positions in self._positions(service).items():
+                postings = self.postings.setdefault((code, service.run_date), {})
+                postings[key] = tuple(positions)
+
+    def discard(self, service_uid: str, run_date: _dt.date) -> None:
+        """Drop a service from the index, if present."""
+        with self._lock:
+            if (service_uid, run_date) in self.services:
+                self._remove((service_uid, run_date))
+
+    def observe(self, response: LocationResponse | ServiceResponse) -> None:
+        """Index a parsed response; location line-ups are ignored."""
+        if isinstance(response, ServiceResponse):
+            self.add(response)
+
+    def calling_at(self, code: str, date: _dt.date) -> list[ServiceResponse]:
+        """Services calling at a TIPLOC or CRS code on ``date``."""
+        postings = self.postings.get((code, date), {})
+        return [self.services[key] for key in postings]
+
+    def between(self, start: str, end: str, date: _dt.date) -> list[Journey]:
+        """Services calling at ``start`` and later at ``end`` on ``date``.
+
+        Stations are TIPLOCs or CRS codes.  Journeys are in order of
+        scheduled departure; times are public (``gbtt``) and realtime.
+        """
+        with self._lock:
+            departs = self.postings.get((start, date), {})
+            arrives = self.postings.get((end, date), {})
+            # Probe the longer posting list with the keys of the shorter.
+            shorter, longer = sorted((departs, arrives), key=len)
+            legs = []
+            for key in shorter:
+                if key in longer:
+                    leg = _leg(departs[key], arrives[key])
+                    if leg is not None:
+                        legs.append((self.services[key], leg))
+        journeys = [
+            Journey(
+                service,
+                Call.at(service, depart, 'departure'),
+                Call.at(service, arrive, 'arrival'),
+            )
+            for service, (depart, arrive) in legs
+        ]
+        journeys.sort(key=lambda journey: journey.depart.scheduled or _LATEST)
+        return journeys
@@ -0,0 +1,247 @@
+"""Client-side rate limiting and daily quota accounting.
+
+The RealTimeTrains API allows a limited number of calls per day and throttles
+clients that burst.  A :class:`RateLimiter` spaces requests out with a token
+bucket, counts them against a :class:`DailyQuota` and, when the API answers
+``429 Too Many Requests``, pauses every caller for the ``Retry-After`` period
+before retrying::
+
+    traintimes.configure(
+        rate_limiter=RateLimiter(
+            rate=2, quota=DailyQuota(limit=1000, path='.rtt_quota.json')
+        )
+    )
+
+One limiter is shared by every request using the config, whether made from
+worker threads (:func:`traintimes.bulk.fetch_services`) or asyncio tasks
+(:mod:`traintimes.aio`), so bulk sweeps run at the sustainable rate instead
+of bursting and failing.  Responses served from the cache are not charged.
+"""
+
+import asyncio
+import contextlib
+import datetime as _dt
+import email.utils
+import json
+import os
+import threading
+import time
+
+from .models import london
+
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_AFTER = 1.0
+
+
+class QuotaExceeded(Exception):
+    """Raised instead of making a call that would exceed the daily quota."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket, refilled at ``rate`` tokens a second.
+
+    Up to ``capacity`` tokens accumulate while idle, allowing short bursts.
+    Callers reserve a token and then wait for it outside the lock, so waiting
+    threads and tasks are released one by one at the refill rate.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError(f'rate must be positive, got {rate!r}')
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            elapsed = now - self.updated
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take ``tokens``, returning the seconds to wait before using them."""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self.tokens -= tokens
+            wait = self.updated - now
+            if self.tokens < 0:
+                wait += -self.tokens / self.rate
+            return wait
+
+    def try_take(self, tokens: float = 1) -> float:
+        """Take ``tokens`` only if they are available now.
+
+        Returns ``0`` when taken, otherwise the seconds until they would be.
+        """
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            if now >= self.updated and self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return max(self.updated - now, 0) + max(tokens - self.tokens, 0) / self.rate
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for ``seconds``, then resume from empty."""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self.tokens = min(self.tokens, 0)
+            self.updated = max(self.updated, now + seconds)
+
+
+def _london_today() -> _dt.date:
+    return _dt.datetime.now(london()).date()
+
+
+class DailyQuota:
+    """Count calls made today against ``limit``, optionally persisted to ``path``.
+
+    The count is saved as JSON after every call.  Every call re-reads it
+    under an exclusive lock on ``path + '.lock'``, so separate runs and
+    concurrent processes on the same day share one allowance (on platforms
+    without ``fcntl`` the lock is only held between threads).  It resets when
+    the date, in Europe/London unless ``today`` says otherwise, changes.
+    """
+
+    def __init__(self, limit: int, path: str | None = None, today=_london_today):
+        self.limit = limit
+        self.path = path
+        self.today = today
+        self.date = today()
+        self.count = 0
+        self._lock = threading.Lock()
+        with self._locked():
+            self._load()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._lock:
+            if self.path is None or fcntl is None:
+                yield
+                return
+            with open(f'{self.path}.lock', 'a') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                yield
+
+    def _load(self) -> None:
+        """Adopt today's count as saved by any process sharing ``path``."""
+        if self.path is None or not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            saved = json.load(f)
+        if saved['date'] == self.date.isoformat():
+            self.count = saved['count']
+
+    def _refresh(self) -> None:
+        today = self.today()
+        if today != self.date:
+            self.date = today
+            self.count = 0
+        self._load()
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        partial = f'{self.path}.{os.getpid()}.tmp'
+        with open(partial, 'w') as f:
+            json.dump({'date': self.date.isoformat(), 'count': self.count}, f)
+        os.replace(partial, self.path)
+
+    @property
+    def used(self) -> int:
+        with self._locked():
+            self._refresh()
+            return self.count
+
+    @property
+    def remaining(self) -> int:
+        return max(self.limit - self.used, 0)
+
+    def take(self) -> None:
+        """Count one call, raising :class:`QuotaExceeded` if none are left."""
+        with self._locked():
+            self._refresh()
+            if self.count >= self.limit:
+                raise QuotaExceeded(
+                    f'daily quota of {self.limit} calls used up for {self.date}'
+                )
+            self.count += 1
+            self._save()
+
+
+def parse_retry_after(value: str | None, now=None) -> float | None:
+    """Seconds to wait from a ``Retry-After`` header: delay seconds or a date."""
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if now is None:
+        now = _dt.datetime.now(_dt.timezone.utc)
+    return max((when - now).total_seconds(), 0.0)
+
+
+class RateLimiter:
+    """Throttle requests to ``rate`` a second, within an optional daily quota.
+
+    ``burst`` is the token bucket capacity.  Throttled (``429``) responses
+    are retried up to ``max_retries`` times, waiting ``Retry-After`` seconds
+    (or ``default_retry_after`` without the header) across all callers.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1,
+        quota: DailyQuota | None = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        default_retry_after: float = DEFAULT_RETRY_AFTER,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        self.bucket = TokenBucket(rate, burst, clock=clock)
+        self.quota = quota
+        self.max_retries = max_retries
+        self.default_retry_after = default_retry_after
+        self.sleep = sleep
+
+    def _take(self) -> float:
+        if self.quota is not None:
+            self.quota.take()
+        return self.bucket.reserve()
+
+    def acquire(self) -> None:
+        """Block the calling thread until a request may be sent."""
+        wait = self._take()
+        if wait > 0:
+            self.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait, without blocking the event loop, until a request may be sent."""
+        wait = self._take()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def should_retry(self, status_code: int, headers, attempt: int) -> bool:
+        """Whether to retry a response, pausing the bucket if throttled."""
+        if status_code != 429 or attempt >= self.max_retries:
+            return False
+        delay = parse_retry_after(headers.get('Retry-After'))
+        self.bucket.pause(self.default_retry_after if delay is None else delay)
+        return True
@@ -0,0 +1,254 @@
+"""Retries, per-attempt timeouts and hedged requests.
+
+Every RealTimeTrains endpoint is a ``GET``, so a request that failed in
+transit can safely be sent again.  A :class:`RetryPolicy` retries transient
+failures -- connection errors, timeouts and ``5xx`` gateway responses -- with
+exponential backoff and jitter, while errors the API actually returned (an
+error envelope, a ``404``) are raised straight away::
+
+    traintimes.configure(
+        retry_policy=RetryPolicy(max_attempts=4, timeout=5, hedge_percentile=95)
+    )
+
+With ``hedge_percentile`` set, an attempt still running after that percentile
+of recent latencies is duplicated, and whichever copy answers first is used,
+trimming the tail latency caused by the occasional slow call.  The async
+client cancels the losing copy.  A synchronous one cannot be cancelled: it
+finishes in the background, counting against any rate limit and quota, and
+is reported to ``on_attempt`` but left out of the request's ``attempts``.
+
+Each attempt is timed.  The request object keeps its own in ``attempts`` and
+the policy passes every one to ``on_attempt`` for metrics::
+
+    policy = RetryPolicy(on_attempt=lambda attempt: histogram.observe(attempt.elapsed))
+"""
+
+import asyncio
+import collections
+import random
+import threading
+import time
+from collections.abc import Callable
+from concurrent import futures
+from dataclasses import dataclass, field
+
+
+# Gateway and availability errors, worth another try.  Other statuses are the
+# API's considered answer and are left to ``RTTBase.parse`` to report.
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+
+@dataclass
+class Attempt:
+    """Timing and outcome of one HTTP attempt."""
+
+    number: int
+    elapsed: float
+    status_code: int | None = None
+    error: Exception | None = None
+    hedged: bool = False
+
+
+@dataclass
+class RetryPolicy:
+    """How often, how patiently and how eagerly to send a request.
+
+    ``max_attempts`` counts the first try.  The ``n``-th retry waits up to
+    ``backoff * 2 ** (n - 1)`` seconds, capped at ``max_backoff``; with
+    ``jitter`` the wait is drawn uniformly below that ("full jitter") so
+    clients retrying together spread out.  ``timeout`` is passed to each
+    attempt, as seconds or a ``(connect, read)`` tuple.
+
+    Hedging needs ``hedge_min_samples`` latencies, of the last
+    ``latency_window`` attempts, before it starts.
+    """
+
+    max_attempts: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 10.0
+    jitter: bool = True
+    timeout: float | tuple[float, float] | None = 10.0
+    retry_statuses: frozenset[int] = RETRY_STATUSES
+    hedge_percentile: float | None = None
+    hedge_min_samples: int = 20
+    latency_window: int = 200
+    on_attempt: Callable[[Attempt], None] | None = None
+    clock: Callable[[], float] = time.monotonic
+    sleep: Callable[[float], None] = time.sleep
+    latencies: collections.deque = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.latencies = collections.deque(maxlen=self.latency_window)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def delay(self, retry: int) -> float:
+        """Seconds to wait before the ``retry``-th retry."""
+        cap = min(self.max_backoff, self.backoff * 2 ** (retry - 1))
+        return random.uniform(0, cap) if self.jitter else cap
+
+    def hedge_threshold(self) -> float | None:
+        """Latency after which to hedge an attempt, once enough are known."""
+        if self.hedge_percentile is None:
+            return None
+        with self._lock:
+            samples = sorted(self.latencies)
+        if len(samples) < self.hedge_min_samples:
+            return None
+        index = round(self.hedge_percentile / 100 * (len(samples) - 1))
+        return samples[index]
+
+    def _observe(self, attempt: Attempt, attempts: list) -> None:
+        if attempt.error is None:
+            with self._lock:
+                self.latencies.append(attempt.elapsed)
+        attempts.append(attempt)
+        if self.on_attempt is not None:
+            self.on_attempt(attempt)
+
+    def _retryable(self, response) -> bool:
+        return response.status_code in self.retry_statuses
+
+    def _timed(self, call, number, attempts, hedged=False):
+        start = self.clock()
+        try:
+            response = call(timeout=self.timeout)
+        except Exception as error:
+            elapsed = self.clock() - start
+            self._observe(
+                Attempt(number, elapsed, error=error, hedged=hedged), attempts
+            )
+            raise
+        elapsed = self.clock() - start
+        self._observe(
+            Attempt(number, elapsed, response.status_code, hedged=hedged), attempts
+        )
+        return response
+
+    def _pool(self) -> futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = futures.ThreadPoolExecutor(
+                    thread_name_prefix='traintimes-hedge'
+                )
+            return self._executor
+
+    def _hedged(self, call, number, attempts, threshold):
+        """Race a hedge against an attempt still running after ``threshold``.
+
+        Threads cannot be cancelled, so a losing attempt runs on in the pool,
+        using its share of any rate limit and quota, and is still reported to
+        ``on_attempt``.  Each attempt records into a list of its own, and only
+        those finished by the time this returns are added to ``attempts``.
+        """
+        pool = self._pool()
+        own = {}
+
+        def start(hedged=False):
+            own_attempts = []
+            future = pool.submit(self._timed, call, number, own_attempts, hedged)
+            own[future] = own_attempts
+            return future
+
+        done, pending = futures.wait({start()}, timeout=threshold)
+        if not done:
+            pending.add(start(True))
+        finished = []
+        error = None
+        try:
+            while True:
+                for future in done:
+                    finished.append(future)
+                    if future.exception() is None:
+                        return future.result()
+                    error = error or future.exception()
+                if not pending:
+                    raise error
+                done, pending = futures.wait(
+                    pending, return_when=futures.FIRST_COMPLETED
+                )
+        finally:
+            for future in finished:
+                attempts.extend(own[future])
+
+    def run(self, call, attempts: list, errors: tuple[type[Exception], ...]):
+        """Call ``call(timeout=...)`` until it succeeds or attempts run out.
+
+        ``errors`` are the transport's transient exceptions.  The last
+        response (or error) is returned (or raised) once retries are spent.
+        """
+        number = 0
+        while True:
+            number += 1
+            threshold = self.hedge_threshold()
+            try:
+                if threshold is None:
+                    response = self._timed(call, number, attempts)
+                else:
+                    response = self._hedged(call, number, attempts, threshold)
+            except errors:
+                if number == self.max_attempts:
+                    raise
+            else:
+                if number == self.max_attempts or not self._retryable(response):
+                    return response
+            self.sleep(self.delay(number))
+
+    async def _timed_async(self, call, number, attempts, hedged=False):
+        start = self.clock()
+        try:
+            response = await call(timeout=self.timeout)
+        except Exception as error:
+            elapsed = self.clock() - start
+            self._observe(
+                Attempt(number, elapsed, error=error, hedged=hedged), attempts
+            )
+            raise
+        elapsed = self.clock() - start
+        self._observe(
+            Attempt(number, elapsed, response.status_code, hedged=hedged), attempts
+        )
+        return response
+
+    async def _hedged_async(self, call, number, attempts, threshold):
+        first = asyncio.ensure_future(self._timed_async(call, number, attempts))
+        done, _ = await asyncio.wait({first}, timeout=threshold)
+        if done:
+            return first.result()
+        second = asyncio.ensure_future(self._timed_async(call, number, attempts, True))
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    return task.result()
+                error = error or task.exception()
+        raise error
+
+    async def run_async(
+        self, call, attempts: list, errors: tuple[type[Exception], ...]
+    ):
+        """Coroutine counterpart of :meth:`run`, for a coroutine ``call``."""
+        number = 0
+        while True:
+            number += 1
+            threshold = self.hedge_threshold()
+            try:
+                if threshold is None:
+                    response = await self._timed_async(call, number, attempts)
+                else:
+                    response = await self._hedged_async(
+                        call, number, attempts, threshold
+                    )
+            except errors:
+                if number == self.max_attempts:
+                    raise
+            else:
+                if number == self.max_attempts or not self._retryable(response):
+                    return response
+            await asyncio.sleep(self.delay(number))
@@ -0,0 +1,111 @@
+"""Conditional requests, reusing the parsed model when nothing has changed.
+
+Polling a board every 30 seconds mostly downloads and validates the same JSON
+again.  A :class:`Revalidator` remembers, per URI, the validators of the last
+response (``ETag`` / ``Last-Modified``), a hash of its body and the model it
+was parsed into::
+
+    traintimes.configure(revalidator=Revalidator())
+
+Later requests for the URI are sent with ``If-None-Match`` /
+``If-Modified-Since``.  A ``304 Not Modified`` answer, or a body hashing the
+same as before, returns the previous model without running
+``model_validate_json`` again.  Models are shared between calls, so treat
+them as read-only.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+
+DEFAULT_MAX_ENTRIES = 1024
+
+
+@dataclass
+class RevalidationStats:
+    """How each response was resolved."""
+
+    not_modified: int = 0
+    unchanged: int = 0
+    parsed: int = 0
+
+
+@dataclass
+class Entry:
+    """What is remembered of the last successful response for a URI."""
+
+    digest: bytes
+    model: object
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def digest(content: bytes) -> bytes:
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+@dataclass
+class Revalidator:
+    """Validators and parsed models of the ``max_entries`` latest URIs."""
+
+    max_entries: int = DEFAULT_MAX_ENTRIES
+    stats: RevalidationStats = field(default_factory=RevalidationStats)
+
+    def __post_init__(self):
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, uri: str) -> Entry | None:
+        with self._lock:
+            entry = self.entries.get(uri)
+            if entry is not None:
+                self.entries.move_to_end(uri)
+            return entry
+
+    def put(self, uri: str, entry: Entry) -> None:
+        with self._lock:
+            self.entries[uri] = entry
+            self.entries.move_to_end(uri)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self.stats, outcome, getattr(self.stats, outcome) + 1)
+
+    def conditional_headers(self, uri: str) -> dict[str, str]:
+        """Request headers asking the API to skip an unchanged body."""
+        entry = self.get(uri)
+        headers = {}
+        if entry is not None:
+            if entry.etag is not None:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified is not None:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def resolve(self, uri: str, ok: bool, status_code: int, headers, content, decode):
+        """Return the model for a response, calling ``decode()`` only if changed.
+
+        ``decode`` validates the response, raising for failures as usual.
+        """
+        entry = self.get(uri)
+        if status_code == 304 and entry is not None:
+            self._count('not_modified')
+            return entry.model
+        if not ok:
+            return decode()
+        body = digest(content)
+        if entry is not None and entry.digest == body:
+            self._count('unchanged')
+            model = entry.model
+        else:
+            self._count('parsed')
+            model = decode()
+        self.put(
+            uri,
+            Entry(body, model, headers.get('ETag'), headers.get('Last-Modified')),
+        )
+        return model
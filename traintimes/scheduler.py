@@ -0,0 +1,286 @@
+"""Adaptive polling of many services within a request budget.
+
+Polling every tracked train on a fixed timer wastes quota on trains hours
+from departure and under-samples those about to leave.  A
+:class:`PollScheduler` picks each service's next poll from what the last
+response said about it (see :func:`poll_interval`):
+
+- at a platform or preparing to depart: every ``at_platform`` seconds
+- approaching a station or platform: every ``approaching`` seconds
+- running, with actual times reported: every ``running`` seconds
+- not yet running: every ``soon`` seconds within ``soon_minutes`` of
+  departure (``countdown_minutes`` on a line-up, the booked departure
+  otherwise), and before that at half the time remaining, up to ``idle``
+- at its final destination (the last call not cancelled), cancelled
+  throughout, or more than ``grace_minutes`` past its last booked time:
+  not again
+
+Polls failing with a client error (a ``ResponseError`` other than a 5xx,
+408 or 429) drop the service; other failures are retried.  Intervals are
+stretched evenly whenever the services being tracked would
+need more than ``requests_per_minute`` between them, and polls are spaced
+out by a token bucket, so the scheduler never exceeds its budget::
+
+    scheduler = PollScheduler(requests_per_minute=30)
+    scheduler.add(('W12345', date))
+    scheduler.run(on_response=tracker.update)
+"""
+
+import datetime as _dt
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+
+from .models import (
+    BOOKED_TIME_FIELDS,
+    DisplayAs,
+    EventTimes,
+    LocationEvent,
+    LocationService,
+    ServiceLocationState,
+    ServiceResponse,
+)
+from .ratelimit import TokenBucket
+from .sdk import ResponseError, Service
+from .tracking import has_actual
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REQUESTS_PER_MINUTE = 30
+
+AT_PLATFORM_STATES = (
+    ServiceLocationState.AT_PLATFORM,
+    ServiceLocationState.DEPARTURE_PREPARING,
+    ServiceLocationState.DEPARTURE_READY,
+)
+APPROACHING_STATES = (
+    ServiceLocationState.APPROACHING_STATION,
+    ServiceLocationState.APPROACHING_PLATFORM,
+)
+CANCELLED_STATES = (DisplayAs.CANCELLED_CALL, DisplayAs.CANCELLED_PASS)
+# Client errors worth retrying all the same.
+TRANSIENT_STATUSES = frozenset({408, 429})
+
+ServiceKey = tuple[str, _dt.date]
+
+
+@dataclass
+class PollIntervals:
+    """Seconds between polls of a service, by what it is doing."""
+
+    at_platform: float = 15
+    approaching: float = 30
+    running: float = 60
+    soon: float = 120
+    idle: float = 1800
+    soon_minutes: float = 30
+    # Minutes after its last booked time to give up on a service.
+    grace_minutes: float = 120
+
+
+def _minutes_to_departure(response: ServiceResponse, now: _dt.datetime) -> float | None:
+    if not response.locations:
+        return None
+    times = response.timings[0]
+    departure = times.datetime('gbtt_booked_departure') or times.datetime(
+        'wtt_booked_departure'
+    )
+    if departure is None:
+        return None
+    return (departure - now).total_seconds() / 60
+
+
+def _minutes_overdue(timings: list[EventTimes], now: _dt.datetime) -> float | None:
+    """Minutes since the latest booked time in ``timings``, if any."""
+    booked = [
+        times.datetime(field)
+        for times in timings
+        for field in BOOKED_TIME_FIELDS
+        if times.offset(field) is not None
+    ]
+    if not booked:
+        return None
+    return (now - max(booked)).total_seconds() / 60
+
+
+def _finished(events: list[LocationEvent]) -> bool:
+    """Whether a service's last call not cancelled has an actual time."""
+    calls = [event for event in events if event.display_as not in CANCELLED_STATES]
+    return bool(events) and (not calls or has_actual(calls[-1]))
+
+
+def poll_interval(
+    response: ServiceResponse | LocationService,
+    now: _dt.datetime,
+    intervals: PollIntervals = PollIntervals(),
+) -> float | None:
+    """Seconds until a service should next be polled, ``None`` if never.
+
+    A ``ServiceResponse`` is finished once the last calling point not
+    cancelled has an actual time, or every one is cancelled.  A
+    ``LocationService`` from a line-up is finished once it has actually left
+    the board's location, arrived there to terminate, or been cancelled
+    there.  Either is given up on ``grace_minutes`` after its last booked
+    time.
+    """
+    if isinstance(response, LocationService):
+        detail = response.location_detail
+        events = [detail]
+        activated = detail.realtime_activated
+        countdown = response.countdown_minutes
+        timings = [response.timings]
+        finished = (
+            bool(detail.realtime_departure_actual)
+            or (detail.gbtt_booked_departure is None and has_actual(detail))
+            or detail.display_as in CANCELLED_STATES
+        )
+    else:
+        events = response.locations
+        activated = response.realtime_activated
+        countdown = _minutes_to_departure(response, now)
+        timings = response.timings
+        finished = _finished(events)
+    overdue = _minutes_overdue(timings, now)
+    if finished or (overdue is not None and overdue > intervals.grace_minutes):
+        return None
+    states = {event.service_location for event in events}
+    if states.intersection(AT_PLATFORM_STATES):
+        return intervals.at_platform
+    if states.intersection(APPROACHING_STATES):
+        return intervals.approaching
+    if any(has_actual(event) for event in events):
+        return intervals.running
+    if countdown is None:
+        return intervals.running if activated else intervals.idle
+    if countdown <= intervals.soon_minutes:
+        return intervals.soon
+    # Half the time remaining, in seconds.
+    return min(intervals.idle, max(intervals.soon, countdown * 30))
+
+
+def _permanent(error: Exception) -> bool:
+    """Whether a failed poll would fail the same way again."""
+    if not isinstance(error, ResponseError):
+        return False
+    status = error.status_code
+    return status is None or (status < 500 and status not in TRANSIENT_STATUSES)
+
+
+def _utcnow() -> _dt.datetime:
+    return _dt.datetime.now(_dt.timezone.utc)
+
+
+class PollScheduler:
+    """Decide when to poll each of many services, within a global budget."""
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        intervals: PollIntervals | None = None,
+        clock=_utcnow,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.intervals = intervals if intervals is not None else PollIntervals()
+        self.clock = clock
+        self.bucket = TokenBucket(
+            requests_per_minute / 60, clock=lambda: self.clock().timestamp()
+        )
+        self.due: dict[ServiceKey, _dt.datetime] = {}
+        self.wanted: dict[ServiceKey, float] = {}
+        self.demand = 0.0
+        self._queue = []
+        self._order = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.due)
+
+    def __contains__(self, key: ServiceKey) -> bool:
+        return key in self.due
+
+    @property
+    def stretch(self) -> float:
+        """Factor applied to every interval to keep demand within budget."""
+        return max(1.0, self.demand / self.requests_per_minute)
+
+    def _schedule(self, key: ServiceKey, when: _dt.datetime) -> None:
+        self.due[key] = when
+        heapq.heappush(self._queue, (when, next(self._order), key))
+
+    def add(self, key: ServiceKey, when: _dt.datetime | None = None) -> None:
+        """Start polling a service, first at ``when`` (default: now)."""
+        self._schedule(key, when or self.clock())
+
+    def _forget(self, key: ServiceKey) -> None:
+        interval = self.wanted.pop(key, None)
+        if interval is not None:
+            self.demand -= 60 / interval
+
+    def remove(self, key: ServiceKey) -> None:
+        del self.due[key]
+        self._forget(key)
+
+    def observe(self, key: ServiceKey, response) -> float | None:
+        """Schedule the next poll from a fresh response, returning the delay.
+
+        Services that have reached their destination are dropped.
+        """
+        now = self.clock()
+        interval = poll_interval(response, now, self.intervals)
+        self._forget(key)
+        if interval is None:
+            self.due.pop(key, None)
+            return None
+        self.wanted[key] = interval
+        self.demand += 60 / interval
+        delay = interval * self.stretch
+        self._schedule(key, now + _dt.timedelta(seconds=delay))
+        return delay
+
+    def pop(self) -> tuple[ServiceKey, float] | None:
+        """Take the next service to poll and the seconds to wait first.
+
+        Returns ``None`` when nothing is left to poll.
+        """
+        while self._queue:
+            when, _, key = heapq.heappop(self._queue)
+            if self.due.get(key) != when:
+                # Removed, or rescheduled since this entry was queued.
+                continue
+            wait = (when - self.clock()).total_seconds()
+            return key, max(wait, self.bucket.reserve(), 0.0)
+        return None
+
+    def run(self, fetch=None, on_response=None, sleep=time.sleep, **kwargs) -> None:
+        """Poll until every service has finished.
+
+        ``fetch(key)`` defaults to ``Service(*key, **kwargs).get()``; each
+        response is passed to ``on_response`` before scheduling the next
+        poll.  Failed polls are logged and retried after the last interval,
+        unless the API rejected the request, when the service is dropped.
+        """
+        if fetch is None:
+
+            def fetch(key):
+                return Service(*key, **kwargs).get()
+
+        while (entry := self.pop()) is not None:
+            key, wait = entry
+            if wait > 0:
+                sleep(wait)
+            try:
+                response = fetch(key)
+            except Exception as error:
+                if _permanent(error):
+                    logger.warning('Polling %s %s failed, dropping it: %s', *key, error)
+                    self.remove(key)
+                    continue
+                logger.exception('Polling %s %s failed', *key)
+                retry = self.wanted.get(key, self.intervals.running) * self.stretch
+                self._schedule(key, self.clock() + _dt.timedelta(seconds=retry))
+                continue
+            if on_response is not None:
+                on_response(response)
+            self.observe(key, response)
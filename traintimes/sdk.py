@@ -1,26 +1,30 @@
-import os
+import functools
+import json
+import time
 
 import requests
-from dotenv import load_dotenv
 from purl import Template
+from pydantic import ValidationError
 
+from .config import get_config
+from .lazy import LazyLocationResponse
 from .models import (
     LocationRequest,
     LocationResponse,
     ServiceRequest,
     ServiceResponse,
 )
+from .session import get_session
+from .watch import DEFAULT_INTERVAL, BoardDiff
 
 
 class ResponseError(Exception):
-    def __init__(self, message):
+    def __init__(self, message, status_code=None):
         self.message = message
+        self.status_code = status_code
         super().__init__(message)
 
 
-load_dotenv()
-
-
 class RTTBase:
     """Base Class for RealTimeTrains API
 
@@ -29,14 +33,30 @@ class RTTBase:
     Apply for API access at https://api.rtt.io/
     Set environ variable:
         export RTT_AUTH=user:password
+    or pass credentials to ``traintimes.configure(auth=...)``.
+
+    Requests are sent through a pooled, keep-alive ``requests.Session``.  By
+    default the session shared across the SDK is used (see
+    :mod:`traintimes.session`); pass ``session`` to use your own.  Likewise
+    pass ``config`` to override the process-wide :mod:`traintimes.config`,
+    whose ``api_root`` can point requests at a stand-in server instead.
     """
 
     # URI template language as per RFC6570
-    base_uri_template = 'https://api.rtt.io/api/{version}/{accept}'
-    auth = tuple(os.environ['RTT_AUTH'].split(':'))
+    base_uri_template = '/api/{version}/{accept}'
+
+    # Failures in transit, worth retrying under a ``retry_policy``.
+    transient_errors = (requests.ConnectionError, requests.Timeout)
 
-    def __init__(self, version='v1', accept='json'):
+    def __init__(self, version='v1', accept='json', session=None, config=None):
         self.context = {'version': version, 'accept': accept}
+        self.session = session if session is not None else get_session()
+        self.config = config if config is not None else get_config()
+        self.attempts = []
+
+    @property
+    def auth(self):
+        return self.config.get_auth()
 
     def add_to_context(self, key, value):
         self.context[key] = value
@@ -44,39 +64,217 @@ class RTTBase:
     @property
     def uri(self):
         uri_template = Template(self.base_uri_template + self.uri_template)
-        return uri_template.expand(self.context).as_string()
+        return self.config.api_root + uri_template.expand(self.context).as_string()
 
     def __repr__(self):
         return self.uri
 
-    def get(self):
-        response = requests.get(self.uri, auth=self.auth)
-        if not response.ok:
+    def get_json(self):
+        response = self.send()
+        return self.parse(
+            response.ok, response.status_code, response.reason, response.text
+        )
+
+    @property
+    def cache_rule(self):
+        """The cache policy rule covering this request, or ``None`` if uncached."""
+        policy = self.config.cache_policy
+        if policy is None or not hasattr(self.session, 'cache'):
+            return None
+        return policy.rule_for(self.request)
+
+    def send(self, headers=None):
+        """Make the HTTP request, as the config's policies allow.
+
+        Cached responses are returned without waiting for the rate limiter.
+        Transient failures are retried under the ``retry_policy``, recording
+        each attempt in ``attempts``.  ``headers`` are sent with every attempt.
+        """
+        rule = self.cache_rule
+        if rule is not None and self.config.rate_limiter is not None:
+            response = self.fetch(rule, headers, only_if_cached=True)
+            if response is not None:
+                return response
+        policy = self.config.retry_policy
+        if policy is None:
+            return self.attempt(rule, headers)
+        self.attempts = []
+        return policy.run(
+            functools.partial(self.attempt, rule, headers),
+            self.attempts,
+            self.transient_errors,
+        )
+
+    def attempt(self, rule=None, headers=None, timeout=None):
+        """Send the request once, within the rate limit if there is one.
+
+        Throttled responses are retried as the ``rate_limiter`` allows.
+        """
+        limiter = self.config.rate_limiter
+        if limiter is None:
+            return self.fetch(rule, headers, timeout=timeout)
+        retries = 0
+        while True:
+            limiter.acquire()
+            response = self.fetch(rule, headers, timeout=timeout)
+            if not limiter.should_retry(
+                response.status_code, response.headers, retries
+            ):
+                return response
+            retries += 1
+
+    def fetch(self, rule=None, headers=None, only_if_cached=False, timeout=None):
+        """Make a single HTTP request, cached under ``rule`` if given.
+
+        With ``only_if_cached`` nothing is sent: a cached response is returned
+        if there is one, otherwise ``None``.
+        """
+        headers = headers or None
+        if rule is None:
+            return self.session.get(
+                self.uri, auth=self.auth, headers=headers, timeout=timeout
+            )
+        policy = self.config.cache_policy
+        response = self.session.get(
+            self.uri,
+            auth=self.auth,
+            headers=headers,
+            timeout=timeout,
+            expire_after=policy.expire_after(rule),
+            only_if_cached=only_if_cached,
+        )
+        if only_if_cached and response.status_code == 504:
+            return None
+        policy.record(rule, getattr(response, 'from_cache', False))
+        return response
+
+    @staticmethod
+    def parse(ok, status_code, reason, text):
+        """Decode a raw API response, raising ``ResponseError`` on failure.
+
+        Transport agnostic, so the sync and async clients share one set of
+        error handling rules.
+        """
+        if not ok:
             try:
-                json_data = response.json()
+                json_data = json.loads(text)
             except ValueError:
-                raise ResponseError(response.reason)
+                raise ResponseError(reason, status_code)
             if 'error' in json_data:
                 raise ResponseError(
                     '{}: {}'.format(
                         json_data.get('errcode', '<no errcode>'), json_data['error']
-                    )
+                    ),
+                    status_code,
                 )
             # If we got here, response is not OK but no 'error' key in JSON
-            raise ResponseError(f'{response.status_code}: {response.reason}')
+            raise ResponseError(f'{status_code}: {reason}', status_code)
 
         try:
-            json_data = response.json()
+            json_data = json.loads(text)
         except ValueError:
-            raise ResponseError(f'{response.text=}')
+            raise ResponseError(f'response.text={text!r}', status_code)
         if 'error' in json_data:
             raise ResponseError(
                 '{}: {}'.format(
                     json_data.get('errcode', '<no errcode>'), json_data['error']
-                )
+                ),
+                status_code,
             )
         return json_data
 
+    def decode(self, ok, status_code, reason, content):
+        """Validate raw response bytes straight into ``response_model``.
+
+        Successful responses are parsed and validated in a single pass by
+        pydantic's JSON parser, without building an intermediate dict tree.
+        Only when that fails (an error envelope, invalid JSON or a non-OK
+        status) is the body decoded by :meth:`parse` to report the problem.
+        """
+        if ok:
+            try:
+                return self.response_model.model_validate_json(content)
+            except ValidationError:
+                text = content.decode('utf-8', errors='replace')
+                self.parse(ok, status_code, reason, text)
+                raise
+        self.parse(ok, status_code, reason, content.decode('utf-8', errors='replace'))
+
+    @staticmethod
+    def unpack(response):
+        """The ``(ok, status_code, reason, content)`` of a transport response."""
+        return response.ok, response.status_code, response.reason, response.content
+
+    def get(self):
+        """Fetch and validate the response into ``response_model``.
+
+        With a ``single_flight`` configured, concurrent calls for the same
+        URI share one upstream request and its parsed response.  A
+        ``station_index`` learns the locations in every response, and a
+        ``pattern_index`` indexes every service.
+        """
+        flight = self.config.single_flight
+        if flight is None:
+            response = self.load()
+        else:
+            response = flight.do(self.uri, self.load)
+        return self.observe(response)
+
+    def load(self):
+        """Send the request and validate the response.
+
+        With a ``revalidator`` configured the request is conditional, and an
+        unchanged response returns the previously parsed model.  With an
+        ``archive`` configured the response is recorded, unless it came from
+        the HTTP cache, or when replaying, read from the archive instead of
+        being requested.
+        """
+        if self.replaying:
+            return self.replay()
+        return self.resolve(self.send(self.conditional_headers()))
+
+    # The steps of ``load`` either side of the request, shared with the async
+    # client, which only awaits ``send`` in between.
+
+    @property
+    def replaying(self):
+        archive = self.config.archive
+        return archive is not None and archive.replay
+
+    def replay(self):
+        """The response recorded in the ``archive``, validated."""
+        record = self.config.archive.find(self)
+        return self.decode(record.ok, record.status_code, record.reason, record.content)
+
+    def conditional_headers(self):
+        """Headers making the request conditional, under a ``revalidator``."""
+        revalidator = self.config.revalidator
+        if revalidator is None:
+            return {}
+        return revalidator.conditional_headers(self.uri)
+
+    def resolve(self, response):
+        """Archive and validate a transport response, or reuse an unchanged one."""
+        ok, status_code, reason, content = self.unpack(response)
+        archive = self.config.archive
+        cached = getattr(response, 'from_cache', False)
+        if archive is not None and status_code != 304 and not cached:
+            archive.append(self, status_code, reason, content)
+        decode = functools.partial(self.decode, ok, status_code, reason, content)
+        revalidator = self.config.revalidator
+        if revalidator is None:
+            return decode()
+        return revalidator.resolve(
+            self.uri, ok, status_code, response.headers, content, decode
+        )
+
+    def observe(self, response):
+        """Feed a parsed response to the configured indexes, returning it."""
+        for index in (self.config.station_index, self.config.pattern_index):
+            if index is not None:
+                index.observe(response)
+        return response
+
 
 class Location(RTTBase):
     """Location List API
@@ -99,6 +297,7 @@ class Location(RTTBase):
     """
 
     uri_template = '/search/{station}{+tostation}{+date}{+time}{/arrivals}'
+    response_model = LocationResponse
 
     def __init__(self, station, to_station=None, when=None, arrivals=False, **kwargs):
         super(Location, self).__init__(**kwargs)
@@ -121,9 +320,31 @@ class Location(RTTBase):
         if self.request.arrivals:
             self.add_to_context('arrivals', 'arrivals')
 
-    def get(self):
-        json_data = super().get()
-        return LocationResponse.model_validate(json_data)
+    def get_lazy(self):
+        """Fetch the line-up, validating each service only when accessed.
+
+        See :class:`~traintimes.lazy.LazyLocationResponse`.  The raw JSON is
+        not a model, so unlike :meth:`get` this bypasses the configured
+        ``archive``, ``single_flight``, ``revalidator`` and the station and
+        pattern indexes.
+        """
+        return LazyLocationResponse.from_dict(self.get_json())
+
+    def watch(self, interval=DEFAULT_INTERVAL, polls=None, sleep=time.sleep):
+        """Poll the line-up every ``interval`` seconds, yielding what changed.
+
+        Yields :class:`~traintimes.watch.Change` events, starting with every
+        service on the first board as added.  Stops after ``polls`` polls, or
+        never if ``None``; errors from a poll are raised to the caller.
+        """
+        diff = BoardDiff()
+        poll = 0
+        while True:
+            poll += 1
+            yield from diff.update(self.get())
+            if poll == polls:
+                return
+            sleep(interval)
 
 
 class Service(RTTBase):
@@ -140,6 +361,7 @@ class Service(RTTBase):
     """
 
     uri_template = '/service{/service}{+date}'
+    response_model = ServiceResponse
 
     def __init__(self, service, date, **kwargs):
         super(Service, self).__init__(**kwargs)
@@ -152,7 +374,3 @@ class Service(RTTBase):
             'date',
             f"/{self.request.date:%Y/%m/%d}",
         )
-
-    def get(self):
-        json_data = super().get()
-        return ServiceResponse.model_validate(json_data)
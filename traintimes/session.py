@@ -0,0 +1,74 @@
+"""Shared HTTP session management.
+
+Every request made by the SDK goes through a :class:`requests.Session` so that
+TCP and TLS connections to api.rtt.io are pooled and kept alive between calls,
+rather than being set up afresh for each ``Location(...).get()``.
+
+A single module-level session is created lazily and shared by default.  Callers
+can replace it with :func:`set_session`, or pass their own session directly to
+:class:`~traintimes.sdk.Location` and :class:`~traintimes.sdk.Service`.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 16
+
+_lock = threading.Lock()
+_session: requests.Session | None = None
+
+
+def make_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = False,
+    session: requests.Session | None = None,
+) -> requests.Session:
+    """Build a keep-alive session with a sized connection pool.
+
+    ``pool_connections`` is the number of distinct hosts to keep pools for and
+    ``pool_maxsize`` the number of connections kept alive per host, which
+    bounds how many threads can share the session without opening throwaway
+    connections.  With ``pool_block`` set, threads wait for a free connection
+    instead of exceeding ``pool_maxsize``.
+
+    An existing ``session`` (for example a ``requests_cache.CachedSession``) may
+    be supplied to have the pooled adapters mounted on it.
+    """
+    if session is None:
+        session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the shared session, creating it on first use."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = make_session()
+        return _session
+
+
+def set_session(session: requests.Session | None) -> requests.Session | None:
+    """Replace the shared session, returning the previous one.
+
+    Passing ``None`` discards the shared session; a fresh one is created the
+    next time :func:`get_session` is called.  The previous session is not
+    closed, as other code may still hold a reference to it.
+    """
+    global _session
+    with _lock:
+        previous, _session = _session, session
+    return previous
@@ -0,0 +1,103 @@
+"""Coalesce concurrent identical requests into one upstream call.
+
+When many workers ask for the same live board at once, each would otherwise
+send its own request, and a response cache only helps once the first has
+completed.  With a :class:`SingleFlight` configured, callers whose request
+expands to the same URI while one is already in flight wait for it and share
+its parsed response instead::
+
+    traintimes.configure(single_flight=SingleFlight())
+    ...
+    flight = traintimes.get_config().single_flight
+    flight.stats.saved
+
+Threads and asyncio tasks are coalesced separately, as each waits in its own
+way.  Shared responses are the same model instance, so treat them as
+read-only.
+"""
+
+import asyncio
+import threading
+from dataclasses import dataclass, field
+
+
+@dataclass
+class FlightStats:
+    """Upstream calls made and calls saved by sharing them."""
+
+    calls: int = 0
+    saved: int = 0
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+@dataclass
+class SingleFlight:
+    """Run one call per key at a time, sharing its outcome with latecomers."""
+
+    stats: FlightStats = field(default_factory=FlightStats)
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+
+    def _count(self, leader: bool) -> None:
+        if leader:
+            self.stats.calls += 1
+        else:
+            self.stats.saved += 1
+
+    def do(self, key, fn):
+        """Return ``fn()``, or the result of the call already running for ``key``.
+
+        Exceptions are shared the same way.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            self._count(leader)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key, fn):
+        """Coroutine counterpart of :meth:`do`, for a coroutine function ``fn``.
+
+        The shared call runs as a task of its own, so a caller that is
+        cancelled while waiting does not cancel it for the others.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            task = self._tasks.get((loop, key))
+            leader = task is None
+            if leader:
+                task = self._tasks[(loop, key)] = loop.create_task(fn())
+                task.add_done_callback(lambda _: self._forget(loop, key))
+            self._count(leader)
+        return await asyncio.shield(task)
+
+    def _forget(self, loop, key) -> None:
+        with self._lock:
+            del self._tasks[(loop, key)]
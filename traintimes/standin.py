@@ -0,0 +1,442 @@
+"""A local stand-in for the RealTimeTrains API, for load testing.
+
+api.rtt.io cannot be load tested, and ``requests-mock`` never leaves the
+process.  :class:`StandIn` is a real HTTP server answering the routes that
+``Location`` and ``Service`` request, with recorded or synthetic payloads,
+and injects the behaviour worth measuring the SDK against: latency drawn from
+a distribution, server errors, error envelopes and rate limiting::
+
+    with StandIn(latency=lognormal(0.08, 0.5), error_rate=0.01, rate=20) as server:
+        config = Config(auth=('user', 'password'), api_root=server.url)
+        Location('CHX', config=config).get()
+
+Payloads come from ``responses``, keyed by request path (the URI without the
+API root), falling back to a synthetic board or service shaped by the route.
+The server can also be run on its own::
+
+    python -m traintimes.standin --port 8080 --latency lognormal:0.08:0.5 \\
+        --error-rate 0.01 --rate 20
+"""
+
+import argparse
+import collections
+import datetime as _dt
+import json
+import logging
+import math
+import random
+import re
+import string
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .ratelimit import TokenBucket
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BOARD_SIZE = 20
+DEFAULT_CALLING_POINTS = 12
+ERROR_STATUSES = (500, 502, 503)
+OPERATORS = (('SE', 'Southeastern'), ('GX', 'Gatwick Express'), ('TL', 'Thameslink'))
+DISPLAY_AS = ('CALL',) * 8 + ('PASS', 'CANCELLED_CALL')
+
+SEARCH_ROUTE = re.compile(
+    r'/api/v1/json/search/(?P<station>[^/]+)'
+    r'(?:/to/(?P<to_station>[^/]+))?'
+    r'(?:/(?P<year>\d{4})/(?P<month>\d{2})/(?P<day>\d{2})(?:/(?P<time>\d{4}))?)?'
+    r'(?P<arrivals>/arrivals)?'
+)
+SERVICE_ROUTE = re.compile(
+    r'/api/v1/json/service/(?P<service_uid>[^/]+)'
+    r'/(?P<year>\d{4})/(?P<month>\d{2})/(?P<day>\d{2})'
+)
+
+
+def fixed(seconds: float):
+    """Latency of exactly ``seconds``."""
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float):
+    """Latency spread evenly between ``low`` and ``high`` seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float):
+    """Long-tailed latency around ``median`` seconds, as real APIs show."""
+    return lambda rng: rng.lognormvariate(math.log(median), sigma)
+
+
+def empirical(samples):
+    """Latency drawn from recorded ``samples``, in seconds."""
+    samples = list(samples)
+    return lambda rng: rng.choice(samples)
+
+
+def parse_latency(spec: str):
+    """A latency distribution from ``name:arg:...``, e.g. ``lognormal:0.08:0.5``."""
+    name, *args = spec.split(':')
+    distributions = {'fixed': fixed, 'uniform': uniform, 'lognormal': lognormal}
+    if name not in distributions:
+        raise ValueError(f'unknown latency distribution {name!r}')
+    return distributions[name](*map(float, args))
+
+
+@dataclass(frozen=True)
+class Route:
+    """What a request path asks for."""
+
+    endpoint: str
+    date: _dt.date | None = None
+    station: str | None = None
+    to_station: str | None = None
+    time: str | None = None
+    arrivals: bool = False
+    service_uid: str | None = None
+
+
+def parse_route(path: str) -> Route | None:
+    """The route a request path matches, or ``None`` for an unknown one."""
+    path = path.split('?', 1)[0]
+    match = SEARCH_ROUTE.fullmatch(path) or SERVICE_ROUTE.fullmatch(path)
+    if match is None:
+        return None
+    fields = match.groupdict()
+    date = None
+    if fields['year'] is not None:
+        date = _dt.date(int(fields['year']), int(fields['month']), int(fields['day']))
+    if match.re is SERVICE_ROUTE:
+        return Route('service', date, service_uid=fields['service_uid'])
+    return Route(
+        'search',
+        date,
+        station=fields['station'],
+        to_station=fields['to_station'],
+        time=fields['time'],
+        arrivals=fields['arrivals'] is not None,
+    )
+
+
+def _station(index: int) -> dict:
+    """Synthetic station ``index``, with a TIPLOC and CRS code of its own."""
+    letters = string.ascii_uppercase
+    crs = ''.join(letters[index // 26**power % 26] for power in (2, 1, 0))
+    return {'tiploc': f'TIPL{index:03d}', 'crs': crs, 'description': f'Station {index}'}
+
+
+def _place(code: str) -> dict:
+    """The station a route names by ``code``."""
+    code = code.upper()
+    return {'tiploc': code, 'crs': code[:3], 'description': code.title()}
+
+
+def _hhmm(minutes: int) -> str:
+    minutes %= 24 * 60
+    return f'{minutes // 60:02d}{minutes % 60:02d}'
+
+
+def _pair(place: dict, minutes: int) -> dict:
+    return {
+        'tiploc': place['tiploc'],
+        'description': place['description'],
+        'workingTime': _hhmm(minutes) + '00',
+        'publicTime': _hhmm(minutes),
+    }
+
+
+def _event(rng, place: dict, minutes: int, origin: dict, destination: dict) -> dict:
+    """One calling point, with realtime fields filled in as a running train."""
+    lateness = rng.choice([0, 0, 0, 1, 2, 5, 12])
+    event = {
+        'realtimeActivated': True,
+        **place,
+        'wttBookedArrival': _hhmm(minutes) + '00',
+        'wttBookedDeparture': _hhmm(minutes + 1) + '30',
+        'gbttBookedArrival': _hhmm(minutes),
+        'gbttBookedDeparture': _hhmm(minutes + 1),
+        'origin': [origin],
+        'destination': [destination],
+        'isCall': True,
+        'isPublicCall': True,
+        'realtimeArrival': _hhmm(minutes + lateness),
+        'realtimeArrivalActual': lateness < 5,
+        'realtimeGbttArrivalLateness': lateness or None,
+        'realtimeDeparture': _hhmm(minutes + 1 + lateness),
+        'realtimeDepartureActual': lateness < 5,
+        'realtimeGbttDepartureLateness': lateness or None,
+        'platform': str(rng.randint(1, 12)),
+        'platformConfirmed': rng.random() < 0.7,
+        'platformChanged': rng.random() < 0.1,
+        'displayAs': rng.choice(DISPLAY_AS),
+    }
+    if rng.random() < 0.2:
+        event['serviceLocation'] = rng.choice(['APPR_STAT', 'AT_PLAT', 'DEP_READY'])
+    return {key: value for key, value in event.items() if value is not None}
+
+
+def _service_uid(station: str, minutes: int) -> str:
+    """A UID for the service at ``station`` at ``minutes`` past midnight.
+
+    Windows that overlap share the services they have in common, and
+    different stations and times of day get different services.
+    """
+    digest = zlib.crc32(station.encode())
+    number = digest // 26 % 69 * 24 * 60 + minutes % (24 * 60)
+    return f'{chr(ord("A") + digest % 26)}{number:05d}'
+
+
+def synthetic_board(route: Route, rng, size: int = DEFAULT_BOARD_SIZE) -> dict:
+    """A plausible line-up for a search route."""
+    date = route.date or _dt.date.today()
+    start = int(route.time[:2]) * 60 + int(route.time[2:]) if route.time else 6 * 60
+    place = _place(route.station)
+    services = []
+    for number in range(size):
+        minutes = start + number * 3
+        origin = _pair(_station(rng.randint(100, 199)), minutes - 30)
+        destination = _pair(
+            _place(route.to_station)
+            if route.to_station
+            else _station(rng.randint(200, 299)),
+            minutes + 45,
+        )
+        code, name = rng.choice(OPERATORS)
+        identity = f'1A{number % 100:02d}'
+        services.append(
+            {
+                'locationDetail': _event(rng, place, minutes, origin, destination),
+                'serviceUid': _service_uid(place['tiploc'], minutes),
+                'runDate': date.isoformat(),
+                'trainIdentity': identity,
+                'runningIdentity': identity,
+                'atocCode': code,
+                'atocName': name,
+                'serviceType': 'train',
+                'isPassenger': True,
+            }
+        )
+    return {
+        'location': {
+            'name': place['description'],
+            'crs': place['crs'],
+            'tiploc': place['tiploc'],
+        },
+        'filter': None,
+        'services': services,
+    }
+
+
+def synthetic_service(
+    route: Route, rng, calling_points: int = DEFAULT_CALLING_POINTS
+) -> dict:
+    """A plausible calling pattern for a service route, through distinct stations."""
+    start = 6 * 60
+    stops = [_station(index) for index in range(calling_points)]
+    origin = _pair(stops[0], start)
+    destination = _pair(stops[-1], start + (calling_points - 1) * 3)
+    code, name = rng.choice(OPERATORS)
+    return {
+        'serviceUid': route.service_uid,
+        'runDate': route.date.isoformat(),
+        'serviceType': 'train',
+        'isPassenger': True,
+        'trainIdentity': '1A01',
+        'runningIdentity': '1A01',
+        'powerType': 'EMU',
+        'trainClass': 'S',
+        'atocCode': code,
+        'atocName': name,
+        'performanceMonitored': True,
+        'realtimeActivated': True,
+        'origin': [origin],
+        'destination': [destination],
+        'locations': [
+            _event(rng, stop, start + index * 3, origin, destination)
+            for index, stop in enumerate(stops)
+        ],
+    }
+
+
+def _envelope(message: str, errcode: str | None = None) -> bytes:
+    body = {'error': message}
+    if errcode is not None:
+        body['errcode'] = errcode
+    return json.dumps(body).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        status, headers, body = self.server.standin.respond(
+            self.path, self.headers.get('Authorization')
+        )
+        self.send_response(status)
+        headers = {'Content-Type': 'application/json', **headers}
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+class StandIn:
+    """A local HTTP server answering like the RealTimeTrains API.
+
+    ``latency`` is a distribution from :func:`fixed`, :func:`uniform`,
+    :func:`lognormal` or :func:`empirical`, applied to every response.  A
+    fraction ``error_rate`` of requests fail with one of ``error_statuses``
+    and a fraction ``envelope_rate`` succeed with an error envelope instead
+    of a payload.  With ``rate`` set, requests beyond ``rate`` a second
+    (bursting to ``burst``) are answered ``429`` with ``Retry-After``.
+
+    Every response's status is counted in :attr:`stats`.
+    """
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        responses: dict[str, object] | None = None,
+        latency=None,
+        error_rate: float = 0.0,
+        error_statuses: tuple[int, ...] = ERROR_STATUSES,
+        envelope_rate: float = 0.0,
+        rate: float | None = None,
+        burst: float = 1,
+        require_auth: bool = True,
+        seed: int | None = None,
+        sleep=time.sleep,
+    ):
+        self.responses = dict(responses or {})
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.envelope_rate = envelope_rate
+        self.bucket = None if rate is None else TokenBucket(rate, burst)
+        self.require_auth = require_auth
+        self.sleep = sleep
+        self.stats: collections.Counter[int] = collections.Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.standin = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """The API root to configure the SDK with."""
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def payload(self, path: str, route: Route) -> bytes:
+        """The body served for a route: recorded if there is one, else synthetic."""
+        recorded = self.responses.get(path)
+        if isinstance(recorded, bytes):
+            return recorded
+        if recorded is None:
+            rng = random.Random(path)
+            if route.endpoint == 'search':
+                recorded = synthetic_board(route, rng)
+            else:
+                recorded = synthetic_service(route, rng)
+        return json.dumps(recorded).encode()
+
+    def _answer(self, path: str, authorization: str | None):
+        if self.require_auth and not authorization:
+            return 401, {}, _envelope('Authentication required', '401')
+        if self.bucket is not None:
+            wait = self.bucket.try_take()
+            if wait > 0:
+                headers = {'Retry-After': str(math.ceil(wait))}
+                return 429, headers, _envelope('Too many requests', '429')
+        route = parse_route(path)
+        if route is None:
+            return 404, {}, _envelope('Unknown endpoint', '404')
+        draw = self._random()
+        if draw < self.error_rate:
+            with self._lock:
+                status = self._rng.choice(self.error_statuses)
+            return status, {'Content-Type': 'text/plain'}, b'Server error'
+        if draw < self.error_rate + self.envelope_rate:
+            return 200, {}, _envelope('Temporary failure, please retry')
+        return 200, {}, self.payload(path, route)
+
+    def respond(self, path: str, authorization: str | None = None):
+        """``(status, headers, body)`` for a ``GET`` of ``path``."""
+        status, headers, body = self._answer(path, authorization)
+        if self.latency is not None:
+            with self._lock:
+                delay = self.latency(self._rng)
+            self.sleep(max(delay, 0))
+        with self._lock:
+            self.stats[status] += 1
+        return status, headers, body
+
+    def start(self) -> 'StandIn':
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'StandIn':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=parse_latency, help='e.g. fixed:0.05')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--envelope-rate', type=float, default=0.0)
+    parser.add_argument('--rate', type=float, help='requests a second')
+    parser.add_argument('--burst', type=float, default=1)
+    parser.add_argument('--no-auth', action='store_true')
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    server = StandIn(
+        args.host,
+        args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        envelope_rate=args.envelope_rate,
+        rate=args.rate,
+        burst=args.burst,
+        require_auth=not args.no_auth,
+        seed=args.seed,
+    )
+    print(f'Serving the RTT API on {server.url}')
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
@@ -0,0 +1,238 @@
+"""An index of stations, learnt from the responses the SDK parses.
+
+Responses name locations by TIPLOC, CRS code and description, but nothing
+relates them: scripts hard-code lists of TIPLOCs and compare strings.  A
+:class:`StationIndex` records every location seen and maps between them::
+
+    index = StationIndex.load('stations.json')   # or StationIndex()
+    traintimes.configure(station_index=index)      # learn from every response
+    ...
+    index.tiplocs('CHX')                           # ['CHRX']
+    index.crs('CHRX')                              # 'CHX'
+    index.search('London B')                       # London Blackfriars, Bridge...
+    index.save('stations.json')
+
+Each TIPLOC gets a stable small-integer id, in the order first seen and kept
+when saved and loaded, so columns of TIPLOCs can be held as ints
+(:meth:`StationIndex.encode`).  A CRS code groups the TIPLOCs of one
+station.  Lookups are dict based; prefix search bisects a sorted list of
+names and codes.
+"""
+
+import bisect
+import json
+import os
+import threading
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+
+from .models import (
+    LocationEvent,
+    LocationResponse,
+    Pair,
+    ServiceResponse,
+    StationSummary,
+)
+
+
+MISSING_ID = -1
+
+
+@dataclass(frozen=True)
+class Station:
+    """A location known by its TIPLOC, with its CRS code and name if seen."""
+
+    id: int
+    tiploc: str
+    crs: str | None = None
+    name: str | None = None
+
+
+def _fold(text: str) -> str:
+    return text.casefold()
+
+
+class StationIndex:
+    """TIPLOCs, CRS codes and names of every location observed."""
+
+    def __init__(self, stations: Iterable[Station] = ()):
+        self.stations: list[Station] = []
+        self.by_tiploc: dict[str, int] = {}
+        self.by_crs: dict[str, list[int]] = {}
+        self.by_name: dict[str, list[int]] = {}
+        # Sorted (folded key, id) pairs for prefix search.
+        self._keys: list[tuple[str, int]] = []
+        self._last = None
+        self._lock = threading.Lock()
+        for station in stations:
+            if station.id != len(self.stations):
+                raise ValueError(f'station ids must run from 0, got {station.id}')
+            self._insert(station)
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def __iter__(self):
+        return iter(list(self.stations))
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.by_tiploc or code in self.by_crs
+
+    def _index_key(self, key: str, id: int) -> None:
+        bisect.insort(self._keys, (_fold(key), id))
+
+    def _insert(self, station: Station) -> None:
+        self.stations.append(station)
+        self.by_tiploc[station.tiploc] = station.id
+        self._index_key(station.tiploc, station.id)
+        self._learn(station, station.crs, station.name)
+
+    def _learn(self, station: Station, crs: str | None, name: str | None) -> None:
+        if crs is not None:
+            self.by_crs.setdefault(crs, []).append(station.id)
+            self._index_key(crs, station.id)
+        if name is not None:
+            self.by_name.setdefault(_fold(name), []).append(station.id)
+            self._index_key(name, station.id)
+
+    def add(self, tiploc: str, crs: str | None = None, name: str | None = None) -> int:
+        """Record a location, returning its id.
+
+        A CRS code or name already known for the TIPLOC is kept; one seen
+        for the first time is added.
+        """
+        with self._lock:
+            id = self.by_tiploc.get(tiploc)
+            if id is None:
+                self._insert(Station(len(self.stations), tiploc, crs, name))
+                return len(self.stations) - 1
+            station = self.stations[id]
+            crs = crs if station.crs is None else None
+            name = name if station.name is None else None
+            if crs is not None or name is not None:
+                self.stations[id] = replace(
+                    station, crs=station.crs or crs, name=station.name or name
+                )
+                self._learn(station, crs, name)
+            return id
+
+    def _add_event(self, event: LocationEvent) -> None:
+        self.add(event.tiploc, event.crs, event.description)
+        self._add_pairs(event.origin)
+        self._add_pairs(event.destination)
+
+    def _add_pairs(self, pairs: list[Pair] | None) -> None:
+        for pair in pairs or ():
+            self.add(pair.tiploc, name=pair.description)
+
+    def _add_summary(self, summary: StationSummary | None) -> None:
+        if summary is not None and summary.tiploc is not None:
+            self.add(summary.tiploc, summary.crs, summary.name)
+
+    def observe(self, response: LocationResponse | ServiceResponse) -> None:
+        """Learn every location in a parsed response."""
+        if response is self._last:
+            # The same model again, from a revalidated or coalesced request.
+            return
+        self._last = response
+        if isinstance(response, ServiceResponse):
+            self._add_pairs(response.origin)
+            self._add_pairs(response.destination)
+            for event in response.locations:
+                self._add_event(event)
+            return
+        self._add_summary(response.location)
+        if response.filter is not None:
+            self._add_summary(response.filter.from_)
+            self._add_summary(response.filter.to)
+        for service in response.services:
+            self._add_event(service.location_detail)
+            self._add_pairs(service.origin)
+            self._add_pairs(service.destination)
+
+    def get(self, tiploc: str) -> Station | None:
+        id = self.by_tiploc.get(tiploc)
+        return None if id is None else self.stations[id]
+
+    def __getitem__(self, id: int) -> Station:
+        return self.stations[id]
+
+    def id(self, tiploc: str) -> int | None:
+        return self.by_tiploc.get(tiploc)
+
+    def ids(self, code: str) -> list[int]:
+        """Ids of the TIPLOCs at a CRS code, or of the TIPLOC ``code``."""
+        if code in self.by_crs:
+            return list(self.by_crs[code])
+        id = self.by_tiploc.get(code)
+        return [] if id is None else [id]
+
+    def tiplocs(self, crs: str) -> list[str]:
+        return [self.stations[id].tiploc for id in self.by_crs.get(crs, ())]
+
+    def crs(self, tiploc: str) -> str | None:
+        station = self.get(tiploc)
+        return None if station is None else station.crs
+
+    def name(self, code: str) -> str | None:
+        """The name of a TIPLOC or CRS code, if one has been seen."""
+        for id in self.ids(code):
+            if self.stations[id].name is not None:
+                return self.stations[id].name
+        return None
+
+    def named(self, name: str) -> list[Station]:
+        """Stations with exactly this name, ignoring case."""
+        return [self.stations[id] for id in self.by_name.get(_fold(name), ())]
+
+    def search(self, prefix: str, limit: int | None = None) -> list[Station]:
+        """Stations whose name, CRS or TIPLOC starts with ``prefix``, ignoring case.
+
+        Results are in order of the matching key.
+        """
+        prefix = _fold(prefix)
+        found: dict[int, Station] = {}
+        position = bisect.bisect_left(self._keys, (prefix,))
+        while position < len(self._keys) and len(found) != limit:
+            key, id = self._keys[position]
+            if not key.startswith(prefix):
+                break
+            found.setdefault(id, self.stations[id])
+            position += 1
+        return list(found.values())
+
+    def encode(self, tiplocs: Iterable[str | None]) -> array:
+        """TIPLOCs as an ``int32`` array of ids, adding any not yet known.
+
+        ``None`` becomes :data:`MISSING_ID`.
+        """
+        return array(
+            'i',
+            (MISSING_ID if tiploc is None else self.add(tiploc) for tiploc in tiplocs),
+        )
+
+    def decode(self, ids: Iterable[int]) -> list[str | None]:
+        return [None if id == MISSING_ID else self.stations[id].tiploc for id in ids]
+
+    def save(self, path: str) -> None:
+        """Write the index to ``path`` as JSON, replacing it atomically."""
+        stations = [
+            [station.tiploc, station.crs, station.name] for station in self.stations
+        ]
+        partial = f'{path}.tmp'
+        with open(partial, 'w') as f:
+            json.dump({'stations': stations}, f)
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'StationIndex':
+        """Read an index saved with :meth:`save`, or an empty one if absent."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            saved = json.load(f)
+        return cls(
+            Station(id, tiploc, crs, name)
+            for id, (tiploc, crs, name) in enumerate(saved['stations'])
+        )
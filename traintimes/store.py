@@ -0,0 +1,266 @@
+"""A columnar, date-partitioned on-disk store of calling points.
+
+Reloading months of ``ServiceResponse`` JSON means parsing and validating it
+all again.  :class:`ColumnStore` writes the columns of
+:mod:`traintimes.columns` to disk once, one directory per run date, and
+reads them back through memory maps: no JSON is parsed and no model is
+built, and only the pages actually touched are loaded::
+
+    store = ColumnStore('history')
+    store.write(services)
+    columns = store.read(date(2025, 10, 1), date(2025, 10, 31), station='HIB')
+    DelayAnalysis(columns).summary('operator')
+
+Layout::
+
+    history/
+        2025-10-16/
+            part-000001/
+                run_date.i32  booked_arrival.i32  ...  display_as.i8
+                tiploc.codes  tiploc.dict  crs.codes  crs.dict  ...
+
+Numeric columns are raw arrays in the machine's byte order, with
+:data:`~traintimes.columns.MISSING` for absent values.  Text columns are
+dictionary encoded: ``.codes`` holds an ``int32`` index into the strings in
+``.dict``, a JSON array, or ``-1`` for ``None``.  Each :meth:`~ColumnStore.write`
+adds a new part to every date it covers, renamed into place once complete,
+so readers never see a partial part.
+
+A station filter selects whole services: every calling point of each
+service calling there, so the analytics see the same services they would
+unfiltered.  It is answered per part by looking the station up in the small
+dictionaries and scanning the codes, so memory use depends on the rows
+selected, not on the size of the store.
+"""
+
+import datetime as _dt
+import json
+import mmap
+import os
+import threading
+from array import array
+from collections.abc import Iterable, Iterator
+
+from .columns import (
+    INT_COLUMNS,
+    TEXT_COLUMNS,
+    Columns,
+    batch_columns,
+    empty_columns,
+)
+from .models import LocationResponse, ServiceResponse
+
+
+MISSING_CODE = -1
+PART_PREFIX = 'part-'
+
+# Column name to (file suffix, array typecode).
+NUMERIC_FILES = {name: ('i32', 'i') for name in INT_COLUMNS}
+NUMERIC_FILES['display_as'] = ('i8', 'b')
+
+
+def _encode(values: list[str | None]) -> tuple[array, list[str]]:
+    strings: dict[str, int] = {}
+    codes = array('i')
+    for value in values:
+        if value is None:
+            codes.append(MISSING_CODE)
+        else:
+            codes.append(strings.setdefault(value, len(strings)))
+    return codes, list(strings)
+
+
+def _split_by_date(columns: Columns) -> dict[int, list[int]]:
+    rows: dict[int, list[int]] = {}
+    for row, run_date in enumerate(columns['run_date']):
+        rows.setdefault(run_date, []).append(row)
+    return rows
+
+
+def _take(columns: Columns, rows: list[int]) -> Columns:
+    taken = empty_columns()
+    for name, values in columns.items():
+        taken[name].extend(values[row] for row in rows)
+    return taken
+
+
+class Part:
+    """One memory-mapped part of a date partition.
+
+    Columns are mapped on first access and stay mapped until :meth:`close`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._maps: dict[str, tuple[mmap.mmap, memoryview, memoryview]] = {}
+        self._dictionaries: dict[str, list[str]] = {}
+
+    def __enter__(self) -> 'Part':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _view(self, filename: str, typecode: str) -> memoryview:
+        if filename not in self._maps:
+            with open(os.path.join(self.path, filename), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            raw = memoryview(mapped)
+            self._maps[filename] = (mapped, raw, raw.cast(typecode))
+        return self._maps[filename][2]
+
+    def __len__(self) -> int:
+        return len(self.codes('service_uid'))
+
+    def numeric(self, name: str) -> memoryview:
+        """A numeric column, as a read-only view of the mapped file."""
+        suffix, typecode = NUMERIC_FILES[name]
+        return self._view(f'{name}.{suffix}', typecode)
+
+    def codes(self, name: str) -> memoryview:
+        """The dictionary codes of a text column."""
+        return self._view(f'{name}.codes', 'i')
+
+    def dictionary(self, name: str) -> list[str]:
+        """The distinct strings of a text column, indexed by code."""
+        if name not in self._dictionaries:
+            with open(os.path.join(self.path, f'{name}.dict'), encoding='utf-8') as f:
+                self._dictionaries[name] = json.load(f)
+        return self._dictionaries[name]
+
+    def rows_at(self, station: str) -> list[int]:
+        """Rows calling at a station, by TIPLOC or CRS."""
+        wanted = set()
+        for name in ('tiploc', 'crs'):
+            dictionary = self.dictionary(name)
+            if station in dictionary:
+                wanted.add((name, dictionary.index(station)))
+        rows = set()
+        for name, code in wanted:
+            rows.update(
+                row for row, value in enumerate(self.codes(name)) if value == code
+            )
+        return sorted(rows)
+
+    def services_at(self, station: str) -> list[int]:
+        """Every row of the services calling at a station."""
+        # A part holds one run date, so the UID alone identifies a service.
+        codes = self.codes('service_uid')
+        wanted = {codes[row] for row in self.rows_at(station)}
+        return [row for row, code in enumerate(codes) if code in wanted]
+
+    def select(self, rows: Iterable[int] | None = None) -> Columns:
+        """Copy ``rows`` (default: all) out into in-memory columns."""
+        whole = rows is None
+        rows = range(len(self)) if whole else list(rows)
+        columns = empty_columns()
+        for name in NUMERIC_FILES:
+            view = self.numeric(name)
+            if whole:
+                columns[name].frombytes(view.tobytes())
+            else:
+                columns[name].extend(view[row] for row in rows)
+        for name in TEXT_COLUMNS:
+            codes = self.codes(name)
+            dictionary = self.dictionary(name)
+            columns[name].extend(
+                None if codes[row] == MISSING_CODE else dictionary[codes[row]]
+                for row in rows
+            )
+        return columns
+
+    def close(self) -> None:
+        for mapped, raw, view in self._maps.values():
+            view.release()
+            raw.release()
+            mapped.close()
+        self._maps = {}
+
+
+class ColumnStore:
+    """Calling point columns on disk under ``root``, partitioned by run date."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def partitions(self) -> list[_dt.date]:
+        """The run dates stored, in order."""
+        return sorted(
+            _dt.date.fromisoformat(name)
+            for name in os.listdir(self.root)
+            if not name.startswith('.')
+        )
+
+    def _partition(self, date: _dt.date) -> str:
+        return os.path.join(self.root, date.isoformat())
+
+    def part_paths(self, date: _dt.date) -> list[str]:
+        directory = self._partition(date)
+        if not os.path.isdir(directory):
+            return []
+        return [
+            os.path.join(directory, name)
+            for name in sorted(os.listdir(directory))
+            if name.startswith(PART_PREFIX)
+        ]
+
+    def _write_part(self, date: _dt.date, columns: Columns) -> str:
+        directory = self._partition(date)
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            number = len(self.part_paths(date)) + 1
+            final = os.path.join(directory, f'{PART_PREFIX}{number:06d}')
+            partial = os.path.join(directory, f'.{PART_PREFIX}{number:06d}.tmp')
+            os.makedirs(partial)
+            for name, (suffix, _) in NUMERIC_FILES.items():
+                with open(os.path.join(partial, f'{name}.{suffix}'), 'wb') as f:
+                    columns[name].tofile(f)
+            for name in TEXT_COLUMNS:
+                codes, strings = _encode(columns[name])
+                with open(os.path.join(partial, f'{name}.codes'), 'wb') as f:
+                    codes.tofile(f)
+                with open(
+                    os.path.join(partial, f'{name}.dict'), 'w', encoding='utf-8'
+                ) as f:
+                    json.dump(strings, f)
+            os.replace(partial, final)
+        return final
+
+    def write(self, responses: Iterable[LocationResponse | ServiceResponse]) -> int:
+        """Store the calling points of ``responses``, returning the row count."""
+        columns = batch_columns(responses)
+        for ordinal, rows in sorted(_split_by_date(columns).items()):
+            self._write_part(_dt.date.fromordinal(ordinal), _take(columns, rows))
+        return len(columns['run_date'])
+
+    def parts(self, start: _dt.date, end: _dt.date | None = None) -> Iterator[Part]:
+        """Each part with a run date from ``start`` to ``end`` inclusive.
+
+        Every part is closed once the iteration moves past it.
+        """
+        end = start if end is None else end
+        for date in self.partitions():
+            if start <= date <= end:
+                for path in self.part_paths(date):
+                    with Part(path) as part:
+                        yield part
+
+    def read(
+        self,
+        start: _dt.date,
+        end: _dt.date | None = None,
+        station: str | None = None,
+    ) -> Columns:
+        """Rows from ``start`` to ``end`` inclusive, optionally at one station.
+
+        ``station`` matches either the TIPLOC or the CRS code, and selects
+        every row of the services calling there, not just the calls there.
+        """
+        columns = empty_columns()
+        for part in self.parts(start, end):
+            rows = None if station is None else part.services_at(station)
+            for name, values in part.select(rows).items():
+                columns[name].extend(values)
+        return columns
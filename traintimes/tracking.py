@@ -0,0 +1,177 @@
+"""Keep the latest state of many services, applying each fetch as a diff.
+
+Re-fetching ``Service(uid, date)`` and re-walking every location to find out
+what changed (or where a station falls in the calling pattern) costs a scan
+per question.  A :class:`ServiceTracker` holds one :class:`TrackedService`
+per ``(service_uid, run_date)``; each new response only replaces the events
+that changed, and station lookups go through an index::
+
+    tracker = ServiceTracker()
+    tracker.refresh('W12345', date)   # or tracker.update(service_response)
+    tracked = tracker[('W12345', date)]
+    tracked.current                    # last calling point with an actual time
+    tracked.lateness_at('HIB')         # minutes late there, or None
+
+Each tracked service keeps its last ``history`` responses, so memory stays
+bounded however long it is followed.
+"""
+
+import datetime as _dt
+from collections import deque
+from dataclasses import dataclass
+
+from .models import LocationEvent, ServiceResponse
+from .sdk import Service
+
+
+DEFAULT_HISTORY = 10
+
+ServiceKey = tuple[str, _dt.date]
+
+
+@dataclass(frozen=True)
+class EventChange:
+    """A calling point whose details changed between two fetches."""
+
+    position: int
+    old: LocationEvent | None
+    new: LocationEvent
+
+
+def has_actual(event: LocationEvent) -> bool:
+    """Whether the train has actually arrived at, departed or passed ``event``."""
+    return bool(
+        event.realtime_arrival_actual
+        or event.realtime_departure_actual
+        or event.realtime_pass_actual
+    )
+
+
+def event_lateness(event: LocationEvent) -> int | None:
+    """Public lateness at ``event``: the departure's if known, else the arrival's."""
+    if event.realtime_gbtt_departure_lateness is not None:
+        return event.realtime_gbtt_departure_lateness
+    return event.realtime_gbtt_arrival_lateness
+
+
+class TrackedService:
+    """The latest known state of one service."""
+
+    def __init__(self, key: ServiceKey, history: int = DEFAULT_HISTORY):
+        self.key = key
+        self.history: deque[ServiceResponse] = deque(maxlen=history)
+        self.locations: list[LocationEvent] = []
+        self.positions: dict[str, int] = {}
+        self.reached = -1
+
+    @property
+    def response(self) -> ServiceResponse:
+        return self.history[-1]
+
+    def _rebuild(self, locations: list[LocationEvent]) -> list[EventChange]:
+        self.locations = list(locations)
+        self.positions = {}
+        self.reached = -1
+        for position, event in enumerate(self.locations):
+            # A station called at twice (a loop) is indexed by its first call.
+            self.positions.setdefault(event.tiploc, position)
+            if event.crs is not None:
+                self.positions.setdefault(event.crs, position)
+            if has_actual(event):
+                self.reached = position
+        return [
+            EventChange(position, None, event)
+            for position, event in enumerate(self.locations)
+        ]
+
+    def apply(self, response: ServiceResponse) -> list[EventChange]:
+        """Bring the state up to date with ``response``, returning what changed.
+
+        When the calling pattern itself changed (calls added, removed or
+        reordered) every event is reported and the index is rebuilt.
+        """
+        if self.history and response is self.history[-1]:
+            # Revalidated into the same model: nothing can have changed.
+            return []
+        self.history.append(response)
+        locations = response.locations
+        if [event.tiploc for event in locations] != [
+            event.tiploc for event in self.locations
+        ]:
+            return self._rebuild(locations)
+        changes = []
+        for position, (old, new) in enumerate(zip(self.locations, locations)):
+            if old != new:
+                self.locations[position] = new
+                changes.append(EventChange(position, old, new))
+                if has_actual(new) and position > self.reached:
+                    self.reached = position
+        return changes
+
+    def position(self, station: str) -> int | None:
+        """Index of the calling point at a CRS or TIPLOC, or ``None``."""
+        return self.positions.get(station)
+
+    def event_at(self, station: str) -> LocationEvent | None:
+        position = self.positions.get(station)
+        return None if position is None else self.locations[position]
+
+    def lateness_at(self, station: str) -> int | None:
+        """Minutes late at ``station`` (negative if early), if reported."""
+        event = self.event_at(station)
+        return None if event is None else event_lateness(event)
+
+    @property
+    def current(self) -> LocationEvent | None:
+        """The last calling point reached, or ``None`` if not yet started."""
+        return self.locations[self.reached] if self.reached >= 0 else None
+
+    @property
+    def lateness(self) -> int | None:
+        """Lateness at the last calling point reached."""
+        return None if self.current is None else event_lateness(self.current)
+
+    @property
+    def origin(self) -> LocationEvent | None:
+        return self.locations[0] if self.locations else None
+
+    @property
+    def destination(self) -> LocationEvent | None:
+        return self.locations[-1] if self.locations else None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the train has reached its final calling point."""
+        return bool(self.locations) and self.reached == len(self.locations) - 1
+
+
+class ServiceTracker:
+    """The latest state of many services, keyed by ``(service_uid, run_date)``."""
+
+    def __init__(self, history: int = DEFAULT_HISTORY):
+        self.history = history
+        self.services: dict[ServiceKey, TrackedService] = {}
+
+    def __len__(self) -> int:
+        return len(self.services)
+
+    def __contains__(self, key: ServiceKey) -> bool:
+        return key in self.services
+
+    def __getitem__(self, key: ServiceKey) -> TrackedService:
+        return self.services[key]
+
+    def update(self, response: ServiceResponse) -> list[EventChange]:
+        """Apply a freshly fetched ``response``, tracking it if new."""
+        key = (response.service_uid, response.run_date)
+        tracked = self.services.get(key)
+        if tracked is None:
+            tracked = self.services[key] = TrackedService(key, self.history)
+        return tracked.apply(response)
+
+    def refresh(self, service_uid: str, date: _dt.date, **kwargs) -> list[EventChange]:
+        """Fetch a service and apply it, passing ``kwargs`` to ``Service``."""
+        return self.update(Service(service_uid, date, **kwargs).get())
+
+    def forget(self, key: ServiceKey) -> None:
+        del self.services[key]
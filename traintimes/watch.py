@@ -0,0 +1,162 @@
+"""Follow a location line-up over time as a stream of changes.
+
+:meth:`Location.watch` polls a board and yields a :class:`Change` for each
+difference from the previous poll, rather than the whole board::
+
+    for change in Location('CHX').watch(interval=30):
+        if change.kind is ChangeKind.PLATFORM_CHANGED:
+            print(change.key, change.old, '->', change.new)
+
+``AsyncLocation.watch`` is the ``async for`` equivalent.  Services are keyed
+by ``(service_uid, run_date)``; :class:`BoardDiff` keeps the last version of
+each, so every poll is compared with the previous one in a single pass.
+"""
+
+import datetime as _dt
+from dataclasses import dataclass
+from enum import Enum
+
+from .models import DisplayAs, LocationResponse, LocationService
+
+
+DEFAULT_INTERVAL = 30
+
+CANCELLED_DISPLAYS = (DisplayAs.CANCELLED_CALL, DisplayAs.CANCELLED_PASS)
+
+ServiceKey = tuple[str, _dt.date]
+
+
+class ChangeKind(str, Enum):
+    """Kinds of change between two polls of a board."""
+
+    ADDED = 'added'
+    REMOVED = 'removed'
+    DEPARTURE_CHANGED = 'departure_changed'
+    PLATFORM_CHANGED = 'platform_changed'
+    PLATFORM_CONFIRMED = 'platform_confirmed'
+    CANCELLED = 'cancelled'
+    SERVICE_LOCATION_CHANGED = 'service_location_changed'
+
+
+@dataclass(frozen=True)
+class Change:
+    """One change to a service on the board.
+
+    ``service`` is the latest version of the service (the last one seen, for
+    ``REMOVED``); ``old`` and ``new`` hold the values that changed.
+    """
+
+    kind: ChangeKind
+    key: ServiceKey
+    service: LocationService
+    old: object = None
+    new: object = None
+
+
+def service_key(service: LocationService) -> ServiceKey:
+    return service.service_uid, service.run_date
+
+
+def is_cancelled(service: LocationService) -> bool:
+    detail = service.location_detail
+    return bool(
+        service.planned_cancel
+        or detail.display_as in CANCELLED_DISPLAYS
+        or detail.cancel_reason_code
+    )
+
+
+def service_changes(
+    previous: LocationService, current: LocationService
+) -> list[Change]:
+    """Changes to one service between two polls."""
+    key = service_key(current)
+    before = previous.location_detail
+    after = current.location_detail
+    changes = []
+    if before.realtime_departure != after.realtime_departure:
+        changes.append(
+            Change(
+                ChangeKind.DEPARTURE_CHANGED,
+                key,
+                current,
+                before.realtime_departure,
+                after.realtime_departure,
+            )
+        )
+    if before.platform != after.platform:
+        changes.append(
+            Change(
+                ChangeKind.PLATFORM_CHANGED,
+                key,
+                current,
+                before.platform,
+                after.platform,
+            )
+        )
+    if after.platform_confirmed and not before.platform_confirmed:
+        changes.append(
+            Change(ChangeKind.PLATFORM_CONFIRMED, key, current, new=after.platform)
+        )
+    if is_cancelled(current) and not is_cancelled(previous):
+        changes.append(
+            Change(
+                ChangeKind.CANCELLED,
+                key,
+                current,
+                new=after.cancel_reason_short_text,
+            )
+        )
+    if before.service_location != after.service_location:
+        changes.append(
+            Change(
+                ChangeKind.SERVICE_LOCATION_CHANGED,
+                key,
+                current,
+                before.service_location,
+                after.service_location,
+            )
+        )
+    return changes
+
+
+class BoardDiff:
+    """The board as last seen, updated poll by poll."""
+
+    def __init__(self):
+        self.services: dict[ServiceKey, LocationService] = {}
+        self.response: LocationResponse | None = None
+
+    def update(self, response: LocationResponse) -> list[Change]:
+        """Record ``response``, returning how it differs from the last one.
+
+        The first board reports every service as ``ADDED``.
+        """
+        if response is self.response:
+            # An unchanged board revalidated into the same model.
+            return []
+        self.response = response
+        previous = self.services
+        current = {service_key(service): service for service in response.services}
+        changes = []
+        for key, service in current.items():
+            old = previous.get(key)
+            if old is None:
+                changes.append(Change(ChangeKind.ADDED, key, service))
+            else:
+                changes.extend(service_changes(old, service))
+        for key, service in previous.items():
+            if key not in current:
+                changes.append(Change(ChangeKind.REMOVED, key, service))
+        self.services = current
+        return changes
+
+
+def diff_boards(
+    previous: LocationResponse | None, current: LocationResponse
+) -> list[Change]:
+    """Changes from ``previous`` (``None`` for nothing) to ``current``."""
+    diff = BoardDiff()
+    if previous is not None:
+        diff.update(previous)
+    return diff.update(current)